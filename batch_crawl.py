@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+Documentation Downloader - Headless Batch Crawler
+Crawls every URL in a file without starting the web server, e.g.:
+
+    python batch_crawl.py urls.txt --format pdf --format markdown --summary summary.json
+"""
+
+import sys
+import os
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+if __name__ == "__main__":
+    from core.batch import main
+    sys.exit(main())
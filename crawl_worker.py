@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+Documentation Downloader - Distributed Crawl Workers
+Crawls one site with many worker processes sharing a frontier, e.g.:
+
+    python crawl_worker.py run https://docs.example.com/ --workers 4 --format markdown
+"""
+
+import sys
+import os
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+if __name__ == "__main__":
+    from core.distributed import main
+    sys.exit(main())
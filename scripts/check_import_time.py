@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for Documentation Downloader
+
+Imports each core module in a fresh interpreter with ``python -X importtime``
+and fails if its cumulative import time exceeds the budget, or if importing it
+pulls in a heavy dependency that should only be loaded on first use.
+
+Usage:
+    python scripts/check_import_time.py [--runs 5] [--budget-scale 1.5]
+
+The test suite runs the same check (tests/test_import_time.py).
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import List
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Module -> cumulative import time budget in milliseconds (best of --runs)
+IMPORT_BUDGETS_MS = {
+    'core.config': 10,
+    'core.doc_scraper': 150,
+    'core.batch': 150,
+}
+
+# Dependencies that must only be imported when the feature needing them is used
+LAZY_DEPENDENCIES = ['requests', 'bs4', 'reportlab', 'aiofiles', 'markdownify', 'slugify', 'PIL']
+
+
+def measure(module: str):
+    """Import a module in a fresh interpreter, return (cumulative ms, imported module names)"""
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(SRC_DIR))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, env=env
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    cumulative_us = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|', 2)
+        name = name.strip()
+        imported.add(name)
+        if name == module:
+            cumulative_us = int(cumulative.strip())
+
+    if cumulative_us is None:
+        raise RuntimeError(f"No import time reported for {module}")
+    return cumulative_us / 1000.0, imported
+
+
+def check_module(module: str, budget: float, runs: int = 5) -> List[str]:
+    """Measure one module (best of ``runs``), print its line and return its failures"""
+    best = None
+    imported = set()
+    for _ in range(max(1, runs)):
+        elapsed, imported = measure(module)
+        best = elapsed if best is None else min(best, elapsed)
+
+    eager = sorted(dep for dep in LAZY_DEPENDENCIES
+                   if any(name == dep or name.startswith(dep + '.') for name in imported))
+    status = "✓" if best <= budget and not eager else "✗"
+    print(f"{status} {module:<20} {best:7.1f} ms (budget {budget:.0f} ms)")
+
+    failures = []
+    if best > budget:
+        failures.append(f"{module} took {best:.1f} ms, budget is {budget:.0f} ms")
+    if eager:
+        failures.append(f"{module} eagerly imports {', '.join(eager)}")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check import time budgets of the core modules")
+    parser.add_argument('--runs', type=int, default=5, help="Runs per module, the fastest counts (default: 5)")
+    parser.add_argument('--budget-scale', type=float, default=1.0,
+                        help="Multiply all budgets, e.g. on slow CI machines (default: 1.0)")
+    args = parser.parse_args()
+
+    failures = []
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        failures.extend(check_module(module, budget * args.budget_scale, args.runs))
+
+    if failures:
+        print("\n❌ Import-time check failed:")
+        for failure in failures:
+            print(f"   • {failure}")
+        return 1
+
+    print("\n✅ All modules within their import-time budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+Load test for the web API and the WebSocket progress channel
+
+Starts a local fixture documentation site and an instance of the web app
+(or attaches to a running one), then runs N download jobs with attached
+WebSocket clients, at most --concurrency at a time. Every job crawls its own
+copy of the fixture site and downloads its announced files, which must be
+unique across jobs and contain that job's pages. Reports job throughput,
+time to first progress message, progress message latency percentiles and
+the server's RSS and CPU usage, read from /proc. Runs fully offline.
+
+Usage:
+    python scripts/load_test.py --jobs 20 --concurrency 10 --output report.json
+    python scripts/load_test.py --server-url http://127.0.0.1:8000 --server-pid 1234
+"""
+
+import argparse
+import asyncio
+import http.server
+import io
+import json
+import math
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+import zipfile
+from typing import Dict, List, Optional
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile, None for no values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(values: List[float], scale: float = 1000.0) -> Dict:
+    """min/mean/p50/p90/p99/max in milliseconds (values are in seconds)"""
+    if not values:
+        return {'count': 0}
+    return {
+        'count': len(values),
+        'min_ms': round(min(values) * scale, 2),
+        'mean_ms': round(sum(values) / len(values) * scale, 2),
+        'p50_ms': round(percentile(values, 50) * scale, 2),
+        'p90_ms': round(percentile(values, 90) * scale, 2),
+        'p99_ms': round(percentile(values, 99) * scale, 2),
+        'max_ms': round(max(values) * scale, 2),
+    }
+
+
+class FixtureSite:
+    """Synthetic documentation site served from a background thread
+
+    The site is also served under ``/<token>/docs/`` with the token in every
+    page title, so concurrent crawls can be told apart in their outputs.
+    """
+
+    def __init__(self, pages: int, latency: float):
+        self.pages = pages
+        self.latency = latency
+        self.port = free_port()
+        site = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if site.latency:
+                    time.sleep(site.latency)
+                body = site.render(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                data = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', self.port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/docs/"
+
+    def token_url(self, token: str) -> str:
+        return f"http://127.0.0.1:{self.port}/{token}/docs/"
+
+    def render(self, path: str) -> Optional[str]:
+        token = ''
+        segments = path.split('/', 2)
+        if len(segments) == 3 and segments[1] != 'docs':
+            token, path = segments[1], '/' + segments[2]
+        prefix = f'/{token}' if token else ''
+        title = f'Page {{}} of {token}' if token else 'Page {}'
+
+        if path.rstrip('/') == '/docs':
+            index = -1
+        elif path.startswith('/docs/page-'):
+            try:
+                index = int(path[len('/docs/page-'):].strip('/'))
+            except ValueError:
+                return None
+            if not 0 <= index < self.pages:
+                return None
+        else:
+            return None
+
+        # Every page links to the next three, so the whole site is reachable within a few levels
+        nav = ''.join(f'<li><a href="{prefix}/docs/page-{i}">Page {i}</a></li>' for i in range(self.pages))
+        links = ''.join(f'<a href="{prefix}/docs/page-{i}">Next {i}</a> '
+                        for i in range(index + 1, min(self.pages, index + 4)))
+        paragraphs = ''.join(
+            f'<p>Paragraph {n} of page {index}: the quick brown fox jumps over the lazy dog '
+            f'while the configuration option number {n} controls the retry behaviour.</p>'
+            for n in range(20)
+        )
+        return (f'<html><head><title>{title.format(index)}</title></head><body>'
+                f'<nav class="sidebar"><ul>{nav}</ul></nav>'
+                f'<main><h1>{title.format(index)}</h1>{paragraphs}<p>{links}</p></main>'
+                f'<footer>Fixture site</footer></body></html>')
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class ServerProcess:
+    """The web app in a uvicorn subprocess with its own working and home directories"""
+
+    def __init__(self, keep_workdir: bool = False):
+        self.port = free_port()
+        self.workdir = tempfile.mkdtemp(prefix='doc_downloader_load_')
+        self.keep_workdir = keep_workdir
+        self.process: Optional[subprocess.Popen] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self, timeout: float = 30.0):
+        home = os.path.join(self.workdir, 'home')
+        os.makedirs(home, exist_ok=True)
+        env = dict(os.environ, PYTHONPATH=os.path.abspath(SRC_DIR), HOME=home)
+        # Server output goes to a file: a pipe nobody reads would block the server once full
+        log_path = os.path.join(self.workdir, 'server.log')
+        with open(log_path, 'wb') as log:
+            self.process = subprocess.Popen(
+                [sys.executable, '-m', 'uvicorn', 'web.main:app', '--host', '127.0.0.1',
+                 '--port', str(self.port), '--log-level', 'warning'],
+                cwd=self.workdir, env=env, stdout=log, stderr=subprocess.STDOUT
+            )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                with open(log_path, 'r', errors='replace') as log:
+                    raise RuntimeError(f"Server exited:\n{log.read()[-2000:]}")
+            try:
+                urllib.request.urlopen(f"{self.url}/status", timeout=1).read()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise RuntimeError("Server did not start in time")
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        if not self.keep_workdir:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+class ResourceSampler:
+    """Samples a process's RSS and CPU time from /proc"""
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        self.pid = pid
+        self.interval = interval
+        self.rss_samples: List[int] = []
+        self.cpu_seconds_start: Optional[float] = None
+        self.cpu_seconds_end: Optional[float] = None
+        self.started = self.finished = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._clock_ticks = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+    def _cpu_seconds(self) -> Optional[float]:
+        try:
+            with open(f'/proc/{self.pid}/stat') as f:
+                # Fields after the parenthesised command name; utime and stime are 14th and 15th
+                fields = f.read().rsplit(')', 1)[1].split()
+            return (int(fields[11]) + int(fields[12])) / self._clock_ticks
+        except (OSError, IndexError, ValueError):
+            return None
+
+    def _rss_bytes(self) -> Optional[int]:
+        try:
+            with open(f'/proc/{self.pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def _run(self):
+        while not self._stop.is_set():
+            rss = self._rss_bytes()
+            if rss is not None:
+                self.rss_samples.append(rss)
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self.started = time.monotonic()
+        self.cpu_seconds_start = self._cpu_seconds()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.finished = time.monotonic()
+        self.cpu_seconds_end = self._cpu_seconds()
+
+    def report(self) -> Dict:
+        if not self.rss_samples:
+            return {'available': False}
+        report = {
+            'available': True,
+            'rss_start_mb': round(self.rss_samples[0] / 1024 ** 2, 1),
+            'rss_peak_mb': round(max(self.rss_samples) / 1024 ** 2, 1),
+            'rss_end_mb': round(self.rss_samples[-1] / 1024 ** 2, 1),
+        }
+        if self.cpu_seconds_start is not None and self.cpu_seconds_end is not None:
+            cpu = self.cpu_seconds_end - self.cpu_seconds_start
+            report['cpu_seconds'] = round(cpu, 2)
+            report['cpu_percent_mean'] = round(100 * cpu / max(1e-9, self.finished - self.started), 1)
+        return report
+
+
+def check_download(server_url: str, filename: str, marker: Optional[str]) -> Optional[str]:
+    """Download one artifact (blocking); returns what is wrong with it, or None"""
+    url = f"{server_url}/download/{urllib.parse.quote(filename)}"
+    try:
+        with urllib.request.urlopen(url, timeout=60) as response:
+            data = response.read()
+    except (OSError, urllib.error.HTTPError) as e:
+        return f"download failed: {e}"
+    if not data:
+        return "empty"
+
+    if filename.endswith('.zip'):
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                if archive.testzip() is not None:
+                    return "corrupt zip member"
+                text = ''.join(archive.read(name).decode('utf-8', 'replace') for name in archive.namelist())
+        except zipfile.BadZipFile:
+            return "not a valid zip archive"
+    elif filename.endswith('.pdf'):
+        return None if data.startswith(b'%PDF') else "not a PDF"  # Page text is compressed
+    else:
+        text = data.decode('utf-8', 'replace')
+    if marker and marker not in text:
+        return "does not contain this job's pages"
+    return None
+
+
+async def run_job(server_url: str, site_url: str, formats: List[str], timeout: float,
+                  marker: Optional[str] = None) -> Dict:
+    """One download job with its WebSocket client; returns timings in seconds
+
+    Once the job completes, every requested format must have been announced
+    as ready under its own filename and download intact; with ``marker``,
+    text outputs must contain it.
+    """
+    import websockets
+
+    connection_id = f"load-{uuid.uuid4().hex[:12]}"
+    ws_url = server_url.replace('http://', 'ws://', 1) + f"/ws/{connection_id}"
+    result = {
+        'connection_id': connection_id,
+        'status': 'failed',
+        'error': None,
+        'time_to_first_progress': None,
+        'duration': None,
+        'latencies': [],
+        'messages': 0,
+        'artifacts': 0,
+        'filenames': [],
+    }
+    announced: Dict[str, Dict] = {}  # Format -> last artifact message
+
+    async with websockets.connect(ws_url, max_size=None) as ws:
+        data = urllib.parse.urlencode(
+            [('url', site_url), ('connection_id', connection_id)] + [('output_format', fmt) for fmt in formats]
+        ).encode()
+        started = time.monotonic()
+        loop = asyncio.get_event_loop()
+        try:
+            await loop.run_in_executor(
+                None, lambda: urllib.request.urlopen(f"{server_url}/download", data, timeout=timeout).read()
+            )
+        except (OSError, urllib.error.HTTPError) as e:
+            result['error'] = f"POST /download failed: {e}"
+            return result
+
+        deadline = started + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                result['error'] = 'timeout'
+                break
+            try:
+                raw = await asyncio.wait_for(ws.recv(), timeout=remaining)
+            except asyncio.TimeoutError:
+                result['error'] = 'timeout'
+                break
+            received = time.time()
+            message = json.loads(raw)
+            if message.get('type') == 'ping':
+                continue
+
+            result['messages'] += 1
+            if 'sent_at' in message:
+                result['latencies'].append(max(0.0, received - message['sent_at']))
+            if message.get('type') == 'artifact':
+                result['artifacts'] += message.get('status') == 'ready'
+                announced[message.get('format')] = message
+            elif message.get('type') == 'progress':
+                if result['time_to_first_progress'] is None:
+                    result['time_to_first_progress'] = time.monotonic() - started
+                if message.get('step') == message.get('total_steps'):
+                    if message.get('message', '').startswith('❌'):
+                        result['error'] = message.get('details') or message.get('message')
+                    else:
+                        result['status'] = 'ok'
+                    break
+
+        result['duration'] = time.monotonic() - started
+
+    if result['status'] == 'ok':
+        result['filenames'] = [announced[fmt]['filename'] for fmt in formats
+                               if announced.get(fmt, {}).get('status') == 'ready']
+        problems = [f"{fmt} not announced as ready" for fmt in formats
+                    if announced.get(fmt, {}).get('status') != 'ready']
+        if len(set(result['filenames'])) != len(result['filenames']):
+            problems.append("formats share a filename")
+        for filename in result['filenames']:
+            problem = await loop.run_in_executor(None, check_download, server_url, filename, marker)
+            if problem:
+                problems.append(f"{filename.rsplit('.', 1)[-1]} {problem}")
+        if problems:
+            result['status'] = 'failed'
+            result['error'] = 'artifact check failed: ' + ', '.join(problems)
+    return result
+
+
+async def run_load(server_url: str, site_url: str, jobs: int, concurrency: int,
+                   formats: List[str], timeout: float, fixture: Optional[FixtureSite] = None) -> List[Dict]:
+    """Run the jobs; with ``fixture``, each job crawls its own token-marked copy of the site"""
+    slots = asyncio.Semaphore(concurrency)
+
+    async def limited():
+        token = uuid.uuid4().hex[:12]
+        url, marker = (fixture.token_url(token), f"of {token}") if fixture else (site_url, None)
+        async with slots:
+            try:
+                return await run_job(server_url, url, formats, timeout, marker)
+            except Exception as e:
+                return {'status': 'failed', 'error': f"{type(e).__name__}: {e}", 'latencies': [],
+                        'time_to_first_progress': None, 'duration': None, 'messages': 0, 'artifacts': 0,
+                        'filenames': []}
+
+    results = await asyncio.gather(*(limited() for _ in range(jobs)))
+
+    # A filename announced by two jobs means one job's file replaced or removed the other's
+    owners: Dict[str, int] = {}
+    for result in results:
+        for filename in result['filenames']:
+            owners[filename] = owners.get(filename, 0) + 1
+    for result in results:
+        if any(owners[filename] > 1 for filename in result['filenames']):
+            result['status'] = 'failed'
+            result['error'] = 'filename announced by another job too'
+    return results
+
+
+def build_report(args, results: List[Dict], wall_seconds: float, resources: Dict) -> Dict:
+    succeeded = [r for r in results if r['status'] == 'ok']
+    errors: Dict[str, int] = {}
+    for r in results:
+        if r['status'] != 'ok':
+            errors[r['error'] or 'unknown'] = errors.get(r['error'] or 'unknown', 0) + 1
+    return {
+        'parameters': {
+            'jobs': args.jobs,
+            'concurrency': args.concurrency,
+            'formats': args.formats or ['markdown'],
+            'fixture_pages': args.fixture_pages,
+            'fixture_latency_ms': args.fixture_latency_ms,
+            'timeout_seconds': args.timeout,
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'wall_seconds': round(wall_seconds, 3),
+        'jobs_succeeded': len(succeeded),
+        'jobs_failed': len(results) - len(succeeded),
+        'throughput_jobs_per_minute': round(len(succeeded) / wall_seconds * 60, 2) if wall_seconds else None,
+        'job_duration': summarize([r['duration'] for r in succeeded]),
+        'time_to_first_progress': summarize([r['time_to_first_progress'] for r in results
+                                             if r['time_to_first_progress'] is not None]),
+        'message_latency': summarize([latency for r in results for latency in r['latencies']]),
+        'messages_received': sum(r['messages'] for r in results),
+        'server': resources,
+        'errors': errors,
+    }
+
+
+def print_report(report: Dict):
+    print(f"\n📊 {report['jobs_succeeded']}/{report['jobs_succeeded'] + report['jobs_failed']} jobs succeeded "
+          f"in {report['wall_seconds']}s ({report['throughput_jobs_per_minute']} jobs/min)")
+    for name in ('job_duration', 'time_to_first_progress', 'message_latency'):
+        stats = report[name]
+        if not stats['count']:
+            print(f"   {name:<24} no samples")
+            continue
+        print(f"   {name:<24} p50 {stats['p50_ms']:>9.1f} ms   p90 {stats['p90_ms']:>9.1f} ms   "
+              f"p99 {stats['p99_ms']:>9.1f} ms   max {stats['max_ms']:>9.1f} ms   (n={stats['count']})")
+    server = report['server']
+    if server.get('available'):
+        print(f"   server RSS {server['rss_start_mb']} -> peak {server['rss_peak_mb']} MB, "
+              f"CPU {server.get('cpu_seconds')}s ({server.get('cpu_percent_mean')}% of one core)")
+    else:
+        print("   server resources not available (no /proc or no --server-pid)")
+    for error, count in report['errors'].items():
+        print(f"   ❌ {count} x {error}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load test the web API and WebSocket progress channel")
+    parser.add_argument('-n', '--jobs', type=int, default=10, help="Download jobs to run (default: 10)")
+    parser.add_argument('-c', '--concurrency', type=int, default=5, help="Jobs in flight at once (default: 5)")
+    parser.add_argument('-f', '--format', dest='formats', action='append',
+                        help="Output format per job, may be repeated (default: markdown)")
+    parser.add_argument('--fixture-pages', type=int, default=10, help="Pages in the fixture site (default: 10)")
+    parser.add_argument('--fixture-latency-ms', type=float, default=20,
+                        help="Response delay of the fixture site (default: 20)")
+    parser.add_argument('--timeout', type=float, default=600, help="Per-job timeout in seconds (default: 600)")
+    parser.add_argument('--server-url', help="Use a running server instead of starting one")
+    parser.add_argument('--server-pid', type=int, help="PID of the running server, for RSS/CPU sampling")
+    parser.add_argument('--site-url', help="Crawl this site instead of the built-in fixture")
+    parser.add_argument('-o', '--output', help="Write the JSON report here")
+    parser.add_argument('--keep-workdir', action='store_true',
+                        help="Keep the started server's working directory (outputs, log) for inspection")
+    args = parser.parse_args()
+
+    try:
+        import websockets  # noqa: F401
+    except ImportError:
+        print("The websockets package is required (pip install websockets)", file=sys.stderr)
+        return 1
+
+    site = None
+    server = None
+    try:
+        if not args.site_url:
+            site = FixtureSite(args.fixture_pages, args.fixture_latency_ms / 1000)
+            site.start()
+        site_url = args.site_url or site.url
+
+        if args.server_url:
+            server_url = args.server_url.rstrip('/')
+            server_pid = args.server_pid
+        else:
+            server = ServerProcess(keep_workdir=args.keep_workdir)
+            server.start()
+            server_url, server_pid = server.url, server.process.pid
+            print(f"🚀 Server on {server_url} (pid {server_pid}, workdir {server.workdir})")
+
+        print(f"🔥 {args.jobs} jobs, {args.concurrency} concurrent, crawling {site_url}")
+        sampler = ResourceSampler(server_pid) if server_pid else None
+        if sampler:
+            sampler.start()
+        started = time.monotonic()
+        results = asyncio.run(run_load(server_url, site_url, args.jobs, max(1, args.concurrency),
+                                       args.formats or ['markdown'], args.timeout, site))
+        wall_seconds = time.monotonic() - started
+        if sampler:
+            sampler.stop()
+
+        report = build_report(args, results, wall_seconds, sampler.report() if sampler else {'available': False})
+    finally:
+        if server:
+            server.stop()
+        if site:
+            site.stop()
+
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📝 Report written to {args.output}")
+    return 0 if not report['jobs_failed'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded crawl from a WARC file and time extraction and rendering
+
+Record a crawl first (``python batch_crawl.py urls.txt --warc`` or
+``WARC_RECORD = True`` for the web app), then replay it any number of times
+without network access or politeness delay. Every run sees exactly the same
+responses, so timings and outputs of extraction and rendering changes can be
+compared directly.
+
+Usage:
+    python scripts/replay_benchmark.py downloads/site.warc.gz -f pdf -f markdown --runs 5
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.config import MAX_DEPTH  # noqa: E402
+from core.doc_scraper import DocumentationScraper, OUTPUT_FORMATS  # noqa: E402
+
+
+async def replay_once(archive: str, start_url: str, formats, output_dir: str, max_depth: int) -> dict:
+    scraper = DocumentationScraper(start_url, replay_path=archive, convert_markdown=bool({'markdown', 'zip'} & set(formats)))
+    try:
+        started = time.perf_counter()
+        pages = await scraper.scrape_documentation(max_depth=max_depth)
+        crawled = time.perf_counter()
+        outputs = await scraper.generate_outputs(pages, formats, os.path.join(output_dir, 'replay'))
+        rendered = time.perf_counter()
+        return {
+            'pages': len(pages),
+            'failed_urls': len(scraper.failed_urls),
+            'extract_seconds': crawled - started,
+            'render_seconds': rendered - crawled,
+            'outputs': {fmt: (str(output) if isinstance(output, Exception) else os.path.getsize(output))
+                        for fmt, output in outputs.items()},
+        }
+    finally:
+        scraper.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay a recorded crawl and time extraction and rendering")
+    parser.add_argument('archive', help="WARC file written with --warc / WARC_RECORD")
+    parser.add_argument('-f', '--format', dest='formats', action='append', choices=list(OUTPUT_FORMATS),
+                        help="Output format, may be repeated (default: markdown)")
+    parser.add_argument('-r', '--runs', type=int, default=3, help="Replays to run (default: 3)")
+    parser.add_argument('--url', help="Start URL (default: the one stored in the archive)")
+    parser.add_argument('--max-depth', type=int, default=MAX_DEPTH)
+    parser.add_argument('-o', '--output-dir', help="Keep the outputs here (default: a temporary directory)")
+    parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    from core.warc import WarcArchive
+    archive = WarcArchive(args.archive)
+    start_url = args.url or archive.start_url
+    archive.close()
+    if not start_url:
+        print("The archive has no start URL, pass --url", file=sys.stderr)
+        return 1
+
+    formats = args.formats or ['markdown']
+    output_dir = args.output_dir or tempfile.mkdtemp(prefix='doc_downloader_replay_')
+    os.makedirs(output_dir, exist_ok=True)
+
+    runs = [asyncio.run(replay_once(args.archive, start_url, formats, output_dir, args.max_depth))
+            for _ in range(max(1, args.runs))]
+
+    summary = {
+        'archive': args.archive,
+        'start_url': start_url,
+        'formats': formats,
+        'runs': runs,
+    }
+    for phase in ('extract_seconds', 'render_seconds'):
+        values = [run[phase] for run in runs]
+        summary[phase] = {'best': round(min(values), 4), 'median': round(statistics.median(values), 4)}
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"🔁 {len(runs)} replays of {start_url} ({runs[0]['pages']} pages, {', '.join(formats)})")
+        for phase in ('extract_seconds', 'render_seconds'):
+            print(f"   {phase[:-8]:<8} best {summary[phase]['best']:.3f}s   median {summary[phase]['median']:.3f}s")
+        if len({json.dumps(run['outputs'], sort_keys=True) for run in runs}) > 1:
+            print("   ⚠️  Output sizes differ between runs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""
+Streamed per-page zip archive output
+
+Every page becomes its own Markdown file, at a path mirroring its URL
+(``host/guide/install.md``, ``host/guide/index.md`` for ``/guide/``).
+Pages are compressed in parallel in a thread pool as they are scraped and
+appended to the archive in crawl order by a single writer thread, so the
+archive grows while the crawl runs and can be streamed to a client before
+it is complete (see ``ZipStreamWriter.follow``).
+
+The zip file is written strictly sequentially: every entry is compressed
+before its local header is written, so no data descriptors or seeking are
+needed, and Zip64 records are added only when the archive needs them.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import unquote, urlparse
+
+logger = logging.getLogger(__name__)
+
+# Import config settings
+try:
+    from .config import ARCHIVE_COMPRESS_WORKERS, ARCHIVE_COMPRESS_LEVEL
+except ImportError:
+    try:
+        from config import ARCHIVE_COMPRESS_WORKERS, ARCHIVE_COMPRESS_LEVEL
+    except ImportError:
+        ARCHIVE_COMPRESS_WORKERS = 4  # Fallback if config import fails
+        ARCHIVE_COMPRESS_LEVEL = 6
+
+FOLLOW_CHUNK = 64 * 1024
+FOLLOW_POLL_SECONDS = 0.2  # How often a follower checks a growing archive for new bytes
+MAX_SEGMENT_CHARS = 100
+UNSAFE_PATH_CHARS = re.compile(r'[\x00-\x1f<>:"/\\|?*]')
+PAGE_EXTENSIONS = ('.html', '.htm', '.php', '.asp', '.aspx', '.md')
+
+ZIP32_LIMIT = 0xFFFFFFFF
+ZIP32_MAX_ENTRIES = 0xFFFF
+UTF8_NAMES = 0x0800  # General purpose flag bit 11
+DEFLATED, STORED = 8, 0
+
+
+def _safe_segment(segment: str) -> str:
+    segment = UNSAFE_PATH_CHARS.sub('_', unquote(segment)).strip()
+    if segment in ('', '.', '..'):
+        return '_'
+    return segment[:MAX_SEGMENT_CHARS]
+
+
+def page_archive_path(url: str, suffix: str = '.md') -> str:
+    """Archive path for a page, mirroring host and URL path"""
+    parsed = urlparse(url)
+    segments = [_safe_segment(parsed.netloc or 'site')]
+    path_segments = [segment for segment in parsed.path.split('/') if segment]
+    if not path_segments or parsed.path.endswith('/'):
+        path_segments.append('index')
+
+    name = path_segments[-1]
+    for extension in PAGE_EXTENSIONS:
+        if name.lower().endswith(extension) and len(name) > len(extension):
+            name = name[:-len(extension)]
+            break
+    if parsed.query:
+        name += '_' + hashlib.blake2b(parsed.query.encode('utf-8'), digest_size=4).hexdigest()
+    path_segments[-1] = name
+
+    segments.extend(_safe_segment(segment) for segment in path_segments)
+    return '/'.join(segments) + suffix
+
+
+def _dos_datetime(timestamp: float) -> Tuple[int, int]:
+    t = time.localtime(timestamp)
+    dos_date = ((max(t.tm_year, 1980) - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    return dos_time, dos_date
+
+
+def _compress(data: bytes, level: int) -> Tuple[int, int, bytes]:
+    """(method, crc32, payload) for one entry; runs in the compression threads"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    payload = compressor.compress(data) + compressor.flush()
+    if len(payload) >= len(data):
+        return STORED, zlib.crc32(data), data
+    return DEFLATED, zlib.crc32(data), payload
+
+
+class _Entry:
+    __slots__ = ('name', 'method', 'crc', 'compressed_size', 'size', 'offset', 'dos_time', 'dos_date')
+
+
+class ZipStreamWriter:
+    """Appends one compressed entry per page to a zip file as pages arrive
+
+    ``add_page`` is cheap and can be used as a scraper page listener; the
+    archive is only valid once ``close()`` has written its central
+    directory. ``abort()`` stops it without one.
+    """
+
+    def __init__(self, path: str, render_page: Callable[[Dict], str],
+                 workers: int = ARCHIVE_COMPRESS_WORKERS, level: int = ARCHIVE_COMPRESS_LEVEL):
+        self.path = path
+        self.render_page = render_page
+        self.level = level
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'wb')
+        self._compressors = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='zip-compress')
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='zip-write')  # Keeps entry order
+        self._names: Set[str] = set()
+        self._entries: List[_Entry] = []
+        self._offset = 0
+        self._lock = threading.Lock()
+        self.finished = False  # Central directory written, or aborted
+        self.error: Optional[str] = None
+
+    @property
+    def entries(self) -> int:
+        return len(self._entries)
+
+    def _unique_name(self, name: str) -> str:
+        stem, dot, extension = name.rpartition('.')
+        candidate, number = name, 1
+        while candidate in self._names:
+            number += 1
+            candidate = f"{stem}-{number}{dot}{extension}"
+        self._names.add(candidate)
+        return candidate
+
+    def add_page(self, page: Dict):
+        """Queue a page for compression and appending (non-blocking)"""
+        self.add_file(page_archive_path(page['url']), self.render_page(page).encode('utf-8'))
+
+    def add_file(self, name: str, data: bytes):
+        if self.finished:
+            return
+        name = self._unique_name(name)
+        compressed = self._compressors.submit(_compress, data, self.level)
+        self._writer.submit(self._write_entry, name, len(data), compressed)
+
+    def _write(self, data: bytes):
+        with self._lock:
+            self._file.write(data)
+            self._file.flush()  # Followers read what is on disk
+            self._offset += len(data)
+
+    def _write_entry(self, name: str, size: int, compressed: Future):
+        if self.finished:
+            return
+        try:
+            entry = _Entry()
+            entry.name = name
+            entry.method, entry.crc, payload = compressed.result()
+            entry.compressed_size = len(payload)
+            entry.size = size
+            entry.offset = self._offset
+            entry.dos_time, entry.dos_date = _dos_datetime(time.time())
+            encoded_name = name.encode('utf-8')
+            header = struct.pack(
+                '<IHHHHHIIIHH', 0x04034b50, 20, UTF8_NAMES, entry.method, entry.dos_time, entry.dos_date,
+                entry.crc, entry.compressed_size, entry.size, len(encoded_name), 0
+            )
+            self._write(header + encoded_name + payload)
+            self._entries.append(entry)
+        except Exception as e:
+            logger.error(f"Failed to add {name} to {self.path}: {str(e)}")
+            self.error = self.error or str(e)
+
+    def _write_central_directory(self):
+        start = self._offset
+        records = []
+        for entry in self._entries:
+            encoded_name = entry.name.encode('utf-8')
+            extra = b''
+            offset = entry.offset
+            version = 20
+            if offset >= ZIP32_LIMIT:
+                extra = struct.pack('<HHQ', 0x0001, 8, offset)
+                offset = ZIP32_LIMIT
+                version = 45
+            records.append(struct.pack(
+                '<IHHHHHHIIIHHHHHII', 0x02014b50, (3 << 8) | version, version, UTF8_NAMES, entry.method,
+                entry.dos_time, entry.dos_date, entry.crc, entry.compressed_size, entry.size,
+                len(encoded_name), len(extra), 0, 0, 0, 0o644 << 16, offset
+            ) + encoded_name + extra)
+        directory = b''.join(records)
+        size = len(directory)
+        count = len(self._entries)
+
+        tail = b''
+        if count >= ZIP32_MAX_ENTRIES or start >= ZIP32_LIMIT or size >= ZIP32_LIMIT:
+            zip64_end = start + size
+            tail += struct.pack('<IQHHIIQQQQ', 0x06064b50, 44, 45, 45, 0, 0, count, count, size, start)
+            tail += struct.pack('<IIQI', 0x07064b50, 0, zip64_end, 1)
+            count, size32, start32 = ZIP32_MAX_ENTRIES, ZIP32_LIMIT, ZIP32_LIMIT
+        else:
+            size32, start32 = size, start
+        tail += struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, count, count, size32, start32, 0)
+        self._write(directory + tail)
+
+    def _finish(self):
+        if not self.finished and not self.error:
+            self._write_central_directory()
+        self.finished = True
+        self._file.close()
+
+    def close(self):
+        """Wait for queued pages and write the central directory (blocking)"""
+        if self._file.closed:
+            return
+        self._writer.submit(self._finish).result()
+        self._writer.shutdown()
+        self._compressors.shutdown()
+        if self.error:
+            raise RuntimeError(f"Archive {os.path.basename(self.path)} is incomplete: {self.error}")
+        logger.info(f"Zip archive with {self.entries} pages saved to {self.path}")
+
+    def abort(self):
+        """Stop without writing a central directory; followers see an error"""
+        if self._file.closed:
+            return
+        self.error = self.error or "aborted"
+        self.finished = True
+        self._compressors.shutdown(wait=False)
+        try:
+            self._writer.submit(self._finish)
+        except RuntimeError:
+            pass  # close() is already finishing it
+        self._writer.shutdown(wait=False)
+
+    async def follow(self, chunk_size: int = FOLLOW_CHUNK) -> AsyncIterator[bytes]:
+        """Yield the archive's bytes as they are written, until it is complete
+
+        Raises RuntimeError if the archive is aborted or fails, so a
+        streamed response is cut off instead of ending as a truncated file.
+        """
+        with open(self.path, 'rb') as f:
+            while True:
+                done = self.finished
+                data = f.read(chunk_size)
+                if data:
+                    yield data
+                    continue
+                if done:
+                    break
+                await asyncio.sleep(FOLLOW_POLL_SECONDS)
+        if self.error:
+            raise RuntimeError(f"Archive {os.path.basename(self.path)} is incomplete: {self.error}")
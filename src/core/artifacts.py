@@ -0,0 +1,256 @@
+"""
+Artifact publishing and download helpers
+
+Finished output files are written once to OUTPUT_DIR and published to the
+user's Downloads folder as a hardlink (or reflink) where the filesystem
+allows it, so publishing neither blocks on a copy nor doubles disk use.
+Text artifacts get gzip/zstd variants built once in the background, and
+downloads use strong ETags and single byte ranges for conditional and
+resumed requests.
+"""
+
+import asyncio
+import gzip
+import logging
+import os
+import shlex
+import shutil
+import sys
+from typing import Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Import config settings
+try:
+    from .config import USER_DOWNLOADS_DIR, ARTIFACT_PUBLISH_MODE, ARTIFACT_PUBLISH_COMMAND, PRECOMPRESS_ENCODINGS
+except ImportError:
+    try:
+        from config import USER_DOWNLOADS_DIR, ARTIFACT_PUBLISH_MODE, ARTIFACT_PUBLISH_COMMAND, PRECOMPRESS_ENCODINGS
+    except ImportError:
+        USER_DOWNLOADS_DIR = os.path.expanduser("~/Downloads")  # Fallback if config import fails
+        ARTIFACT_PUBLISH_MODE = "link"
+        ARTIFACT_PUBLISH_COMMAND = None
+        PRECOMPRESS_ENCODINGS = ["zstd", "gzip"]
+
+try:
+    from .janitor import PublishedLedger
+except ImportError:
+    from janitor import PublishedLedger
+
+PRECOMPRESS_EXTENSIONS = ('.md', '.html')
+ENCODING_SUFFIXES = {'zstd': '.zst', 'gzip': '.gz'}
+FICLONE = 0x40049409  # Linux ioctl sharing a file's extents (btrfs, xfs, ...)
+RANGE_CHUNK = 64 * 1024
+
+
+class RangeNotSatisfiable(ValueError):
+    """A Range header that selects no bytes of the file"""
+
+
+def _reflink(source: str, destination: str):
+    import fcntl
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            os.remove(destination)
+            raise
+
+
+def link_or_copy(source: str, destination: str, mode: str = ARTIFACT_PUBLISH_MODE) -> str:
+    """Expose source at destination, returning how: 'hardlink', 'reflink' or 'copy'
+
+    Hardlinks share the file with OUTPUT_DIR, so later edits to either
+    show up in both.
+    """
+    if os.path.lexists(destination):
+        os.remove(destination)
+    if mode == 'link':
+        try:
+            os.link(source, destination)
+            return 'hardlink'
+        except OSError:
+            pass  # Other filesystem, or links not supported
+        if sys.platform.startswith('linux'):
+            try:
+                _reflink(source, destination)
+                return 'reflink'
+            except OSError:
+                pass
+    shutil.copy2(source, destination)
+    return 'copy'
+
+
+def _place(source: str, destination: str, mode: str) -> str:
+    how = link_or_copy(source, destination, mode)
+    PublishedLedger().record(destination)  # Lets the janitor expire this file, and only files like it
+    return how
+
+
+async def publish_artifact(path: str, destination_dir: str = USER_DOWNLOADS_DIR,
+                           mode: str = ARTIFACT_PUBLISH_MODE,
+                           command: Optional[str] = ARTIFACT_PUBLISH_COMMAND) -> Optional[str]:
+    """Publish a finished artifact; returns its path in destination_dir, if placed there
+
+    Raises OSError if placing the file or the publish command fails.
+    """
+    published = None
+    if mode != 'none':
+        destination = os.path.join(destination_dir, os.path.basename(path))
+        how = await asyncio.get_event_loop().run_in_executor(None, _place, path, destination, mode)
+        logger.info(f"Published {os.path.basename(path)} to {destination_dir} ({how})")
+        published = destination
+
+    if command:
+        args = [arg.format(path=path, filename=os.path.basename(path)) for arg in shlex.split(command)]
+        process = await asyncio.create_subprocess_exec(*args, stdout=asyncio.subprocess.DEVNULL,
+                                                       stderr=asyncio.subprocess.PIPE)
+        _, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise OSError(f"Publish command failed ({process.returncode}): {stderr.decode(errors='replace')[:200]}")
+    return published
+
+
+def _zstd_compress(data: bytes) -> Optional[bytes]:
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard.ZstdCompressor(level=19).compress(data)
+
+
+def precompress(path: str, encodings: List[str] = PRECOMPRESS_ENCODINGS) -> List[str]:
+    """Write compressed variants of a Markdown/HTML artifact next to it (blocking)
+
+    Variants are written at maximum compression once, so every later
+    download is served without compressing on the fly.
+    """
+    if not path.endswith(PRECOMPRESS_EXTENSIONS):
+        return []
+    written = []
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        for encoding in encodings:
+            if encoding == 'gzip':
+                compressed = gzip.compress(data, compresslevel=9, mtime=0)
+            elif encoding == 'zstd':
+                compressed = _zstd_compress(data)
+            else:
+                compressed = None
+            if compressed is None or len(compressed) >= len(data):
+                continue
+            variant = path + ENCODING_SUFFIXES[encoding]
+            temp_path = variant + '.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(compressed)
+            os.replace(temp_path, variant)
+            written.append(variant)
+    except OSError as e:
+        logger.warning(f"Could not precompress {os.path.basename(path)}: {e}")
+    return written
+
+
+def accepted_encodings(accept_encoding: str) -> List[str]:
+    """Content codings a client accepts (q > 0), from an Accept-Encoding header"""
+    accepted = []
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            accepted.append(coding)
+    return accepted
+
+
+def pick_variant(path: str, accept_encoding: str) -> Tuple[str, Optional[str]]:
+    """(file to serve, content coding) for a download, preferring zstd over gzip
+
+    A variant is only used if it is at least as new as the artifact.
+    """
+    accepted = accepted_encodings(accept_encoding or '')
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return path, None
+    for encoding in ('zstd', 'gzip'):
+        if encoding not in accepted and '*' not in accepted:
+            continue
+        variant = path + ENCODING_SUFFIXES[encoding]
+        try:
+            if os.stat(variant).st_mtime_ns >= mtime:
+                return variant, encoding
+        except OSError:
+            continue
+    return path, None
+
+
+def etag_for(stat: os.stat_result, encoding: Optional[str] = None) -> str:
+    """Strong ETag of one representation of a file"""
+    tag = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+    if encoding:
+        tag += f"-{encoding}"
+    return f'"{tag}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag (weak comparison)"""
+    if if_none_match.strip() == '*':
+        return True
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """(first, last) byte of a single-range Range header, inclusive
+
+    Returns None when the header should be ignored (multiple ranges,
+    other units, malformed or a last byte before the first) and raises
+    RangeNotSatisfiable when no byte of the file is in the range, which
+    is every range of an empty file.
+    """
+    unit, _, spec = header.partition('=')
+    first, dash, last = (part.strip() for part in spec.partition('-'))
+    if unit.strip().lower() != 'bytes' or ',' in spec or not dash:
+        return None
+    if not all(part.isdigit() for part in (first, last) if part) or not (first or last):
+        return None  # int() would accept signs, as in bytes=--3
+    start = int(first) if first else None
+    end = int(last) if last else None
+    if start is not None and end is not None and end < start:
+        return None  # Syntactically invalid, so the whole file is sent
+
+    if size == 0:
+        raise RangeNotSatisfiable(header)
+    if start is None:
+        if not end:
+            raise RangeNotSatisfiable(header)
+        return max(0, size - end), size - 1  # Suffix range: the last N bytes
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+def iter_file_range(path: str, start: int, end: int, chunk_size: int = RANGE_CHUNK) -> Iterator[bytes]:
+    """Yield bytes start..end (inclusive) of a file"""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            data = f.read(min(chunk_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
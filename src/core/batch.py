@@ -0,0 +1,260 @@
+"""
+Headless batch crawling of many documentation sites
+
+Runs DocumentationScraper for a list of URLs without the web server, with a
+global and a per-host limit on concurrent crawls, writes the requested
+output files and a JSON summary of per-site timings.
+
+Usage:
+    python batch_crawl.py urls.txt --format pdf --format markdown --summary summary.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+# Import config settings
+try:
+    from .config import (
+        OUTPUT_DIR, MAX_DEPTH, TIMEOUT_MINUTES, MAX_PAGES, MAX_BYTES,
+        BATCH_CONCURRENCY, BATCH_PER_HOST_CONCURRENCY, PDF_IMAGES
+    )
+except ImportError:
+    from config import (
+        OUTPUT_DIR, MAX_DEPTH, TIMEOUT_MINUTES, MAX_PAGES, MAX_BYTES,
+        BATCH_CONCURRENCY, BATCH_PER_HOST_CONCURRENCY, PDF_IMAGES
+    )
+
+logger = logging.getLogger(__name__)
+
+
+def read_url_file(path: str) -> List[str]:
+    """Read URLs from a file, one per line; blank lines and # comments are ignored"""
+    if path == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+
+    urls = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('#') and line not in urls:
+            urls.append(line)
+    return urls
+
+
+def site_basename(url: str) -> str:
+    """File-name-safe base name for a site's output files"""
+    from slugify import slugify
+    parsed = urlparse(url)
+    slug = slugify(f"{parsed.netloc}{parsed.path}")[:80] or 'site'
+    return f"{slug}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+
+class BatchRunner:
+    """Crawl many sites concurrently under global and per-host limits"""
+
+    def __init__(self, output_formats: List[str], output_dir: str = OUTPUT_DIR,
+                 concurrency: int = BATCH_CONCURRENCY,
+                 per_host_concurrency: int = BATCH_PER_HOST_CONCURRENCY,
+                 max_depth: int = MAX_DEPTH, timeout_minutes: float = TIMEOUT_MINUTES,
+                 max_pages: Optional[int] = MAX_PAGES, max_bytes: Optional[int] = MAX_BYTES,
+                 index_pages: bool = True, include_images: bool = PDF_IMAGES, record_warc: bool = False):
+        self.output_formats = output_formats
+        self.output_dir = output_dir
+        self.max_depth = max_depth
+        self.timeout_minutes = timeout_minutes
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.index_pages = index_pages
+        self.include_images = include_images and 'pdf' in output_formats
+        self.record_warc = record_warc
+        self.concurrency = concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self._global_slots: Optional[asyncio.Semaphore] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return self._host_slots[host]
+
+    async def run(self, urls: List[str]) -> Dict:
+        """Crawl all URLs and return the summary dict"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        # Semaphores are created here so they belong to the running event loop
+        self._global_slots = asyncio.Semaphore(self.concurrency)
+        self._host_slots = {}
+        started = time.time()
+        sites = await asyncio.gather(*(self._run_site(url) for url in urls))
+        failed = sum(1 for site in sites if site['status'] != 'ok')
+        return {
+            'started_at': datetime.fromtimestamp(started).isoformat(timespec='seconds'),
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+            'total_seconds': round(time.time() - started, 3),
+            'output_formats': self.output_formats,
+            'succeeded': len(sites) - failed,
+            'failed': failed,
+            'sites': sites,
+        }
+
+    async def _run_site(self, url: str) -> Dict:
+        # Per-host slot first so a busy host doesn't hold global slots while waiting
+        async with self._host_semaphore(url):
+            async with self._global_slots:
+                return await self._crawl_site(url)
+
+    async def _crawl_site(self, url: str) -> Dict:
+        from .doc_scraper import DocumentationScraper
+        from .search_index import get_search_index
+
+        result = {
+            'url': url,
+            'status': 'failed',
+            'pages': 0,
+            'bytes_downloaded': 0,
+            'failed_urls': 0,
+            'crawl_seconds': 0.0,
+            'render_seconds': 0.0,
+            'total_seconds': 0.0,
+            'artifacts': {},
+            'errors': {},
+        }
+        started = time.monotonic()
+        basename = site_basename(url)
+        scraper = None
+
+        try:
+            warc_path = os.path.join(self.output_dir, f"{basename}.warc.gz") if self.record_warc else None
+            scraper = DocumentationScraper(url, include_images=self.include_images, warc_path=warc_path,
+                                           convert_markdown=bool({'markdown', 'zip'} & set(self.output_formats)))
+            if warc_path:
+                result['warc'] = warc_path
+            search_index = get_search_index() if self.index_pages else None
+            if search_index:
+                scraper.page_listeners.append(lambda page: search_index.add_page(basename, page))
+            if 'jsonl' in self.output_formats:
+                scraper.stream_jsonl(os.path.join(self.output_dir, basename + '.jsonl'))
+            if 'zip' in self.output_formats:
+                scraper.stream_zip(os.path.join(self.output_dir, basename + '.zip'))
+
+            logger.info(f"[batch] Crawling {url}")
+            pages = await scraper.scrape_documentation(
+                max_depth=self.max_depth, timeout_minutes=self.timeout_minutes,
+                max_pages=self.max_pages, max_bytes=self.max_bytes
+            )
+            crawled = time.monotonic()
+            result.update({
+                'pages': len(pages),
+                'bytes_downloaded': scraper.bytes_downloaded,
+                'failed_urls': len(scraper.failed_urls),
+                'crawl_seconds': round(crawled - started, 3),
+            })
+
+            if not pages:
+                result['errors']['crawl'] = 'No pages found'
+                return result
+
+            outputs = await scraper.generate_outputs(
+                pages, self.output_formats, os.path.join(self.output_dir, basename)
+            )
+            result['render_seconds'] = round(time.monotonic() - crawled, 3)
+            for fmt, output in outputs.items():
+                if isinstance(output, Exception):
+                    result['errors'][fmt] = str(output)
+                else:
+                    result['artifacts'][fmt] = output
+
+            if not result['errors']:
+                result['status'] = 'ok'
+            return result
+
+        except Exception as e:
+            logger.error(f"[batch] {url} failed: {str(e)}")
+            result['errors']['crawl'] = str(e)
+            return result
+
+        finally:
+            if scraper:
+                scraper.close()
+            result['total_seconds'] = round(time.monotonic() - started, 3)
+            logger.info(f"[batch] {url}: {result['status']} "
+                        f"({result['pages']} pages in {result['total_seconds']}s)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from .doc_scraper import OUTPUT_FORMATS
+
+    parser = argparse.ArgumentParser(
+        description="Crawl many documentation sites without the web interface."
+    )
+    parser.add_argument('url_file', help="File with one URL per line ('-' for stdin)")
+    parser.add_argument('-f', '--format', dest='formats', action='append', choices=list(OUTPUT_FORMATS),
+                        help="Output format, may be repeated (default: markdown)")
+    parser.add_argument('-o', '--output-dir', default=OUTPUT_DIR, help=f"Output directory (default: {OUTPUT_DIR})")
+    parser.add_argument('-s', '--summary', help="Write the JSON summary here (default: stdout)")
+    parser.add_argument('-c', '--concurrency', type=int, default=BATCH_CONCURRENCY,
+                        help=f"Sites crawled at the same time (default: {BATCH_CONCURRENCY})")
+    parser.add_argument('--per-host', type=int, default=BATCH_PER_HOST_CONCURRENCY,
+                        help=f"Sites on one host crawled at the same time (default: {BATCH_PER_HOST_CONCURRENCY})")
+    parser.add_argument('--max-depth', type=int, default=MAX_DEPTH)
+    parser.add_argument('--timeout-minutes', type=float, default=TIMEOUT_MINUTES)
+    parser.add_argument('--max-pages', type=int, default=MAX_PAGES)
+    parser.add_argument('--max-bytes', type=int, default=MAX_BYTES)
+    parser.add_argument('--no-index', action='store_true', help="Don't add pages to the search index")
+    parser.add_argument('--images', action='store_true', default=PDF_IMAGES,
+                        help="Include page images in PDF output")
+    parser.add_argument('--warc', action='store_true',
+                        help="Record every fetched response to <output>.warc.gz for offline replay")
+    parser.add_argument('-q', '--quiet', action='store_true', help="Only log warnings and errors")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point, returns the process exit code (1 if any site failed)"""
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO,
+                        format='%(asctime)s %(levelname)s %(name)s: %(message)s', force=True)
+
+    urls = read_url_file(args.url_file)
+    if not urls:
+        print("No URLs to crawl", file=sys.stderr)
+        return 1
+
+    runner = BatchRunner(
+        output_formats=args.formats or ['markdown'],
+        output_dir=args.output_dir,
+        concurrency=max(1, args.concurrency),
+        per_host_concurrency=max(1, args.per_host),
+        max_depth=args.max_depth,
+        timeout_minutes=args.timeout_minutes,
+        max_pages=args.max_pages,
+        max_bytes=args.max_bytes,
+        index_pages=not args.no_index,
+        include_images=args.images,
+        record_warc=args.warc,
+    )
+    summary = asyncio.run(runner.run(urls))
+
+    summary_json = json.dumps(summary, indent=2)
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            f.write(summary_json)
+        print(f"{summary['succeeded']} succeeded, {summary['failed']} failed - summary written to {args.summary}")
+    else:
+        print(summary_json)
+
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+Cross-page boilerplate detection and removal
+
+Extracted page text is split into blocks (runs of text separated by blank
+lines) and each block is fingerprinted. The filter counts on how many pages
+of the crawl each fingerprint appears, and blocks present on at least
+BOILERPLATE_THRESHOLD of the pages seen so far (nav menus, cookie banners,
+footers) are removed. Everything works on the extracted text as pages
+arrive, so no second pass over the HTML is needed.
+"""
+
+import hashlib
+import re
+from typing import Dict, List, Tuple
+
+# Import config settings
+try:
+    from .config import BOILERPLATE_THRESHOLD, BOILERPLATE_MIN_PAGES, BOILERPLATE_MIN_BLOCK_CHARS
+except ImportError:
+    try:
+        from config import BOILERPLATE_THRESHOLD, BOILERPLATE_MIN_PAGES, BOILERPLATE_MIN_BLOCK_CHARS
+    except ImportError:
+        # Fallback if config import fails
+        BOILERPLATE_THRESHOLD = 0.5
+        BOILERPLATE_MIN_PAGES = 5
+        BOILERPLATE_MIN_BLOCK_CHARS = 20
+
+BLOCK_SEPARATOR = re.compile(r'\n\s*\n')
+WHITESPACE = re.compile(r'\s+')
+LIST_MARKER = re.compile(r'^(?:[•*+-]|\d+[.)])\s+', re.MULTILINE)
+# Markdown syntax stripped so converted blocks fingerprint like their extracted text
+MARKDOWN_LINK = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+MARKDOWN_MARKUP = re.compile(r'^(?:#{1,6}|>)\s+|\*\*|__|`|\\(?=[^\w\s])', re.MULTILINE)
+PRUNE_INTERVAL = 256  # Pages between pruning fingerprints seen only once
+
+
+def _fingerprint(block: str) -> bytes:
+    normalized = WHITESPACE.sub(' ', LIST_MARKER.sub('', block)).strip().lower()
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).digest()
+
+
+class BoilerplateFilter:
+    """Incremental document-frequency filter for repeated text blocks"""
+
+    def __init__(self, threshold: float = BOILERPLATE_THRESHOLD,
+                 min_pages: int = BOILERPLATE_MIN_PAGES,
+                 min_block_chars: int = BOILERPLATE_MIN_BLOCK_CHARS):
+        self.threshold = threshold
+        self.min_pages = min_pages
+        self.min_block_chars = min_block_chars
+        self.page_frequency: Dict[bytes, int] = {}
+        self.pages_seen = 0
+        self.bytes_removed = 0
+        self.blocks_removed = 0
+
+    @property
+    def ready(self) -> bool:
+        """Whether enough pages have been seen for removal to be reliable"""
+        return self.pages_seen >= self.min_pages
+
+    def _split(self, text: str) -> List[Tuple[str, bytes]]:
+        blocks = [block.strip() for block in BLOCK_SEPARATOR.split(text)]
+        return [(block, _fingerprint(block)) for block in blocks if block]
+
+    def observe(self, text: str) -> List[Tuple[str, bytes]]:
+        """Count a page's blocks and return them for a later clean()"""
+        blocks = self._split(text)
+        for fingerprint in {fingerprint for _, fingerprint in blocks}:
+            self.page_frequency[fingerprint] = self.page_frequency.get(fingerprint, 0) + 1
+        self.pages_seen += 1
+
+        if self.pages_seen % PRUNE_INTERVAL == 0:
+            # Blocks seen once by now are page-specific; keep the table bounded
+            self.page_frequency = {fp: count for fp, count in self.page_frequency.items() if count > 1}
+
+        return blocks
+
+    def is_boilerplate(self, block: str, fingerprint: bytes) -> bool:
+        if not self.ready or len(block) < self.min_block_chars:
+            return False
+        return self.page_frequency.get(fingerprint, 0) / self.pages_seen >= self.threshold
+
+    def clean(self, blocks: List[Tuple[str, bytes]]) -> str:
+        """Join a page's blocks, dropping those that are boilerplate"""
+        kept = []
+        removed = []
+        for block, fingerprint in blocks:
+            if self.is_boilerplate(block, fingerprint):
+                removed.append(block)
+            else:
+                kept.append(block)
+
+        # Never empty a page completely; keep it as-is instead
+        if not kept:
+            return '\n\n'.join(block for block, _ in blocks)
+
+        self.bytes_removed += sum(len(block.encode('utf-8')) for block in removed)
+        self.blocks_removed += len(removed)
+        return '\n\n'.join(kept)
+
+    def clean_markdown(self, markdown: str) -> str:
+        """Drop boilerplate blocks from a page's converted Markdown
+
+        Blocks are matched by their text without Markdown syntax, so this
+        removes what clean() removes from the extracted text; code blocks
+        are always kept. Removals are not counted in the statistics again.
+        """
+        kept = []
+        in_fence = False
+        for block in BLOCK_SEPARATOR.split(markdown):
+            fenced = in_fence or '```' in block
+            in_fence ^= block.count('```') % 2 == 1
+            text = MARKDOWN_MARKUP.sub('', MARKDOWN_LINK.sub(r'\1', block)).strip()
+            if fenced or not text or not self.is_boilerplate(text, _fingerprint(text)):
+                kept.append(block)
+        return '\n\n'.join(kept) if kept else markdown
@@ -17,15 +17,79 @@ PORT = 8000
 OUTPUT_DIR = "downloads"  # Local downloads for web serving
 USER_DOWNLOADS_DIR = os.path.expanduser("~/Downloads")  # User's system Downloads folder
 TEMP_DIR = "temp"  # Temporary files (HTML before PDF conversion)
+CACHE_DIR = "cache"  # Persistent caches shared across crawls
 TEMPLATE_DIR = "templates"
 STATIC_DIR = "static"
 
 # Scraping settings  
 MAX_DEPTH = 3  # Maximum link depth to follow
 TIMEOUT_MINUTES = 10  # Maximum time to spend scraping
-REQUEST_TIMEOUT = 10
+REQUEST_TIMEOUT = 10  # Upper bound for a single request in seconds
 REQUEST_DELAY = 0.5  # Delay between requests in seconds
 
+# WARC recording settings
+WARC_RECORD = False  # Write every fetched response of web jobs to a .warc.gz file
+WARC_DIR = os.path.join(OUTPUT_DIR, "warc")  # Where recorded WARC files are written
+
+# Artifact delivery settings
+# How finished artifacts reach USER_DOWNLOADS_DIR: "link" (hardlink, else reflink,
+# else copy; no second copy on the same filesystem), "copy" or "none"
+ARTIFACT_PUBLISH_MODE = "link"
+ARTIFACT_PUBLISH_COMMAND = None  # Optional command run per artifact, e.g. "rclone copy {path} remote:docs"
+PRECOMPRESS_ENCODINGS = ["zstd", "gzip"]  # Variants built for Markdown/HTML downloads (zstd needs zstandard)
+
+# Job cancellation settings
+CANCEL_ON_DISCONNECT = True  # Cancel a job when its WebSocket client goes away and doesn't come back
+DISCONNECT_GRACE_SECONDS = 30  # Time a client has to reconnect before its job is cancelled
+WEBSOCKET_PING_SECONDS = 20  # Keep-alive interval for idle progress WebSockets
+
+# Job store settings (GET /jobs)
+JOB_STORE_FILE = os.path.join(CACHE_DIR, "jobs.sqlite")  # State, progress and artifacts of web jobs
+JOB_HISTORY_LIMIT = 1000  # Most recent jobs kept; older ones are pruned at startup
+JOB_PERSIST_INTERVAL = 1.0  # Seconds between writes of a running job's progress (state changes are immediate)
+JOB_LONG_POLL_MAX_SECONDS = 60  # Upper bound for the wait parameter of GET /jobs/{id}
+
+# Batch CLI settings
+BATCH_CONCURRENCY = 4  # Sites crawled at the same time
+BATCH_PER_HOST_CONCURRENCY = 1  # Sites on the same host crawled at the same time
+
+# Distributed crawl settings
+CRAWL_BACKEND_URL = "sqlite:///" + os.path.join(CACHE_DIR, "crawl_frontier.sqlite")  # or redis://host:6379/0
+CLAIM_LEASE_SECONDS = 120  # Claimed URLs are handed to another worker if not finished in time
+WORKER_IDLE_POLL = 1.0  # Seconds a worker waits when the shared frontier is momentarily empty
+
+# Retry and circuit breaker settings
+MAX_RETRIES = 3  # Retries per URL for transient errors
+RETRY_BACKOFF_BASE = 0.5  # Initial backoff delay in seconds (doubled per attempt)
+RETRY_BACKOFF_MAX = 8.0  # Upper bound for a single backoff delay
+RETRYABLE_STATUS_CODES = [408, 425, 429, 500, 502, 503, 504]
+CIRCUIT_BREAKER_THRESHOLD = 5  # Consecutive failures before a host is paused
+CIRCUIT_BREAKER_COOLDOWN = 30  # Seconds a tripped host stays paused
+MIN_REQUEST_TIMEOUT = 2  # Lower bound for latency-aware timeouts
+LATENCY_TIMEOUT_FACTOR = 4  # Timeout = observed latency x factor (clamped)
+RETRY_QUEUE_PASSES = 1  # Passes over failed URLs at the end of a crawl
+
+# Crawl budget settings (None = unlimited)
+MAX_PAGES = None  # Stop after this many pages have been scraped
+MAX_BYTES = None  # Stop after this many response bytes have been downloaded
+
+# Page store settings
+PAGE_STORE_MEMORY_LIMIT = 32 * 1024 * 1024  # Bytes of page text kept in memory before spilling to TEMP_DIR
+
+# Frontier priority settings - higher scores are fetched first
+FRONTIER_WEIGHTS = {
+    'depth': 1.0,  # Penalty per link level away from the start URL
+    'navigation': 1.5,  # Bonus for links early in the nav/sidebar
+    'path_affinity': 2.0,  # Bonus for sharing the start URL's path prefix
+    'sitemap': 1.0,  # Bonus scaled by sitemap.xml <priority>
+    'low_value': 2.0,  # Penalty for paths matching LOW_VALUE_PATHS
+    'footer': 1.0,  # Penalty for links only found in page footers
+}
+LOW_VALUE_PATHS = [
+    'changelog', 'release-notes', 'releases', 'blog', 'news',
+    'legal', 'privacy', 'terms', 'license', 'careers', 'contact'
+]
+
 # Content extraction settings
 CONTENT_SELECTORS = [
     'main',
@@ -48,6 +112,66 @@ TITLE_SELECTORS = [
     '.content-title'
 ]
 
+# Extraction profile settings
+EXTRACTION_PROFILE_FILE = os.path.join(CACHE_DIR, "extraction_profiles.json")  # Learned selectors per domain
+EXTRACTION_OVERRIDES_FILE = "extraction_overrides.json"  # Pinned selectors per domain, e.g.
+# {"docs.example.com": {"content": [".md-content"], "title": ["h1.title"]}}
+PROFILE_LEARN_PAGES = 3  # Pages a selector must match before it is tried first
+
+# Structured-data fast path settings
+# Fetch llms.txt-listed or Mintlify Markdown pages and Next.js page data instead of HTML when a site offers them
+STRUCTURED_FAST_PATH = True
+FAST_PATH_MAX_MISSES = 3  # Consecutive pages without a usable payload before a site is fetched as HTML only
+
+# Boilerplate removal settings
+BOILERPLATE_REMOVAL = True  # Drop text blocks repeated across many pages (menus, banners, footers)
+BOILERPLATE_THRESHOLD = 0.5  # Share of pages a block must appear on to count as boilerplate
+BOILERPLATE_MIN_PAGES = 5  # Pages seen before anything is removed (early pages are held back until then)
+BOILERPLATE_MIN_BLOCK_CHARS = 20  # Shorter blocks (e.g. repeated headings) are never removed
+
+# PDF image settings
+PDF_IMAGES = False  # Include images from the page content in PDF output
+IMAGE_CACHE_DIR = os.path.join(CACHE_DIR, "images")  # Processed images, shared across jobs
+IMAGE_MAX_WIDTH_PX = 940  # Downscale target: A4 text width at 150 dpi
+IMAGE_JPEG_QUALITY = 80  # Recompression quality for opaque images
+IMAGE_MIN_PX = 32  # Smaller images (icons, badges) are skipped
+IMAGE_MAX_SOURCE_BYTES = 10 * 1024 * 1024  # Larger downloads are skipped
+IMAGE_FETCH_CONCURRENCY = 4  # Image downloads in flight at once
+IMAGE_BUDGET_BYTES = 20 * 1024 * 1024  # Total image bytes per PDF; later images are left out
+IMAGE_MAX_PER_PAGE = 30  # Images kept per scraped page
+
+# Markdown conversion settings
+MARKDOWN_CACHE_DIR = os.path.join(CACHE_DIR, "markdown")  # Converted page fragments, keyed by content hash
+MARKDOWN_WORKERS = 2  # Processes converting HTML to Markdown, shared by concurrent jobs (0 = a thread of the crawling process)
+
+# Zip archive settings (one Markdown file per page)
+ARCHIVE_COMPRESS_WORKERS = 4  # Threads compressing pages in parallel
+ARCHIVE_COMPRESS_LEVEL = 6  # zlib level, 1 (fast) to 9 (small)
+
+# JSONL export settings
+JSONL_CHUNK_CHARS = 2000  # Upper bound for the text of one JSONL chunk
+
+# Storage retention settings (the janitor runs in the background of the web app)
+JANITOR_INTERVAL_SECONDS = 600  # Time between storage sweeps
+# Per area: files unused for max_age_hours are removed, then least recently
+# downloaded files until the area fits in max_bytes (None = no limit)
+STORAGE_RETENTION = {
+    'temp': {'max_age_hours': 1, 'max_bytes': None},
+    'artifacts': {'max_age_hours': 7 * 24, 'max_bytes': 2 * 1024 ** 3},
+    'warc': {'max_age_hours': 7 * 24, 'max_bytes': 2 * 1024 ** 3},  # Recorded crawls in WARC_DIR
+    'user_downloads': {'max_age_hours': 30 * 24, 'max_bytes': None},  # Only files we published, never other files
+    'cache': {'max_age_hours': 30 * 24, 'max_bytes': 1024 ** 3},  # Databases in CACHE_DIR are never removed
+    # Rows of the databases in CACHE_DIR, by age (the files themselves are kept)
+    'search_index': {'max_age_hours': 7 * 24},  # Same as 'artifacts', so hits point at downloadable crawls
+    'image_index': {'max_age_hours': 30 * 24},
+    'crawl_frontier': {'max_age_hours': 7 * 24},  # Distributed crawl jobs with their frontier and pages
+}
+PUBLISHED_LEDGER_FILE = os.path.join(CACHE_DIR, "published.json")  # Files placed in USER_DOWNLOADS_DIR
+
+# Search index settings
+SEARCH_INDEX_ENABLED = True  # Index every scraped page for GET /search
+SEARCH_INDEX_FILE = os.path.join(CACHE_DIR, "search_index.sqlite")  # SQLite FTS5 database
+
 # URL filtering settings
 SKIP_EXTENSIONS = [
     '.png', '.jpg', '.jpeg', '.gif', '.svg',
@@ -67,5 +191,12 @@ SKIP_PATHS = [
 # User agent for web scraping
 USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 
-# Ensure output directory exists
-os.makedirs(OUTPUT_DIR, exist_ok=True)
\ No newline at end of file
+
+def ensure_directories():
+    """Create the output, temp and cache directories
+
+    Called from application startup rather than at import time, so importing
+    the config has no side effects.
+    """
+    for directory in (OUTPUT_DIR, TEMP_DIR, CACHE_DIR):
+        os.makedirs(directory, exist_ok=True)
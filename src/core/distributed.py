@@ -0,0 +1,607 @@
+"""
+Distributed crawl mode: many worker processes sharing one frontier
+
+A crawl job lives in a shared backend holding the frontier (a priority
+queue plus seen-set) and the extracted pages. Any number of worker
+processes, on one machine or several, claim URLs from it, scrape them and
+push pages and newly found links back. A single renderer then assembles the
+pages in arrival order and writes the output files.
+
+Backends are chosen by URL:
+    sqlite:///path/to/frontier.sqlite   single node, multiple processes
+    redis://host:6379/0                 multiple nodes (any Redis-compatible server)
+
+Usage:
+    python crawl_worker.py run https://docs.example.com/ --workers 4 -f markdown
+    python crawl_worker.py seed https://docs.example.com/ --backend redis://queue:6379/0
+    python crawl_worker.py work JOB_ID --backend redis://queue:6379/0 --workers 8
+    python crawl_worker.py render JOB_ID --backend redis://queue:6379/0 -f pdf
+"""
+
+import abc
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Import config settings
+try:
+    from .config import (
+        CRAWL_BACKEND_URL, CLAIM_LEASE_SECONDS, WORKER_IDLE_POLL, OUTPUT_DIR,
+        MAX_DEPTH, TIMEOUT_MINUTES, MAX_PAGES, MAX_BYTES, REQUEST_DELAY, RETRY_QUEUE_PASSES
+    )
+except ImportError:
+    from config import (
+        CRAWL_BACKEND_URL, CLAIM_LEASE_SECONDS, WORKER_IDLE_POLL, OUTPUT_DIR,
+        MAX_DEPTH, TIMEOUT_MINUTES, MAX_PAGES, MAX_BYTES, REQUEST_DELAY, RETRY_QUEUE_PASSES
+    )
+
+logger = logging.getLogger(__name__)
+
+
+class FrontierBackend(abc.ABC):
+    """Shared frontier, seen-set and page sink for one or more crawl jobs
+
+    URLs move through the states queued -> claimed -> done/failed. A claimed
+    URL whose lease expires (its worker died) is queued again with its
+    original score.
+    """
+
+    @abc.abstractmethod
+    def create_job(self, job_id: str, options: Dict):
+        pass
+
+    @abc.abstractmethod
+    def job_options(self, job_id: str) -> Dict:
+        pass
+
+    @abc.abstractmethod
+    def push(self, job_id: str, url: str, depth: int, score: float) -> bool:
+        """Queue a URL unless it has been seen before; returns True if queued"""
+
+    @abc.abstractmethod
+    def claim(self, job_id: str) -> Optional[Tuple[str, int, int]]:
+        """Claim the highest-priority queued URL as (url, depth, attempts)"""
+
+    @abc.abstractmethod
+    def complete(self, job_id: str, url: str):
+        pass
+
+    @abc.abstractmethod
+    def fail(self, job_id: str, url: str, retry: bool, error: str = ""):
+        """Give up on a claimed URL, or queue it again (with its original score) for another attempt"""
+
+    @abc.abstractmethod
+    def add_page(self, job_id: str, page: Dict, nbytes: int = 0):
+        """Append an extracted page and count the bytes downloaded for it"""
+
+    @abc.abstractmethod
+    def iter_pages(self, job_id: str) -> Iterator[Dict]:
+        """Stream the job's pages in arrival order"""
+
+    @abc.abstractmethod
+    def counts(self, job_id: str) -> Dict[str, int]:
+        """Frontier state counts plus 'pages' and 'bytes'"""
+
+    @abc.abstractmethod
+    def prune(self, older_than: float) -> int:
+        """Delete jobs created before a timestamp with their frontier and pages; returns records removed"""
+
+    def is_finished(self, job_id: str) -> bool:
+        counts = self.counts(job_id)
+        return counts['queued'] == 0 and counts['claimed'] == 0
+
+
+class SQLiteFrontierBackend(FrontierBackend):
+    """Frontier in a SQLite file, shared by processes on one machine"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        job_id TEXT PRIMARY KEY,
+        options TEXT NOT NULL,
+        bytes INTEGER NOT NULL DEFAULT 0,
+        created_at REAL NOT NULL DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS frontier (
+        job_id TEXT NOT NULL,
+        url TEXT NOT NULL,
+        depth INTEGER NOT NULL,
+        score REAL NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        state TEXT NOT NULL DEFAULT 'queued',
+        claimed_at REAL,
+        error TEXT,
+        PRIMARY KEY (job_id, url)
+    );
+    CREATE INDEX IF NOT EXISTS frontier_queue ON frontier (job_id, state, score DESC);
+    CREATE TABLE IF NOT EXISTS pages (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_id TEXT NOT NULL,
+        data TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS pages_job ON pages (job_id, seq);
+    """
+
+    def __init__(self, path: str, lease_seconds: float = CLAIM_LEASE_SECONDS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self._db: Optional[sqlite3.Connection] = None
+        self._pid = None
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        # One connection per process; connections must not cross a fork
+        if self._db is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+            self._db.executescript(self.SCHEMA)
+            columns = {row[1] for row in self._db.execute('PRAGMA table_info(jobs)')}
+            if 'created_at' not in columns:
+                # Frontier files from before job ages were recorded; their jobs count as new
+                self._db.execute('ALTER TABLE jobs ADD COLUMN created_at REAL NOT NULL DEFAULT 0')
+                self._db.execute('UPDATE jobs SET created_at = ?', (time.time(),))
+            self._pid = os.getpid()
+        return self._db
+
+    def close(self):
+        if self._db is not None and self._pid == os.getpid():
+            self._db.close()
+        self._db = None
+
+    @contextmanager
+    def _transaction(self):
+        db = self.db
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            yield db
+            db.execute('COMMIT')
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+
+    def create_job(self, job_id: str, options: Dict):
+        self.db.execute('INSERT OR REPLACE INTO jobs (job_id, options, created_at) VALUES (?, ?, ?)',
+                        (job_id, json.dumps(options), time.time()))
+
+    def job_options(self, job_id: str) -> Dict:
+        row = self.db.execute('SELECT options FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown crawl job {job_id}")
+        return json.loads(row[0])
+
+    def push(self, job_id: str, url: str, depth: int, score: float) -> bool:
+        cursor = self.db.execute(
+            'INSERT OR IGNORE INTO frontier (job_id, url, depth, score) VALUES (?, ?, ?, ?)',
+            (job_id, url, depth, score)
+        )
+        return cursor.rowcount > 0
+
+    def claim(self, job_id: str) -> Optional[Tuple[str, int, int]]:
+        now = time.time()
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE frontier SET state = 'queued' WHERE job_id = ? AND state = 'claimed' AND claimed_at < ?",
+                (job_id, now - self.lease_seconds)
+            )
+            row = db.execute(
+                "SELECT url, depth, attempts FROM frontier WHERE job_id = ? AND state = 'queued' "
+                "ORDER BY score DESC LIMIT 1",
+                (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE frontier SET state = 'claimed', claimed_at = ? WHERE job_id = ? AND url = ?",
+                (now, job_id, row[0])
+            )
+        return row[0], row[1], row[2]
+
+    def complete(self, job_id: str, url: str):
+        self.db.execute("UPDATE frontier SET state = 'done' WHERE job_id = ? AND url = ?", (job_id, url))
+
+    def fail(self, job_id: str, url: str, retry: bool, error: str = ""):
+        self.db.execute(
+            "UPDATE frontier SET state = ?, attempts = attempts + 1, error = ? WHERE job_id = ? AND url = ?",
+            ('queued' if retry else 'failed', error[:500], job_id, url)
+        )
+
+    def add_page(self, job_id: str, page: Dict, nbytes: int = 0):
+        with self._transaction() as db:
+            db.execute('INSERT INTO pages (job_id, data) VALUES (?, ?)', (job_id, json.dumps(page)))
+            db.execute('UPDATE jobs SET bytes = bytes + ? WHERE job_id = ?', (nbytes, job_id))
+
+    def iter_pages(self, job_id: str) -> Iterator[Dict]:
+        last_seq = 0
+        while True:
+            rows = self.db.execute(
+                'SELECT seq, data FROM pages WHERE job_id = ? AND seq > ? ORDER BY seq LIMIT 256',
+                (job_id, last_seq)
+            ).fetchall()
+            if not rows:
+                return
+            for seq, data in rows:
+                last_seq = seq
+                yield json.loads(data)
+
+    def prune(self, older_than: float) -> int:
+        """Delete jobs created before a timestamp with their frontier and pages; returns rows removed"""
+        removed = 0
+        with self._transaction() as db:
+            stale = [row[0] for row in db.execute('SELECT job_id FROM jobs WHERE created_at < ?', (older_than,))]
+            for job_id in stale:
+                for table in ('frontier', 'pages', 'jobs'):
+                    removed += db.execute(f'DELETE FROM {table} WHERE job_id = ?', (job_id,)).rowcount
+        return removed
+
+    def counts(self, job_id: str) -> Dict[str, int]:
+        counts = {'queued': 0, 'claimed': 0, 'done': 0, 'failed': 0}
+        for state, count in self.db.execute(
+                'SELECT state, COUNT(*) FROM frontier WHERE job_id = ? GROUP BY state', (job_id,)):
+            counts[state] = count
+        counts['pages'] = self.db.execute('SELECT COUNT(*) FROM pages WHERE job_id = ?', (job_id,)).fetchone()[0]
+        row = self.db.execute('SELECT bytes FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+        counts['bytes'] = row[0] if row else 0
+        return counts
+
+
+# Requeue claims whose lease expired (at their pushed score), then pop the best
+# queued URL and claim it; one script so no two workers can claim the same URL
+# and a worker dying mid-claim can't lose one.
+# KEYS: queue, claimed, depth, attempts, score; ARGV: now, expired_before
+REDIS_CLAIM_SCRIPT = """
+local claimed = redis.call('HGETALL', KEYS[2])
+for i = 1, #claimed, 2 do
+    if tonumber(claimed[i + 1]) < tonumber(ARGV[2]) then
+        redis.call('HDEL', KEYS[2], claimed[i])
+        redis.call('ZADD', KEYS[1], redis.call('HGET', KEYS[5], claimed[i]) or 0, claimed[i])
+    end
+end
+local popped = redis.call('ZPOPMAX', KEYS[1])
+if #popped == 0 then
+    return false
+end
+local url = popped[1]
+redis.call('HSET', KEYS[2], url, ARGV[1])
+return {url, redis.call('HGET', KEYS[3], url) or '0', redis.call('HGET', KEYS[4], url) or '0'}
+"""
+
+
+class RedisFrontierBackend(FrontierBackend):
+    """Frontier in a Redis-compatible store, shared by workers on many machines
+
+    ``client`` is any object with the redis-py API (redis.Redis, a
+    fakeredis instance for local runs, ...) created with
+    ``decode_responses=True``. The server must support Lua scripting.
+    """
+
+    # Per-job keys, all deleted together when the job is pruned
+    JOB_KEYS = ('options', 'seen', 'depth', 'score', 'queue', 'claimed', 'attempts', 'done', 'failed',
+                'pages', 'bytes')
+
+    def __init__(self, client, prefix: str = 'docdl', lease_seconds: float = CLAIM_LEASE_SECONDS):
+        self.client = client
+        self.prefix = prefix
+        self.lease_seconds = lease_seconds
+        self._claim_script = client.register_script(REDIS_CLAIM_SCRIPT)
+
+    def _key(self, job_id: str, name: str) -> str:
+        return f"{self.prefix}:{job_id}:{name}"
+
+    def create_job(self, job_id: str, options: Dict):
+        pipe = self.client.pipeline()
+        pipe.set(self._key(job_id, 'options'), json.dumps(options))
+        pipe.zadd(f"{self.prefix}:jobs", {job_id: time.time()})  # Creation times, for prune()
+        pipe.execute()
+
+    def job_options(self, job_id: str) -> Dict:
+        data = self.client.get(self._key(job_id, 'options'))
+        if data is None:
+            raise KeyError(f"Unknown crawl job {job_id}")
+        return json.loads(data)
+
+    def push(self, job_id: str, url: str, depth: int, score: float) -> bool:
+        # The seen-set makes push idempotent across workers
+        if not self.client.sadd(self._key(job_id, 'seen'), url):
+            return False
+        pipe = self.client.pipeline()
+        pipe.hset(self._key(job_id, 'depth'), url, depth)
+        pipe.hset(self._key(job_id, 'score'), url, score)  # Reused when the URL is queued again
+        pipe.zadd(self._key(job_id, 'queue'), {url: score})
+        pipe.execute()
+        return True
+
+    def claim(self, job_id: str) -> Optional[Tuple[str, int, int]]:
+        now = time.time()
+        keys = [self._key(job_id, name) for name in ('queue', 'claimed', 'depth', 'attempts', 'score')]
+        claimed = self._claim_script(keys=keys, args=[now, now - self.lease_seconds])
+        if not claimed:
+            return None
+        url, depth, attempts = claimed
+        return url, int(depth), int(attempts)
+
+    def complete(self, job_id: str, url: str):
+        pipe = self.client.pipeline()
+        pipe.hdel(self._key(job_id, 'claimed'), url)
+        pipe.incr(self._key(job_id, 'done'))
+        pipe.execute()
+
+    def fail(self, job_id: str, url: str, retry: bool, error: str = ""):
+        score = float(self.client.hget(self._key(job_id, 'score'), url) or 0) if retry else 0
+        pipe = self.client.pipeline()
+        pipe.hincrby(self._key(job_id, 'attempts'), url, 1)
+        if retry:
+            pipe.zadd(self._key(job_id, 'queue'), {url: score})
+        else:
+            pipe.hset(self._key(job_id, 'failed'), url, error[:500])
+        pipe.hdel(self._key(job_id, 'claimed'), url)
+        pipe.execute()
+
+    def add_page(self, job_id: str, page: Dict, nbytes: int = 0):
+        pipe = self.client.pipeline()
+        pipe.rpush(self._key(job_id, 'pages'), json.dumps(page))
+        pipe.incrby(self._key(job_id, 'bytes'), nbytes)
+        pipe.execute()
+
+    def iter_pages(self, job_id: str) -> Iterator[Dict]:
+        key = self._key(job_id, 'pages')
+        start = 0
+        while True:
+            batch = self.client.lrange(key, start, start + 255)
+            if not batch:
+                return
+            for data in batch:
+                yield json.loads(data)
+            start += len(batch)
+
+    def counts(self, job_id: str) -> Dict[str, int]:
+        pipe = self.client.pipeline()
+        pipe.zcard(self._key(job_id, 'queue'))
+        pipe.hlen(self._key(job_id, 'claimed'))
+        pipe.get(self._key(job_id, 'done'))
+        pipe.hlen(self._key(job_id, 'failed'))
+        pipe.llen(self._key(job_id, 'pages'))
+        pipe.get(self._key(job_id, 'bytes'))
+        queued, claimed, done, failed, pages, nbytes = pipe.execute()
+        return {
+            'queued': queued, 'claimed': claimed, 'done': int(done or 0),
+            'failed': failed, 'pages': pages, 'bytes': int(nbytes or 0),
+        }
+
+    def prune(self, older_than: float) -> int:
+        """Delete the keys of jobs created before a timestamp; returns keys removed"""
+        index = f"{self.prefix}:jobs"
+        removed = 0
+        for job_id in self.client.zrangebyscore(index, '-inf', f"({older_than}"):
+            pipe = self.client.pipeline()
+            pipe.delete(*(self._key(job_id, name) for name in self.JOB_KEYS))
+            pipe.zrem(index, job_id)
+            removed += pipe.execute()[0]
+        return removed
+
+    def close(self):
+        self.client.close()
+
+
+def open_backend(url: str = CRAWL_BACKEND_URL) -> FrontierBackend:
+    """Create a backend from a sqlite:///path or redis://host:port/db URL"""
+    if url.startswith('sqlite:///'):
+        return SQLiteFrontierBackend(url[len('sqlite:///'):])
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("The redis package is required for redis:// backends (pip install redis)")
+        return RedisFrontierBackend(redis.Redis.from_url(url, decode_responses=True))
+    raise ValueError(f"Unsupported crawl backend URL: {url}")
+
+
+def create_job(backend: FrontierBackend, base_url: str, job_id: Optional[str] = None,
+               max_depth: int = MAX_DEPTH, timeout_minutes: float = TIMEOUT_MINUTES,
+               max_pages: Optional[int] = MAX_PAGES, max_bytes: Optional[int] = MAX_BYTES) -> str:
+    """Register a crawl job and seed its frontier with the start URL"""
+    job_id = job_id or f"crawl_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+    backend.create_job(job_id, {
+        'base_url': base_url.rstrip('/'),
+        'max_depth': max_depth,
+        'deadline': time.time() + timeout_minutes * 60,
+        'max_pages': max_pages,
+        'max_bytes': max_bytes,
+    })
+    backend.push(job_id, base_url.rstrip('/'), 0, 0.0)
+    logger.info(f"Created crawl job {job_id} for {base_url}")
+    return job_id
+
+
+async def run_worker(backend: FrontierBackend, job_id: str, worker_name: str = 'worker') -> int:
+    """Claim and scrape URLs of a job until its frontier is drained; returns pages scraped"""
+    from .doc_scraper import DocumentationScraper
+    from .frontier import CrawlFrontier
+
+    options = backend.job_options(job_id)
+    scraper = DocumentationScraper(options['base_url'])
+    # Scoring only: the queue itself lives in the backend
+    scorer = CrawlFrontier(options['base_url'], await scraper._load_sitemap_priorities())
+    for url, nav_position in await scraper._load_structured_manifest():
+        backend.push(job_id, url, 1, scorer.score(url, 1, nav_position))
+    scraped = 0
+
+    try:
+        while time.time() < options['deadline']:
+            counts = backend.counts(job_id)
+            if options['max_pages'] is not None and counts['pages'] >= options['max_pages']:
+                break
+            if options['max_bytes'] is not None and counts['bytes'] >= options['max_bytes']:
+                break
+
+            claimed = backend.claim(job_id)
+            if claimed is None:
+                if backend.is_finished(job_id):
+                    break
+                # Other workers may still add links
+                await asyncio.sleep(WORKER_IDLE_POLL)
+                continue
+
+            url, depth, attempts = claimed
+            bytes_before = scraper.bytes_downloaded
+            try:
+                page_data = await scraper._scrape_page(url)
+            except Exception as e:
+                retry = scraper.fetch_policy.is_retryable(e) and attempts < RETRY_QUEUE_PASSES
+                logger.error(f"[{worker_name}] Error scraping {url}: {str(e)}")
+                backend.fail(job_id, url, retry=retry, error=str(e))
+                continue
+
+            if page_data:
+                links = page_data.pop('links')
+                backend.add_page(job_id, page_data, scraper.bytes_downloaded - bytes_before)
+                scraped += 1
+                if depth < options['max_depth']:
+                    for link, nav_position, in_footer in links:
+                        backend.push(job_id, link, depth + 1,
+                                     scorer.score(link, depth + 1, nav_position, in_footer))
+            backend.complete(job_id, url)
+
+            # Small delay to be respectful to the server
+            await asyncio.sleep(REQUEST_DELAY)
+    finally:
+        scraper.extraction_profiles.save()
+        scraper.close()
+
+    logger.info(f"[{worker_name}] Finished with {scraped} pages")
+    return scraped
+
+
+def _worker_process(backend_url: str, job_id: str, worker_name: str):
+    logging.basicConfig(level=logging.INFO, format=f'%(asctime)s {worker_name} %(levelname)s: %(message)s')
+    asyncio.run(run_worker(open_backend(backend_url), job_id, worker_name))
+
+
+def spawn_workers(backend_url: str, job_id: str, count: int) -> List[multiprocessing.Process]:
+    """Start worker processes on this machine"""
+    context = multiprocessing.get_context('spawn')
+    processes = []
+    for index in range(count):
+        name = f"worker-{os.getpid()}-{index}"
+        process = context.Process(target=_worker_process, args=(backend_url, job_id, name), name=name)
+        process.start()
+        processes.append(process)
+    return processes
+
+
+async def render_job(backend: FrontierBackend, job_id: str, output_formats: List[str],
+                     output_dir: str = OUTPUT_DIR, wait: bool = True) -> Dict[str, object]:
+    """Assemble a job's pages (once the crawl is finished) and write the output files
+
+    Boilerplate removal and page listeners run here, once, over all pages
+    in arrival order, exactly as in a single-process crawl.
+    """
+    from .doc_scraper import DocumentationScraper
+
+    options = backend.job_options(job_id)
+    while wait and not backend.is_finished(job_id) and time.time() < options['deadline']:
+        await asyncio.sleep(WORKER_IDLE_POLL)
+
+    scraper = DocumentationScraper(options['base_url'])
+    try:
+        for page in backend.iter_pages(job_id):
+            scraper._store_page(page)
+        scraper._flush_pending_pages()
+        if not scraper.pages:
+            raise RuntimeError(f"Crawl job {job_id} produced no pages")
+
+        os.makedirs(output_dir, exist_ok=True)
+        return await scraper.generate_outputs(scraper.pages, output_formats, os.path.join(output_dir, job_id))
+    finally:
+        scraper.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from .doc_scraper import OUTPUT_FORMATS
+
+    parser = argparse.ArgumentParser(description="Distributed documentation crawl with a shared frontier.")
+    parser.add_argument('--backend', default=CRAWL_BACKEND_URL,
+                        help=f"sqlite:///path or redis://host:port/db (default: {CRAWL_BACKEND_URL})")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_crawl_options(command):
+        command.add_argument('--max-depth', type=int, default=MAX_DEPTH)
+        command.add_argument('--timeout-minutes', type=float, default=TIMEOUT_MINUTES)
+        command.add_argument('--max-pages', type=int, default=MAX_PAGES)
+        command.add_argument('--max-bytes', type=int, default=MAX_BYTES)
+
+    def add_render_options(command):
+        command.add_argument('-f', '--format', dest='formats', action='append', choices=list(OUTPUT_FORMATS),
+                             help="Output format, may be repeated (default: markdown)")
+        command.add_argument('-o', '--output-dir', default=OUTPUT_DIR)
+
+    run = commands.add_parser('run', help="Seed, crawl with local workers and render in one go")
+    run.add_argument('url')
+    run.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 2)
+    add_crawl_options(run)
+    add_render_options(run)
+
+    seed = commands.add_parser('seed', help="Create a job and print its id")
+    seed.add_argument('url')
+    seed.add_argument('--job', help="Job id (default: generated)")
+    add_crawl_options(seed)
+
+    work = commands.add_parser('work', help="Run worker processes for an existing job")
+    work.add_argument('job')
+    work.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 2)
+
+    render = commands.add_parser('render', help="Wait for a job to finish and write its output files")
+    render.add_argument('job')
+    add_render_options(render)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point, returns the process exit code"""
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s', force=True)
+    backend = open_backend(args.backend)
+
+    if args.command in ('run', 'seed'):
+        job_id = create_job(backend, args.url, getattr(args, 'job', None), args.max_depth,
+                            args.timeout_minutes, args.max_pages, args.max_bytes)
+        if args.command == 'seed':
+            print(job_id)
+            return 0
+    else:
+        job_id = args.job
+
+    if args.command in ('run', 'work'):
+        processes = spawn_workers(args.backend, job_id, max(1, args.workers))
+        for process in processes:
+            process.join()
+        if args.command == 'work':
+            return 0 if all(process.exitcode == 0 for process in processes) else 1
+
+    outputs = asyncio.run(render_job(backend, job_id, args.formats or ['markdown'], args.output_dir))
+    failed = False
+    for fmt, output in outputs.items():
+        if isinstance(output, Exception):
+            failed = True
+            print(f"❌ {fmt}: {output}")
+        else:
+            print(f"✅ {fmt}: {output}")
+    print(json.dumps({'job': job_id, **backend.counts(job_id)}))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,80 +1,204 @@
-import requests
-from bs4 import BeautifulSoup
 import asyncio
-import aiofiles
+import functools
 import os
-import tempfile
-from urllib.parse import urljoin, urlparse, parse_qs
-from markdownify import markdownify as md
-# Import for PDF generation
-try:
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
-    print("ReportLab not available. PDF generation will create HTML files instead.")
-from slugify import slugify
+from urllib.parse import urljoin, urlparse
 import re
-from typing import List, Dict, Optional
+import threading
+from typing import List, Dict, Optional, Tuple, Iterable, Iterator, Callable, Awaitable, TYPE_CHECKING
 import logging
 from datetime import datetime
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+# Heavy dependencies (requests, BeautifulSoup, ReportLab, aiofiles) are imported
+# on first use so importing this module stays cheap for the web app, CLI and workers
+if TYPE_CHECKING:
+    import requests
+    from bs4 import BeautifulSoup
+
 logger = logging.getLogger(__name__)
 
+
+@functools.lru_cache(maxsize=None)
+def reportlab_available() -> bool:
+    """Check (once) whether ReportLab can be imported for PDF generation"""
+    try:
+        import reportlab  # noqa: F401
+        return True
+    except ImportError:
+        logger.warning("ReportLab not available. PDF generation will create HTML files instead.")
+        return False
+
 # Import config settings
 try:
-    from .config import TEMP_DIR
+    from .config import (
+        TEMP_DIR, REQUEST_DELAY, RETRY_QUEUE_PASSES, MAX_PAGES, MAX_BYTES, BOILERPLATE_REMOVAL,
+        PDF_IMAGES, IMAGE_BUDGET_BYTES, IMAGE_MAX_PER_PAGE, IMAGE_MAX_WIDTH_PX, STRUCTURED_FAST_PATH
+    )
 except ImportError:
     try:
-        from config import TEMP_DIR
+        from config import (
+            TEMP_DIR, REQUEST_DELAY, RETRY_QUEUE_PASSES, MAX_PAGES, MAX_BYTES, BOILERPLATE_REMOVAL,
+            PDF_IMAGES, IMAGE_BUDGET_BYTES, IMAGE_MAX_PER_PAGE, IMAGE_MAX_WIDTH_PX, STRUCTURED_FAST_PATH
+        )
     except ImportError:
         TEMP_DIR = "temp"  # Fallback if config import fails
+        REQUEST_DELAY = 0.5
+        RETRY_QUEUE_PASSES = 1
+        MAX_PAGES = None
+        MAX_BYTES = None
+        BOILERPLATE_REMOVAL = True
+        PDF_IMAGES = False
+        IMAGE_BUDGET_BYTES = 20 * 1024 * 1024
+        IMAGE_MAX_PER_PAGE = 30
+        IMAGE_MAX_WIDTH_PX = 940
+        STRUCTURED_FAST_PATH = True
+
+try:
+    from .fetch_policy import FetchPolicy, CircuitOpenError
+    from .frontier import CrawlFrontier, parse_sitemap
+    from .page_store import PageStore
+    from .extraction_profile import ExtractionProfiles, get_extraction_profiles
+    from .boilerplate import BoilerplateFilter
+    from .image_cache import CachedImage, ImageCache, pillow_available
+    from .warc import WarcArchive, WarcWriter
+    from .jsonl_export import JsonlWriter
+    from .normalize import page_blocks, block_text, list_start, anchor_key, escape_markup
+    from .markdown_convert import get_markdown_converter, nest_headings
+    from .archive_export import ZipStreamWriter
+    from .site_frameworks import (
+        StructuredSource, MarkdownAlternates, NextDataSource, MARKDOWN_ALTERNATE_FRAMEWORKS,
+        detect_framework, canonical_page_url, parse_llms_txt, markdown_title, markdown_to_text, prepare_markdown
+    )
+except ImportError:
+    from fetch_policy import FetchPolicy, CircuitOpenError
+    from frontier import CrawlFrontier, parse_sitemap
+    from page_store import PageStore
+    from extraction_profile import ExtractionProfiles, get_extraction_profiles
+    from boilerplate import BoilerplateFilter
+    from image_cache import CachedImage, ImageCache, pillow_available
+    from warc import WarcArchive, WarcWriter
+    from jsonl_export import JsonlWriter
+    from normalize import page_blocks, block_text, list_start, anchor_key, escape_markup
+    from markdown_convert import get_markdown_converter, nest_headings
+    from archive_export import ZipStreamWriter
+    from site_frameworks import (
+        StructuredSource, MarkdownAlternates, NextDataSource, MARKDOWN_ALTERNATE_FRAMEWORKS,
+        detect_framework, canonical_page_url, parse_llms_txt, markdown_title, markdown_to_text, prepare_markdown
+    )
+
+# Output format -> (file suffix, renderer method). Renderers take
+# (pages, output_path, progress_tracker=None) and return the written path.
+OUTPUT_FORMATS = {
+    'pdf': ('.pdf', 'generate_pdf'),
+    'markdown': ('.md', 'generate_markdown'),
+    'html': ('.html', 'generate_printable_html'),
+    'jsonl': ('.jsonl', 'generate_jsonl'),
+    'zip': ('.zip', 'generate_zip'),
+}
+
+# Elements whose text starts a new paragraph in extracted content
+BLOCK_TAGS = ['p', 'div', 'section', 'article', 'main', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+              'pre', 'blockquote', 'table', 'ul', 'ol', 'dl', 'figure', 'header', 'form']
+LINE_TAGS = ['li', 'tr', 'dt', 'dd', 'br']
+HEADING_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+
+# Ancestors that mark a link as site navigation or footer chrome
+NAVIGATION_CLASS_HINTS = ('sidebar', 'navigation', 'nav', 'toc', 'menu')
+FOOTER_CLASS_HINTS = ('footer',)
+
+# Marks where an <img> was in extracted text (private-use characters never found in pages)
+IMAGE_PLACEHOLDER = '\ue000img{}\ue001'
+IMAGE_PLACEHOLDER_RE = re.compile('\ue000img(\\d+)\ue001')
+
+
+class JobCancelled(Exception):
+    """Raised inside crawl and render work once the scraper has been cancelled"""
+
 
 class DocumentationScraper:
-    def __init__(self, base_url: str, progress_tracker=None):
+    def __init__(self, base_url: str, progress_tracker=None, fetch_policy: Optional[FetchPolicy] = None,
+                 extraction_profiles: Optional[ExtractionProfiles] = None,
+                 page_listeners: Optional[List[Callable[[Dict], None]]] = None,
+                 include_images: bool = PDF_IMAGES, warc_path: Optional[str] = None,
+                 replay_path: Optional[str] = None, convert_markdown: bool = True,
+                 structured_fast_path: bool = STRUCTURED_FAST_PATH):
         self.base_url = base_url.rstrip('/')
         self.domain = urlparse(base_url).netloc
+        import requests
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
         self.visited_urls = set()
-        self.pages = []
+        self.pages = PageStore()
         self.progress_tracker = progress_tracker
+        self.fetch_policy = fetch_policy or FetchPolicy()
+        self.extraction_profiles = extraction_profiles or get_extraction_profiles()
+        self.retry_queue = []  # (url, depth) pairs that failed with transient errors
+        self.failed_urls = {}  # url -> last error for pages that were given up on
+        self.bytes_downloaded = 0
+        self.page_count = 0  # Pages scraped, including ones held back for boilerplate warm-up
+        self.boilerplate = BoilerplateFilter() if BOILERPLATE_REMOVAL else None
+        self._pending_pages = []  # (page, blocks) waiting for the boilerplate filter to warm up
+        self.page_listeners = list(page_listeners or [])  # Called with each page as it is stored
+        self.include_images = include_images  # Keep <img> references for PDF output
+        self.cancelled = threading.Event()  # Also checked from executor threads (PDF build)
+        # Record every response to a WARC file, or serve fetches from one without network access
+        self.warc_writer = WarcWriter(warc_path, self.base_url) if warc_path else None
+        self.replay = WarcArchive(replay_path) if replay_path else None
+        self.request_delay = 0.0 if self.replay else REQUEST_DELAY
+        self._jsonl_streams: Dict[str, JsonlWriter] = {}  # Output path -> writer fed during the crawl
+        self._zip_streams: Dict[str, ZipStreamWriter] = {}
+        # Convert each page's content subtree to Markdown while crawling (only needed for Markdown output)
+        self.markdown_converter = get_markdown_converter() if convert_markdown else None
+        # Lighter per-page payloads (Markdown alternates, Next.js page data) once the site is recognized
+        self.structured_fast_path = structured_fast_path
+        self.structured_source: Optional[StructuredSource] = None
+        self.framework: Optional[str] = None  # '' once the first HTML page matched no known framework
+        self.structured_pages = 0
+    
+    def cancel(self):
+        """Stop crawling and rendering as soon as possible
         
-        # Clean up old temp files on initialization
-        self._cleanup_old_temp_files()
+        Asyncio work is stopped by cancelling the task awaiting it; this flag
+        additionally stops work running in threads, such as a PDF build, and
+        closing the session drops pooled connections.
+        """
+        self.cancelled.set()
+        self.session.close()
+        for writer in self._zip_streams.values():
+            writer.abort()
     
-    def _cleanup_old_temp_files(self):
-        """Clean up old temporary HTML files"""
-        try:
-            if os.path.exists(TEMP_DIR):
-                for filename in os.listdir(TEMP_DIR):
-                    if filename.startswith('temp_doc_') and filename.endswith('.html'):
-                        file_path = os.path.join(TEMP_DIR, filename)
-                        try:
-                            # Remove files older than 1 hour
-                            file_age = datetime.now().timestamp() - os.path.getmtime(file_path)
-                            if file_age > 3600:  # 1 hour in seconds
-                                os.remove(file_path)
-                                logger.info(f"Cleaned up old temp file: {filename}")
-                        except Exception as e:
-                            logger.warning(f"Could not clean up {filename}: {e}")
-        except Exception as e:
-            logger.warning(f"Error during temp file cleanup: {e}")
-
-    async def scrape_documentation(self, max_depth: int = 3, timeout_minutes: int = 10) -> List[Dict]:
+    def _check_cancelled(self, *args):
+        """Raise JobCancelled if cancel() was called (usable as a ReportLab page callback)"""
+        if self.cancelled.is_set():
+            raise JobCancelled("Job was cancelled")
+    
+    def close(self):
+        """Release scraped pages, their on-disk spill file and any WARC file"""
+        self.pages.close()
+        if self.warc_writer:
+            self.warc_writer.close()
+        if self.replay:
+            self.replay.close()
+        for writer in self._jsonl_streams.values():
+            writer.close()
+        for writer in self._zip_streams.values():
+            writer.abort()  # Never finished by generate_zip(), so not a complete archive
+    
+    async def scrape_documentation(self, max_depth: int = 3, timeout_minutes: int = 10,
+                                   max_pages: Optional[int] = MAX_PAGES,
+                                   max_bytes: Optional[int] = MAX_BYTES) -> PageStore:
         """Scrape documentation pages starting from the base URL
         
+        Pages are fetched in priority order (see CrawlFrontier), so when a
+        time, page or byte budget runs out the most valuable pages are the
+        ones already scraped.
+        
         Args:
             max_depth: Maximum link depth to follow (default: 3 levels deep)
             timeout_minutes: Maximum time to spend scraping (default: 10 minutes)
+            max_pages: Stop after this many pages (default: unlimited)
+            max_bytes: Stop after downloading this many response bytes (default: unlimited)
         """
         
         logger.info(f"Starting to scrape documentation from {self.base_url}")
@@ -84,15 +208,41 @@ class DocumentationScraper:
         timeout_seconds = timeout_minutes * 60
         
         # Start with the base URL at depth 0
-        urls_to_visit = [(self.base_url, 0)]
+        urls_to_visit = CrawlFrontier(self.base_url, await self._load_sitemap_priorities())
+        urls_to_visit.push(self.base_url, 0)
+        # An llms.txt manifest lists the site's pages in its authors' order, like a sidebar
+        for url, nav_position in await self._load_structured_manifest():
+            urls_to_visit.push(url, 1, nav_position)
         
-        while urls_to_visit:
+        retry_passes = 0
+        
+        while True:
+            self._check_cancelled()
+            
             # Check timeout
             if time.time() - start_time > timeout_seconds:
-                logger.info(f"Timeout reached after {timeout_minutes} minutes. Scraped {len(self.pages)} pages.")
+                logger.info(f"Timeout reached after {timeout_minutes} minutes. Scraped {self.page_count} pages.")
+                break
+            
+            if max_pages is not None and self.page_count >= max_pages:
+                logger.info(f"Page budget of {max_pages} reached.")
                 break
+            
+            if max_bytes is not None and self.bytes_downloaded >= max_bytes:
+                logger.info(f"Byte budget reached after downloading {self.bytes_downloaded} bytes.")
+                break
+            
+            if not urls_to_visit:
+                # Drain the retry queue once the regular frontier is exhausted
+                if not self.retry_queue or retry_passes >= RETRY_QUEUE_PASSES:
+                    break
+                retry_passes += 1
+                remaining = timeout_seconds - (time.time() - start_time)
+                for url, depth in await self._prepare_retry_pass(remaining):
+                    urls_to_visit.push(url, depth)
+                continue
                 
-            current_url, depth = urls_to_visit.pop(0)
+            current_url, depth = urls_to_visit.pop()
             
             if current_url in self.visited_urls or depth > max_depth:
                 continue
@@ -101,125 +251,517 @@ class DocumentationScraper:
             if self.progress_tracker:
                 await self.progress_tracker.send_progress(
                     3, 7, 
-                    f"📖 Extracting documentation ({len(self.pages)} pages found)",
+                    f"📖 Extracting documentation ({self.page_count} pages found)",
                     f"Processing: {current_url[:80]}..."
                 )
                 
             try:
                 page_data = await self._scrape_page(current_url)
                 if page_data:
-                    self.pages.append(page_data)
+                    links = page_data.pop('links')
+                    self._store_page(page_data)
                     
                     # Find more documentation links on this page (only if we haven't reached max depth)
                     if depth < max_depth:
-                        new_urls = self._extract_documentation_links(page_data['soup'], current_url)
-                        
                         # Add new URLs to visit with incremented depth
-                        for url in new_urls:
-                            if url not in self.visited_urls and self._is_documentation_url(url):
-                                urls_to_visit.append((url, depth + 1))
+                        for url, nav_position, in_footer in links:
+                            if url not in self.visited_urls:
+                                urls_to_visit.push(url, depth + 1, nav_position, in_footer)
                 
                 self.visited_urls.add(current_url)
+                self.failed_urls.pop(current_url, None)
                 
-                # Small delay to be respectful to the server
-                await asyncio.sleep(0.5)
+                # Small delay to be respectful to the server (none when replaying an archive)
+                await asyncio.sleep(self.request_delay)
                 
             except Exception as e:
                 logger.error(f"Error scraping {current_url}: {str(e)}")
+                self.failed_urls[current_url] = str(e)
+                if not self.fetch_policy.is_retryable(e):
+                    # Permanent failure (e.g. 404), don't fetch it again
+                    self.visited_urls.add(current_url)
+                elif retry_passes < RETRY_QUEUE_PASSES:
+                    self.retry_queue.append((current_url, depth))
                 continue
         
+        for url, _ in self.retry_queue:
+            if url not in self.visited_urls:
+                self.failed_urls.setdefault(url, "Not retried before timeout")
+        if self.failed_urls:
+            logger.warning(f"Gave up on {len(self.failed_urls)} URLs after retries")
+        
+        self.extraction_profiles.save()
+        if self.structured_pages:
+            logger.info(f"Fetched {self.structured_pages} pages as {self.structured_source.name} instead of HTML")
+        
+        self._flush_pending_pages()
+        if self.boilerplate and self.boilerplate.bytes_removed:
+            logger.info(f"Removed {self.boilerplate.blocks_removed} boilerplate blocks "
+                        f"({self.boilerplate.bytes_removed} bytes)")
+        
         logger.info(f"Scraped {len(self.pages)} pages")
         return self.pages
 
-    async def _scrape_page(self, url: str) -> Optional[Dict]:
-        """Scrape a single page and extract content"""
+    def _store_page(self, page_data: Dict):
+        """Add a scraped page to the store, removing cross-page boilerplate
         
+        Until the boilerplate filter has seen enough pages to be reliable,
+        pages are held back and cleaned together once it is ready.
+        """
+        self.page_count += 1
+        if self.boilerplate is None:
+            self._append_page(page_data)
+            return
+        
+        blocks = self.boilerplate.observe(page_data['content'])
+        self._pending_pages.append((page_data, blocks))
+        if self.boilerplate.ready:
+            self._flush_pending_pages()
+
+    def _flush_pending_pages(self):
+        for page_data, blocks in self._pending_pages:
+            if self.boilerplate is not None:
+                page_data['content'] = self.boilerplate.clean(blocks)
+                if 'markdown' in page_data:
+                    page_data['markdown'] = self.boilerplate.clean_markdown(page_data['markdown'])
+            self._append_page(page_data)
+        self._pending_pages = []
+
+    def _append_page(self, page_data: Dict):
+        """Store a finished page and hand it to the page listeners
+        
+        The page's text is normalized into blocks here, once, so every
+        output format renders from the same structure.
+        """
+        page_blocks(page_data)
+        self.pages.append(page_data)
+        for listener in self.page_listeners:
+            try:
+                listener(page_data)
+            except Exception as e:
+                logger.warning(f"Page listener failed for {page_data['url']}: {str(e)[:100]}")
+
+    async def _load_sitemap_priorities(self) -> Dict[str, float]:
+        """Fetch the site's sitemap.xml (best effort) for frontier priorities"""
+        
+        parsed = urlparse(self.base_url)
+        sitemap_url = f"{parsed.scheme}://{parsed.netloc}/sitemap.xml"
         try:
-            logger.info(f"Scraping: {url}")
-            response = self.session.get(url, timeout=10)
+            response = await self._fetch(sitemap_url)
+            priorities = parse_sitemap(response.text)
+            logger.info(f"Loaded {len(priorities)} sitemap entries from {sitemap_url}")
+            return priorities
+        except Exception as e:
+            logger.info(f"No usable sitemap at {sitemap_url}: {str(e)[:100]}")
+            return {}
+
+    async def _prepare_retry_pass(self, remaining_seconds: float) -> List:
+        """Move failed URLs back into the frontier for a final retry pass
+        
+        Waits (within the remaining crawl time) for tripped circuits to cool
+        down, so the retry pass does not immediately hit open breakers again.
+        URLs of hosts that stay paused past the end of the crawl are not
+        retried at all.
+        """
+        pending = {}
+        for url, depth in self.retry_queue:
+            if url not in self.visited_urls:
+                pending[url] = min(depth, pending.get(url, depth))
+        self.retry_queue = []
+        
+        queued, wait = [], 0.0
+        for url, depth in pending.items():
+            cooldown = self.fetch_policy.seconds_until_closed(urlparse(url).netloc)
+            if cooldown >= remaining_seconds:
+                self.failed_urls[url] = "Not retried before timeout"
+                continue
+            queued.append((url, depth))
+            wait = max(wait, cooldown)
+        if len(queued) < len(pending):
+            logger.info(f"Skipping {len(pending) - len(queued)} URLs whose hosts stay paused until the timeout")
+        
+        if queued and wait > 0:
+            logger.info(f"Waiting {wait:.1f}s for circuit breakers before retrying {len(queued)} URLs")
+            await asyncio.sleep(wait)
+        
+        for url, _ in queued:
+            self.failed_urls.pop(url, None)
+        if queued:
+            logger.info(f"Retrying {len(queued)} failed URLs")
+        return queued
+
+    async def _fetch(self, url: str) -> 'requests.Response':
+        """Fetch a URL, retrying transient errors with jittered exponential backoff
+        
+        Raises CircuitOpenError without touching the network when the host's
+        circuit breaker is open, and re-raises the last error once retries
+        are exhausted or the error is not transient. In replay mode the
+        response comes from the WARC archive instead (ArchiveMiss if absent).
+        """
+        import time
+        if self.replay:
+            response = self.replay.get(url)
             response.raise_for_status()
+            self.bytes_downloaded += len(response.content)
+            return response
+        
+        host = urlparse(url).netloc
+        attempt = 0
+        
+        while True:
+            self.fetch_policy.check(host)
+            started = time.monotonic()
+            try:
+                # Blocking request runs in a worker thread so concurrent crawls don't serialize
+                response = await asyncio.get_event_loop().run_in_executor(
+                    None, functools.partial(self._get, url, timeout=self.fetch_policy.timeout_for(host))
+                )
+                response.raise_for_status()
+            except Exception as e:
+                if not self.fetch_policy.is_retryable(e):
+                    raise
+                self.fetch_policy.record_failure(host)
+                if attempt >= self.fetch_policy.max_retries:
+                    raise
+                delay = self.fetch_policy.backoff_delay(attempt)
+                attempt += 1
+                logger.warning(f"Transient error for {url} ({str(e)[:100]}), retry {attempt} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
             
+            self.fetch_policy.record_success(host, time.monotonic() - started)
+            self.bytes_downloaded += len(response.content)
+            return response
+
+    def _get(self, url: str, timeout: float) -> 'requests.Response':
+        """Blocking GET (run in a worker thread), recorded to the WARC file if enabled"""
+        response = self.session.get(url, timeout=timeout)
+        if self.warc_writer:
+            self.warc_writer.write_response(response)
+        return response
+
+    async def _scrape_page(self, url: str) -> Optional[Dict]:
+        """Scrape a single page and extract content
+        
+        Fetch errors are raised to the caller so transient failures can be
+        queued for retry; extraction errors are logged and yield None.
+        """
+        
+        logger.info(f"Scraping: {url}")
+        source = self.structured_source
+        if source is not None and source.active:
+            page = await self._scrape_structured(source, url)
+            if page:
+                return page
+        
+        response = await self._fetch(url)
+        
+        try:
+            from bs4 import BeautifulSoup
             soup = BeautifulSoup(response.text, 'html.parser')
+            if self.structured_fast_path and self.framework is None:
+                self._detect_framework(soup, url)
+            
+            # Collect links before content extraction strips nav and footer elements
+            links = self._extract_documentation_links(soup, url)
             
             # Extract title
             title = self._extract_title(soup, url)
             
-            # Extract main content
-            content = self._extract_main_content(soup)
+            # Replace images with placeholders so their position in the text is known
+            images = self._mark_images(soup, url) if self.include_images else []
             
-            if not content.strip():
-                logger.warning(f"No content extracted from {url}")
-                return None
+            content_element = self._main_content_element(soup)
+            return await self._page_from_element(url, title, content_element, links, images)
             
-            return {
-                'url': url,
-                'title': title,
-                'content': content,
-                'soup': soup
-            }
+        except Exception as e:
+            logger.error(f"Failed to extract content from {url}: {str(e)}")
+            return None
+
+    async def _page_from_element(self, url: str, title: str, content_element, links: List,
+                                 images: List[Dict]) -> Optional[Dict]:
+        """Build a page from its main content element (an HTML page or an HTML payload)"""
+        
+        # Extract main content, noting its headings for section-aware outputs
+        headings = self._extract_headings(content_element)
+        markdown_html = self._markdown_source(content_element, url) if self.markdown_converter else None
+        content = self._text_with_block_breaks(content_element)
+        marked_images = images
+        if images:
+            content, images = self._place_images(content, images)
+        
+        if not content.strip():
+            logger.warning(f"No content extracted from {url}")
+            return None
+        
+        page = {
+            'url': url,
+            'title': title,
+            'content': content,
+            'links': links
+        }
+        if markdown_html is not None:
+            markdown = await self._convert_markdown(markdown_html, marked_images)
+            if markdown:
+                page['markdown'] = markdown
+        if headings:
+            page['headings'] = headings
+        if images:
+            page['images'] = images
+        return page
+
+    async def _load_structured_manifest(self) -> List[Tuple[str, float]]:
+        """Fetch the site's llms.txt (best effort), returning its pages as (url, nav_position)
+        
+        Pages the manifest links as Markdown are then fetched in that form.
+        """
+        if not self.structured_fast_path:
+            return []
+        
+        parsed = urlparse(self.base_url)
+        candidates = [f"{self.base_url}/llms.txt"]
+        if parsed.path.strip('/'):
+            candidates.append(f"{parsed.scheme}://{parsed.netloc}/llms.txt")
+        
+        for manifest_url in candidates:
+            try:
+                response = await self._fetch(manifest_url)
+                entries = parse_llms_txt(response.text, manifest_url)
+            except Exception as e:
+                logger.info(f"No usable llms.txt at {manifest_url}: {str(e)[:100]}")
+                continue
+            
+            alternates, titles = {}, {}
+            for link, title in entries:
+                page_url = canonical_page_url(link)
+                if not self._is_documentation_url(page_url):
+                    continue
+                titles.setdefault(page_url, title)
+                if page_url != link:
+                    alternates.setdefault(page_url, link)
+            if not titles:
+                continue
             
+            logger.info(f"Loaded {len(titles)} pages from {manifest_url} ({len(alternates)} as Markdown)")
+            if alternates:
+                self.structured_source = MarkdownAlternates('llms.txt', alternates, titles)
+            return [(url, index / len(titles)) for index, url in enumerate(titles)]
+        return []
+
+    def _detect_framework(self, soup: 'BeautifulSoup', url: str):
+        """Recognize the site's framework from its first HTML page and pick a fast path for it"""
+        self.framework = detect_framework(soup) or ''
+        if not self.framework:
+            return
+        
+        source = self.structured_source
+        if self.framework in MARKDOWN_ALTERNATE_FRAMEWORKS:
+            if isinstance(source, MarkdownAlternates):
+                source.guess = True
+            else:
+                self.structured_source = MarkdownAlternates(self.framework, guess=True)
+        elif source is None and self.framework in ('nextjs', 'nextra'):
+            self.structured_source = NextDataSource.from_soup(soup, url)
+        
+        fast_path = self.structured_source.name if self.structured_source else 'none'
+        logger.info(f"Detected {self.framework} site (fast path: {fast_path})")
+
+    async def _scrape_structured(self, source: StructuredSource, url: str) -> Optional[Dict]:
+        """Scrape a page from the site's structured payload; None to fetch its HTML instead"""
+        payload_url = source.payload_url(url)
+        if payload_url is None:
+            return None
+        
+        try:
+            response = await self._fetch(payload_url)
+            payload = source.parse(url, response.text)
+            page = await self._page_from_payload(url, payload) if payload else None
+        except CircuitOpenError:
+            raise
         except Exception as e:
-            logger.error(f"Failed to scrape {url}: {str(e)}")
+            logger.info(f"No {source.name} for {url}: {str(e)[:100]}")
+            page = None
+        
+        source.record(url, page is not None)
+        if page:
+            self.structured_pages += 1
+        return page
+
+    async def _page_from_payload(self, url: str, payload: Dict) -> Optional[Dict]:
+        """Build a page from a Markdown or HTML-fragment payload"""
+        
+        if 'html' in payload:
+            from bs4 import BeautifulSoup
+            soup = BeautifulSoup(payload['html'], 'html.parser')
+            links = self._extract_documentation_links(soup, url)
+            images = self._mark_images(soup, url) if self.include_images else []
+            heading = soup.find('h1')
+            title = payload.get('title') or (heading.get_text().strip() if heading else '')
+            return await self._page_from_element(url, title or self._fallback_title(url), soup, links, images)
+        
+        markdown = payload['markdown']
+        placeholder = IMAGE_PLACEHOLDER if self.include_images else None
+        content, headings, images, link_targets = markdown_to_text(markdown, url, placeholder)
+        if images:
+            content, images = self._place_images(content, images)
+        if not content.strip():
+            logger.warning(f"No content extracted from {url}")
             return None
+        
+        links = []
+        for link in dict.fromkeys(canonical_page_url(target) for target in link_targets):
+            if self._is_documentation_url(link):
+                links.append((link, None, False))
+        
+        page = {
+            'url': url,
+            'title': payload.get('title') or markdown_title(markdown) or self._fallback_title(url),
+            'content': content,
+            'links': links
+        }
+        if self.markdown_converter:
+            page['markdown'] = nest_headings(prepare_markdown(markdown, url, keep_images=self.include_images))
+        if headings:
+            page['headings'] = headings
+        if images:
+            page['images'] = images
+        return page
 
-    def _extract_title(self, soup: BeautifulSoup, url: str) -> str:
+    def _extract_title(self, soup: 'BeautifulSoup', url: str) -> str:
         """Extract page title"""
         
-        # Try different title selectors
-        title_selectors = [
-            'h1',
-            'title',
-            '.page-title',
-            '.doc-title',
-            '.content-title'
-        ]
-        
-        for selector in title_selectors:
+        # Try the domain's pinned/learned selectors first, then the defaults
+        for selector in self.extraction_profiles.selectors(self.domain, 'title'):
             element = soup.select_one(selector)
             if element:
                 title = element.get_text().strip()
                 if title:
+                    self.extraction_profiles.record(self.domain, 'title', selector)
                     return title
         
-        # Fallback to URL-based title
+        return self._fallback_title(url)
+
+    def _fallback_title(self, url: str) -> str:
+        """URL-based title for pages without one"""
         return urlparse(url).path.split('/')[-1] or 'Documentation Page'
 
-    def _extract_main_content(self, soup: BeautifulSoup) -> str:
-        """Extract main content from the page"""
+    def _main_content_element(self, soup: 'BeautifulSoup'):
+        """Find the element holding the page's main content"""
         
         # Remove unwanted elements
         for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', '.sidebar', '.navigation']):
             element.decompose()
         
-        # Try to find main content area
-        content_selectors = [
-            'main',
-            '.content',
-            '.main-content',
-            '.doc-content',
-            '.documentation',
-            '.article',
-            'article',
-            '.page-content',
-            '.markdown-body'
-        ]
-        
-        for selector in content_selectors:
+        # Try to find main content area, starting with the domain's pinned/learned selectors
+        for selector in self.extraction_profiles.selectors(self.domain, 'content'):
             content_element = soup.select_one(selector)
             if content_element:
-                return content_element.get_text().strip()
+                self.extraction_profiles.record(self.domain, 'content', selector)
+                return content_element
         
         # Fallback: get body content
-        body = soup.find('body')
-        if body:
-            return body.get_text().strip()
+        return soup.find('body') or soup
+
+    def _extract_headings(self, element) -> List[List]:
+        """[level, text] of the headings in an element, in document order"""
+        headings = []
+        for heading in element.find_all(HEADING_TAGS):
+            text = ' '.join(heading.get_text().split())
+            if text:
+                headings.append([int(heading.name[1]), text])
+        return headings
+
+    def _markdown_source(self, element, url: str) -> str:
+        """HTML of the content element for Markdown conversion, with absolute link targets"""
+        for link in element.find_all('a', href=True):
+            link['href'] = urljoin(url, link['href'])
+        return str(element)
+
+    async def _convert_markdown(self, html: str, images: List[Dict]) -> Optional[str]:
+        """Markdown for a content subtree, with image placeholders turned into image links
+        
+        Returns None if conversion fails; the page is then rendered from its text.
+        """
+        try:
+            markdown = await self.markdown_converter.convert(html)
+        except Exception as e:
+            logger.warning(f"Markdown conversion failed, using plain text: {str(e)}")
+            return None
         
-        return soup.get_text().strip()
+        def image_link(match):
+            image = images[int(match.group(1))]
+            return f"![{image['alt']}]({image['src']})"
+        return IMAGE_PLACEHOLDER_RE.sub(image_link, markdown)
 
-    def _extract_documentation_links(self, soup: BeautifulSoup, current_url: str) -> List[str]:
-        """Extract links that likely point to documentation pages"""
+    def _text_with_block_breaks(self, element) -> str:
+        """Get an element's text with blank lines between block-level elements
         
-        links = []
+        Minified HTML has no whitespace between tags, so plain get_text()
+        runs paragraphs, menus and footers together; explicit breaks keep
+        them as separate blocks for the renderers and boilerplate removal.
+        List items get a bullet or number so lists survive as lists.
+        """
+        for list_element in element.find_all(['ul', 'ol']):
+            try:
+                start = int(list_element.get('start', 1))
+            except ValueError:
+                start = 1
+            for number, item in enumerate(list_element.find_all('li', recursive=False), start):
+                item.insert(0, f"{number}. " if list_element.name == 'ol' else '• ')
+        for block in element.find_all(BLOCK_TAGS):
+            block.insert_before('\n\n')
+            block.append('\n\n')
+        for line in element.find_all(LINE_TAGS):
+            line.append('\n')
+        
+        text = element.get_text()
+        text = re.sub(r'[ \t]+\n', '\n', text)  # Trailing whitespace only, keep code indentation
+        text = re.sub(r'\n{3,}', '\n\n', text)
+        return text.strip()
+
+    def _mark_images(self, soup: 'BeautifulSoup', url: str) -> List[Dict]:
+        """Replace <img> tags with text placeholders, returning the images in order"""
+        images = []
+        for img in soup.find_all('img'):
+            src = img.get('src') or img.get('data-src')
+            if not isinstance(src, str) or src.startswith('data:'):
+                continue
+            images.append({'src': urljoin(url, src), 'alt': (img.get('alt') or '').strip()})
+            img.replace_with(IMAGE_PLACEHOLDER.format(len(images) - 1))
+        return images
+
+    def _place_images(self, content: str, images: List[Dict]) -> Tuple[str, List[Dict]]:
+        """Remove image placeholders from extracted text
+        
+        Images whose placeholder survived extraction (i.e. were inside the
+        main content) are kept, each with an ``anchor``: the text line it
+        followed, used to put it back in place when rendering.
+        """
+        kept = []
+        for match in IMAGE_PLACEHOLDER_RE.finditer(content):
+            if len(kept) >= IMAGE_MAX_PER_PAGE:
+                break
+            preceding = IMAGE_PLACEHOLDER_RE.sub('', content[:match.start()]).rstrip()
+            image = dict(images[int(match.group(1))])
+            image['anchor'] = preceding.rsplit('\n', 1)[-1].strip()
+            kept.append(image)
+        
+        content = IMAGE_PLACEHOLDER_RE.sub('', content)
+        content = re.sub(r'[ \t]+\n', '\n', content)
+        content = re.sub(r'\n{3,}', '\n\n', content)
+        return content.strip(), kept
+
+    def _extract_documentation_links(self, soup: 'BeautifulSoup', current_url: str) -> List[Tuple[str, Optional[float], bool]]:
+        """Extract links that likely point to documentation pages
+        
+        Returns (url, nav_position, in_footer) tuples in document order, where
+        nav_position is the link's relative position (0.0 = first) within the
+        page navigation/sidebar or None, and in_footer is True when the link
+        only appears inside a footer.
+        """
+        
+        links = {}  # url -> [nav_index, in_footer], insertion-ordered
+        nav_count = 0
         
         for link in soup.find_all('a', href=True):
             href = link['href']
@@ -232,10 +774,42 @@ class DocumentationScraper:
             full_url = urljoin(current_url, href)
             
             # Filter links
-            if self._is_documentation_url(full_url):
-                links.append(full_url)
+            if not self._is_documentation_url(full_url):
+                continue
+            
+            region = self._link_region(link)
+            entry = links.setdefault(full_url, [None, True])
+            if region == 'navigation':
+                if entry[0] is None:
+                    entry[0] = nav_count
+                nav_count += 1
+            if region != 'footer':
+                entry[1] = False
         
-        return list(set(links))  # Remove duplicates
+        return [
+            (url, None if nav_index is None else nav_index / max(nav_count, 1), in_footer)
+            for url, (nav_index, in_footer) in links.items()
+        ]
+
+    def _link_region(self, link) -> Optional[str]:
+        """Classify a link as 'navigation', 'footer' or None (body content)"""
+        
+        for parent in link.parents:
+            name = parent.name
+            if name in ('main', 'article', 'body', 'html'):
+                # Reached the content area or the page root
+                return None
+            if name == 'footer':
+                return 'footer'
+            if name in ('nav', 'aside') or parent.get('role') == 'navigation':
+                return 'navigation'
+            classes = ' '.join(parent.get('class') or []).lower()
+            if classes:
+                if any(hint in classes for hint in FOOTER_CLASS_HINTS):
+                    return 'footer'
+                if any(hint in classes for hint in NAVIGATION_CLASS_HINTS):
+                    return 'navigation'
+        return None
 
     def _is_documentation_url(self, url: str) -> bool:
         """Check if URL is likely a documentation page"""
@@ -277,8 +851,13 @@ class DocumentationScraper:
         os.makedirs(TEMP_DIR, exist_ok=True)
         
         try:
-            if REPORTLAB_AVAILABLE:
+            if reportlab_available():
                 try:
+                    from reportlab.lib.pagesizes import A4
+                    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Image
+                    from reportlab.lib.styles import getSampleStyleSheet
+                    from reportlab.lib.units import inch
+                    
                     # Create PDF document directly with ReportLab
                     doc = SimpleDocTemplate(output_path, pagesize=A4)
                     story = []
@@ -288,6 +867,7 @@ class DocumentationScraper:
                     title_style = styles['Title']
                     heading_style = styles['Heading1']
                     normal_style = styles['Normal']
+                    bullet_style = styles['Bullet']
                     
                     # Add title page
                     story.append(Paragraph("📚 Documentation", title_style))
@@ -296,6 +876,11 @@ class DocumentationScraper:
                     story.append(Paragraph(f"Total Pages: {len(pages)}", normal_style))
                     story.append(PageBreak())
                     
+                    # Download and downscale the pages' images up front, concurrently
+                    resolved_images = await self._resolve_pdf_images(pages)
+                    image_bytes = 0
+                    embedded_images = set()
+                    
                     # Add content
                     for i, page in enumerate(pages):
                         if progress_tracker and i % 5 == 0:  # Update progress every 5 pages
@@ -311,27 +896,48 @@ class DocumentationScraper:
                         story.append(Paragraph(f"<i>Source: {page['url']}</i>", normal_style))
                         story.append(Spacer(1, 0.2*inch))
                         
-                        # Add content (clean and format)
-                        content = self._clean_text_for_pdf(page['content'])
-                        
-                        # Split content into paragraphs
-                        paragraphs = content.split('\n\n')
-                        for para in paragraphs:
-                            if para.strip():
-                                try:
-                                    story.append(Paragraph(para.strip(), normal_style))
-                                    story.append(Spacer(1, 0.1*inch))
-                                except Exception as e:
-                                    # If paragraph fails, add as plain text
-                                    logger.warning(f"Failed to add paragraph: {str(e)[:100]}")
+                        # Images go after the paragraph containing their anchor text, within the byte budget
+                        page_images = []
+                        for image in page.get('images', ()):
+                            cached = resolved_images.get(image['src'])
+                            if cached is None:
+                                continue
+                            if cached.path not in embedded_images:
+                                if image_bytes + cached.size > IMAGE_BUDGET_BYTES:
                                     continue
+                                image_bytes += cached.size
+                                embedded_images.add(cached.path)
+                            page_images.append((anchor_key(image['anchor']), self._pdf_image(Image, cached, doc)))
+                        
+                        while page_images and not page_images[0][0]:
+                            story.append(page_images.pop(0)[1])
+                        
+                        # Add the page's normalized blocks
+                        for block in page_blocks(page):
+                            try:
+                                story.extend(self._pdf_flowables(block, Paragraph, styles, normal_style, bullet_style))
+                                story.append(Spacer(1, 0.1*inch))
+                            except Exception as e:
+                                # If paragraph fails, add as plain text
+                                logger.warning(f"Failed to add paragraph: {str(e)[:100]}")
+                            text = block_text(block)
+                            while page_images and page_images[0][0] in text:
+                                story.append(page_images.pop(0)[1])
+                                story.append(Spacer(1, 0.1*inch))
+                        
+                        # Images whose anchor text was removed (e.g. as boilerplate) end the page
+                        for _, flowable in page_images:
+                            story.append(flowable)
                         
                         # Add page break between pages
                         if i < len(pages) - 1:
                             story.append(PageBreak())
                     
-                    # Build PDF
-                    doc.build(story)
+                    # Build PDF off the event loop so other renderers can run meanwhile
+                    # Page callbacks abort the build promptly if the job is cancelled
+                    await asyncio.get_event_loop().run_in_executor(None, functools.partial(
+                        doc.build, story, onFirstPage=self._check_cancelled, onLaterPages=self._check_cancelled
+                    ))
                     logger.info(f"PDF saved to {output_path}")
                     
                     if progress_tracker:
@@ -339,21 +945,19 @@ class DocumentationScraper:
                     
                     return output_path
                     
+                except JobCancelled:
+                    raise
                 except Exception as e:
                     logger.error(f"Error generating PDF with ReportLab: {str(e)}")
                     # Create temporary HTML file for fallback
-                    html_content = self._create_printable_html_document(pages)
-                    async with aiofiles.open(temp_html_path, 'w', encoding='utf-8') as f:
-                        await f.write(html_content)
+                    await self._write_chunks(temp_html_path, self._iter_printable_html_document(pages))
                     logger.info(f"Created temporary HTML file: {temp_html_path}")
                     # Note: We'll keep the temp HTML file as fallback
                     pass
             
             # Fallback: Save as HTML file with PDF-like formatting
-            html_content = self._create_printable_html_document(pages)
             html_output_path = output_path.replace('.pdf', '_printable.html')
-            async with aiofiles.open(html_output_path, 'w', encoding='utf-8') as f:
-                await f.write(html_content)
+            await self._write_chunks(html_output_path, self._iter_printable_html_document(pages))
             
             logger.info(f"Printable HTML file saved to {html_output_path}")
             logger.info("To convert to PDF: Open the HTML file in your browser and print to PDF (Cmd/Ctrl + P)")
@@ -373,34 +977,170 @@ class DocumentationScraper:
                 except Exception as e:
                     logger.warning(f"Could not remove temporary HTML file: {e}")
 
-    def _clean_text_for_pdf(self, text: str) -> str:
-        """Clean text for PDF generation"""
-        
-        # Remove excessive whitespace
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        text = re.sub(r' {2,}', ' ', text)
-        
-        # Escape XML characters for ReportLab
-        text = text.replace('&', '&amp;')
-        text = text.replace('<', '&lt;')
-        text = text.replace('>', '&gt;')
+    async def _resolve_pdf_images(self, pages: List[Dict]) -> Dict[str, CachedImage]:
+        """Fetch (or take from the image cache) every image referenced by the pages"""
+        urls = [image['src'] for page in pages for image in page.get('images', ())]
+        if not urls:
+            return {}
+        if not pillow_available():
+            logger.warning("Pillow not available, images are left out of the PDF")
+            return {}
         
-        # Ensure proper line endings
-        text = text.strip()
+        async def fetch(url: str) -> bytes:
+            return (await self._fetch(url)).content
         
-        return text
+        image_cache = ImageCache()
+        try:
+            resolved = await image_cache.fetch_all(urls, fetch)
+        finally:
+            image_cache.close()
+        logger.info(f"Prepared {len(resolved)} of {len(set(urls))} images for the PDF")
+        return resolved
+
+    def _pdf_image(self, image_class, image: CachedImage, doc):
+        """Flowable for a cached image, scaled so IMAGE_MAX_WIDTH_PX fills the text width"""
+        width = doc.width * min(1.0, image.width / IMAGE_MAX_WIDTH_PX)
+        height = width * image.height / image.width
+        if height > doc.height * 0.9:
+            width, height = width * doc.height * 0.9 / height, doc.height * 0.9
+        return image_class(image.path, width=width, height=height)
+
+    def _pdf_flowables(self, block: List, paragraph_class, styles, normal_style, bullet_style) -> List:
+        """ReportLab paragraphs for one normalized block"""
+        kind = block[0]
+        if kind == 'h':
+            return [paragraph_class(escape_markup(block[2]), styles[f"Heading{min(block[1] + 1, 6)}"])]
+        if kind == 'p':
+            return [paragraph_class(escape_markup(block[1]).replace('\n', '<br/>'), normal_style)]
+        return [paragraph_class(escape_markup(item), bullet_style,
+                                bulletText=f"{number}." if kind == 'ol' else '•')
+                for number, item in enumerate(block[1], list_start(block) if kind == 'ol' else 1)]
 
-    async def generate_markdown(self, pages: List[Dict], output_path: str):
+    async def generate_markdown(self, pages: List[Dict], output_path: str, progress_tracker=None):
         """Generate Markdown file from scraped pages"""
         
         logger.info(f"Generating Markdown with {len(pages)} pages")
         
-        markdown_content = self._create_markdown_document(pages)
-        
-        async with aiofiles.open(output_path, 'w', encoding='utf-8') as f:
-            await f.write(markdown_content)
+        # Stream page by page so spilled pages never need to be in memory together
+        await self._write_chunks(output_path, self._iter_markdown_document(pages))
         
         logger.info(f"Markdown saved to {output_path}")
+        return output_path
+
+    async def generate_printable_html(self, pages: List[Dict], output_path: str, progress_tracker=None):
+        """Generate a printable HTML file from scraped pages"""
+        
+        logger.info(f"Generating printable HTML with {len(pages)} pages")
+        
+        await self._write_chunks(output_path, self._iter_printable_html_document(pages))
+        
+        logger.info(f"Printable HTML saved to {output_path}")
+        return output_path
+
+    def stream_jsonl(self, output_path: str) -> str:
+        """Write the JSONL export while crawling, page by page as pages are stored
+        
+        Call before scrape_documentation(); generate_jsonl() for the same
+        path then only finishes the file instead of writing it again.
+        """
+        writer = JsonlWriter(output_path)
+        self._jsonl_streams[output_path] = writer
+        self.page_listeners.append(writer.add_page)
+        return output_path
+
+    async def generate_jsonl(self, pages: List[Dict], output_path: str, progress_tracker=None):
+        """Generate a JSONL file with one section-sized chunk of a page per line"""
+        
+        writer = self._jsonl_streams.pop(output_path, None)
+        if writer is None:
+            writer = JsonlWriter(output_path)
+            for page in pages:
+                writer.add_page(page)
+                await asyncio.sleep(0)  # Chunking is CPU work, let other renderers run
+        else:
+            self.page_listeners.remove(writer.add_page)
+        writer.close()
+        
+        logger.info(f"JSONL with {writer.chunks} chunks saved to {output_path}")
+        return output_path
+
+    def stream_zip(self, output_path: str) -> ZipStreamWriter:
+        """Build the zip archive while crawling, compressing pages as they are stored
+        
+        Call before scrape_documentation(); generate_zip() for the same path
+        then only finishes the archive. The returned writer can be followed
+        to stream the archive while it grows.
+        """
+        writer = ZipStreamWriter(output_path, self._page_markdown)
+        self._zip_streams[output_path] = writer
+        self.page_listeners.append(writer.add_page)
+        return writer
+
+    async def generate_zip(self, pages: List[Dict], output_path: str, progress_tracker=None):
+        """Generate a zip archive with one Markdown file per page, laid out like the site's URLs"""
+        
+        writer = self._zip_streams.get(output_path)
+        if writer is None:
+            writer = self._zip_streams[output_path] = ZipStreamWriter(output_path, self._page_markdown)
+            for page in pages:
+                writer.add_page(page)
+                await asyncio.sleep(0)
+        else:
+            self.page_listeners.remove(writer.add_page)
+        # Waits for the remaining pages to be compressed and writes the central directory
+        await asyncio.get_event_loop().run_in_executor(None, writer.close)
+        self._zip_streams.pop(output_path, None)
+        
+        return output_path
+
+    async def generate_outputs(self, pages: List[Dict], output_formats: List[str], base_path: str,
+                               progress_tracker=None,
+                               on_result: Optional[Callable[[str, object], Awaitable]] = None) -> Dict[str, object]:
+        """Render one crawl to several output formats concurrently
+        
+        All renderers read the same scraped pages, so nothing is re-crawled
+        or re-extracted per format.
+        
+        Args:
+            pages: Scraped pages (list or PageStore)
+            output_formats: Keys of OUTPUT_FORMATS, duplicates are ignored
+            base_path: Output path without extension; each format adds its suffix
+            progress_tracker: Optional tracker passed to every renderer
+            on_result: Optional coroutine function awaited with (format, result)
+                as soon as each renderer finishes, so a fast format can be
+                delivered while slower ones are still rendering
+        
+        Returns:
+            Mapping of format to the written file path, or to the exception
+            its renderer raised so one failing format doesn't lose the others.
+        """
+        formats = list(dict.fromkeys(output_formats))
+        unknown = [fmt for fmt in formats if fmt not in OUTPUT_FORMATS]
+        if unknown:
+            raise ValueError(f"Unknown output format(s): {', '.join(unknown)}")
+        
+        async def render(fmt: str):
+            suffix, method = OUTPUT_FORMATS[fmt]
+            renderer = getattr(self, method)
+            try:
+                result = await renderer(pages, base_path + suffix, progress_tracker=progress_tracker)
+            except Exception as e:
+                logger.error(f"Failed to generate {fmt}: {str(e)}")
+                result = e
+            if on_result:
+                await on_result(fmt, result)
+            return result
+        
+        results = await asyncio.gather(*(render(fmt) for fmt in formats))
+        return dict(zip(formats, results))
+
+    async def _write_chunks(self, output_path: str, chunks: Iterable[str]):
+        """Write an iterable of text chunks to a file without joining them first"""
+        
+        import aiofiles
+        async with aiofiles.open(output_path, 'w', encoding='utf-8') as f:
+            for chunk in chunks:
+                await f.write(chunk)
 
     def _create_html_document(self, pages: List[Dict]) -> str:
         """Create a complete HTML document from pages"""
@@ -429,8 +1169,7 @@ class DocumentationScraper:
             
             html_parts.append(f'<h1 class="page-title">{page["title"]}</h1>')
             
-            # Convert content to HTML (basic formatting)
-            content_html = self._text_to_html(page['content'])
+            content_html = self._blocks_to_html(page_blocks(page))
             html_parts.append(content_html)
         
         html_parts.extend(['</body>', '</html>'])
@@ -440,6 +1179,11 @@ class DocumentationScraper:
     def _create_printable_html_document(self, pages: List[Dict]) -> str:
         """Create a complete HTML document optimized for printing/PDF conversion"""
         
+        return ''.join(self._iter_printable_html_document(pages))
+
+    def _iter_printable_html_document(self, pages: List[Dict]) -> Iterator[str]:
+        """Yield the printable HTML document in chunks, one per page"""
+        
         html_parts = [
             '<!DOCTYPE html>',
             '<html>',
@@ -507,23 +1251,29 @@ class DocumentationScraper:
         
         # Add content pages
         for i, page in enumerate(pages, 1):
+            yield '\n'.join(html_parts) + '\n'
+            html_parts = []
             html_parts.append('<div class="page-break"></div>')
             html_parts.append(f'<div id="page-{i}">')
             html_parts.append(f'<h1 class="page-title">{page["title"]}</h1>')
             html_parts.append(f'<div class="page-url">Source: {page["url"]}</div>')
             
-            # Convert content to HTML with better formatting
-            content_html = self._text_to_formatted_html(page['content'])
+            content_html = self._blocks_to_html(page_blocks(page))
             html_parts.append(content_html)
             html_parts.append('</div>')
         
         html_parts.extend(['</body>', '</html>'])
         
-        return '\n'.join(html_parts)
+        yield '\n'.join(html_parts)
 
     def _create_markdown_document(self, pages: List[Dict]) -> str:
         """Create a markdown document from pages"""
         
+        return ''.join(self._iter_markdown_document(pages))
+
+    def _iter_markdown_document(self, pages: List[Dict]) -> Iterator[str]:
+        """Yield the markdown document in chunks, one per page"""
+        
         markdown_parts = [
             '# Documentation',
             '',
@@ -534,76 +1284,54 @@ class DocumentationScraper:
         ]
         
         for page in pages:
+            yield '\n'.join(markdown_parts) + '\n'
+            markdown_parts = []
             markdown_parts.append(f'## {page["title"]}')
             markdown_parts.append('')
             markdown_parts.append(f'**Source:** {page["url"]}')
             markdown_parts.append('')
             
-            # Clean and format content
-            content = self._clean_text_for_markdown(page['content'])
-            markdown_parts.append(content)
+            # Converted at extraction time; pages without it fall back to the plain-text blocks
+            markdown_parts.append(page.get('markdown') or self._blocks_to_markdown(page_blocks(page)))
             markdown_parts.append('')
             markdown_parts.append('---')
             markdown_parts.append('')
         
-        return '\n'.join(markdown_parts)
-
-    def _text_to_html(self, text: str) -> str:
-        """Convert plain text to basic HTML with formatting"""
-        
-        # Escape HTML characters
-        text = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-        
-        # Convert newlines to paragraphs
-        paragraphs = text.split('\n\n')
-        html_paragraphs = [f'<p>{p.replace(chr(10), "<br>")}</p>' for p in paragraphs if p.strip()]
-        
-        return '\n'.join(html_paragraphs)
+        yield '\n'.join(markdown_parts)
 
-    def _text_to_formatted_html(self, text: str) -> str:
-        """Convert plain text to formatted HTML with better structure"""
-        
-        # Escape HTML characters
-        text = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    def _blocks_to_html(self, blocks: List[List]) -> str:
+        """Render normalized blocks as HTML; page titles are <h1>, so headings start at <h2>"""
         
-        # Split into paragraphs
-        paragraphs = text.split('\n\n')
         html_parts = []
-        
-        for paragraph in paragraphs:
-            if not paragraph.strip():
-                continue
-                
-            # Check if it looks like a heading (short line, possibly all caps)
-            if len(paragraph) < 100 and (paragraph.isupper() or paragraph.count(' ') < 3):
-                if len(paragraph) < 50:
-                    html_parts.append(f'<h3>{paragraph.strip()}</h3>')
-                else:
-                    html_parts.append(f'<h4>{paragraph.strip()}</h4>')
-            # Check if it looks like a list item
-            elif paragraph.strip().startswith(('•', '-', '*', '1.', '2.', '3.')):
-                items = paragraph.split('\n')
-                html_parts.append('<ul>')
-                for item in items:
-                    if item.strip():
-                        html_parts.append(f'<li>{item.strip()}</li>')
-                html_parts.append('</ul>')
-            # Regular paragraph
+        for block in blocks:
+            kind = block[0]
+            if kind == 'h':
+                level = min(block[1] + 1, 6)
+                html_parts.append(f'<h{level}>{escape_markup(block[2])}</h{level}>')
+            elif kind == 'p':
+                html_parts.append(f'<p>{escape_markup(block[1]).replace(chr(10), "<br>")}</p>')
             else:
-                # Handle line breaks within paragraph
-                formatted_para = paragraph.replace('\n', '<br>')
-                html_parts.append(f'<p>{formatted_para}</p>')
+                start = list_start(block) if kind == 'ol' else 1
+                html_parts.append(f'<ol start="{start}">' if start != 1 else f'<{kind}>')
+                html_parts.extend(f'<li>{escape_markup(item)}</li>' for item in block[1])
+                html_parts.append(f'</{kind}>')
         
         return '\n'.join(html_parts)
 
-    def _clean_text_for_markdown(self, text: str) -> str:
-        """Clean and format text for markdown"""
+    def _page_markdown(self, page: Dict) -> str:
+        """A single page as a standalone Markdown file"""
         
-        # Remove excessive whitespace
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        text = re.sub(r' {2,}', ' ', text)
+        content = page.get('markdown') or self._blocks_to_markdown(page_blocks(page))
+        return f"# {page['title']}\n\n**Source:** {page['url']}\n\n{content}\n"
+
+    def _blocks_to_markdown(self, blocks: List[List]) -> str:
+        """Render normalized blocks as markdown; page titles are ##, so headings start at ###"""
         
-        # Ensure proper line endings
-        text = text.strip()
+        markdown_parts = []
+        for block in blocks:
+            if block[0] == 'h':
+                markdown_parts.append(f"{'#' * min(block[1] + 2, 6)} {block[2]}")
+            else:
+                markdown_parts.append(block_text(block, markers=True))
         
-        return text
\ No newline at end of file
+        return '\n\n'.join(markdown_parts)
\ No newline at end of file
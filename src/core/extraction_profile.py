@@ -0,0 +1,139 @@
+"""
+Per-domain extraction profiles for content and title selectors
+
+Pages on one documentation site share a template, so the selector that
+matched the first few pages of a domain is tried first on the rest of the
+crawl and on later crawls. Profiles are cached in EXTRACTION_PROFILE_FILE;
+selectors pinned in EXTRACTION_OVERRIDES_FILE always take precedence.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Import config settings
+try:
+    from .config import (
+        CONTENT_SELECTORS, TITLE_SELECTORS, EXTRACTION_PROFILE_FILE,
+        EXTRACTION_OVERRIDES_FILE, PROFILE_LEARN_PAGES
+    )
+except ImportError:
+    try:
+        from config import (
+            CONTENT_SELECTORS, TITLE_SELECTORS, EXTRACTION_PROFILE_FILE,
+            EXTRACTION_OVERRIDES_FILE, PROFILE_LEARN_PAGES
+        )
+    except ImportError:
+        # Fallback if config import fails
+        CONTENT_SELECTORS = ['main', '.content', '.main-content', '.doc-content', '.documentation',
+                             '.article', 'article', '.page-content', '.markdown-body', '.rst-content']
+        TITLE_SELECTORS = ['h1', 'title', '.page-title', '.doc-title', '.content-title']
+        EXTRACTION_PROFILE_FILE = os.path.join("cache", "extraction_profiles.json")
+        EXTRACTION_OVERRIDES_FILE = "extraction_overrides.json"
+        PROFILE_LEARN_PAGES = 3
+
+DEFAULT_SELECTORS = {
+    'content': CONTENT_SELECTORS,
+    'title': TITLE_SELECTORS,
+}
+
+
+def _load_json(path: str) -> Dict:
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read {path}: {e}")
+        return {}
+
+
+class ExtractionProfiles:
+    """Learned and pinned selector preferences, keyed by domain
+
+    The on-disk profile stores how often each selector matched per domain
+    and kind ('content' or 'title'), e.g.
+    ``{"docs.example.com": {"content": {"main": 42}, "title": {"h1": 42}}}``.
+    """
+
+    def __init__(self, profile_path: str = EXTRACTION_PROFILE_FILE,
+                 overrides_path: str = EXTRACTION_OVERRIDES_FILE,
+                 learn_pages: int = PROFILE_LEARN_PAGES):
+        self.profile_path = profile_path
+        self.learn_pages = learn_pages
+        self.tallies: Dict[str, Dict[str, Dict[str, int]]] = _load_json(profile_path)
+        self.overrides: Dict[str, Dict[str, List[str]]] = _load_json(overrides_path)
+        self._order_cache: Dict[tuple, List[str]] = {}
+        self._dirty = False
+
+    def learned_selector(self, domain: str, kind: str) -> Optional[str]:
+        """Selector that matched most often once enough pages have been seen"""
+        tally = self.tallies.get(domain, {}).get(kind, {})
+        if sum(tally.values()) < self.learn_pages:
+            return None
+        return max(tally, key=tally.get)
+
+    def selectors(self, domain: str, kind: str) -> List[str]:
+        """Selectors to try in order: pinned, then learned, then defaults"""
+        key = (domain, kind)
+        if key not in self._order_cache:
+            ordered = list(self.overrides.get(domain, {}).get(kind, []))
+            learned = self.learned_selector(domain, kind)
+            if learned:
+                ordered.append(learned)
+            ordered.extend(DEFAULT_SELECTORS[kind])
+            # Preserve order while removing duplicates
+            self._order_cache[key] = list(dict.fromkeys(ordered))
+        return self._order_cache[key]
+
+    def record(self, domain: str, kind: str, selector: str):
+        """Record that a selector produced the content/title for a page"""
+        tally = self.tallies.setdefault(domain, {}).setdefault(kind, {})
+        before = self.learned_selector(domain, kind)
+        tally[selector] = tally.get(selector, 0) + 1
+        self._dirty = True
+
+        after = self.learned_selector(domain, kind)
+        if after != before:
+            logger.info(f"Learned {kind} selector '{after}' for {domain}")
+            self._order_cache.pop((domain, kind), None)
+            self.save()
+
+    def save(self):
+        """Persist learned tallies (no-op when nothing changed)"""
+        if not self._dirty or not self.profile_path:
+            return
+        try:
+            directory = os.path.dirname(self.profile_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # A temp file of our own: worker processes and the batch CLI may save at the same time
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory or '.', delete=False,
+                                             prefix=os.path.basename(self.profile_path), suffix='.tmp') as f:
+                tmp_path = f.name
+                json.dump(self.tallies, f, indent=2, sort_keys=True)
+            try:
+                os.replace(tmp_path, self.profile_path)
+            except OSError:
+                os.remove(tmp_path)
+                raise
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Could not save extraction profiles: {e}")
+
+
+_profiles: Optional[ExtractionProfiles] = None
+
+
+def get_extraction_profiles() -> ExtractionProfiles:
+    """Process-wide profile cache shared by all scrapers"""
+    global _profiles
+    if _profiles is None:
+        _profiles = ExtractionProfiles()
+    return _profiles
@@ -0,0 +1,137 @@
+"""
+Retry, backoff and per-host circuit breaker policy for page fetches
+"""
+
+import random
+import time
+from typing import Dict, Optional
+
+# Import config settings
+try:
+    from .config import (
+        REQUEST_TIMEOUT, MAX_RETRIES, RETRY_BACKOFF_BASE, RETRY_BACKOFF_MAX,
+        RETRYABLE_STATUS_CODES, CIRCUIT_BREAKER_THRESHOLD, CIRCUIT_BREAKER_COOLDOWN,
+        MIN_REQUEST_TIMEOUT, LATENCY_TIMEOUT_FACTOR
+    )
+except ImportError:
+    try:
+        from config import (
+            REQUEST_TIMEOUT, MAX_RETRIES, RETRY_BACKOFF_BASE, RETRY_BACKOFF_MAX,
+            RETRYABLE_STATUS_CODES, CIRCUIT_BREAKER_THRESHOLD, CIRCUIT_BREAKER_COOLDOWN,
+            MIN_REQUEST_TIMEOUT, LATENCY_TIMEOUT_FACTOR
+        )
+    except ImportError:
+        # Fallback if config import fails
+        REQUEST_TIMEOUT = 10
+        MAX_RETRIES = 3
+        RETRY_BACKOFF_BASE = 0.5
+        RETRY_BACKOFF_MAX = 8.0
+        RETRYABLE_STATUS_CODES = [408, 425, 429, 500, 502, 503, 504]
+        CIRCUIT_BREAKER_THRESHOLD = 5
+        CIRCUIT_BREAKER_COOLDOWN = 30
+        MIN_REQUEST_TIMEOUT = 2
+        LATENCY_TIMEOUT_FACTOR = 4
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because its host's circuit is open"""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Circuit open for {host}, retry in {retry_in:.1f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class HostState:
+    """Failure and latency bookkeeping for a single host"""
+
+    def __init__(self):
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.latency: Optional[float] = None  # Exponentially weighted average
+
+
+class FetchPolicy:
+    """Decides timeouts, retries and whether a host may be contacted at all
+
+    Transient errors (connection errors, timeouts and retryable HTTP status
+    codes) are retried with jittered exponential backoff. After
+    ``breaker_threshold`` consecutive transient failures a host's circuit
+    opens and requests are refused until ``breaker_cooldown`` has passed;
+    the next request is then a trial that either closes the circuit or
+    re-opens it.
+    """
+
+    def __init__(self,
+                 max_retries: int = MAX_RETRIES,
+                 backoff_base: float = RETRY_BACKOFF_BASE,
+                 backoff_max: float = RETRY_BACKOFF_MAX,
+                 breaker_threshold: int = CIRCUIT_BREAKER_THRESHOLD,
+                 breaker_cooldown: float = CIRCUIT_BREAKER_COOLDOWN,
+                 max_timeout: float = REQUEST_TIMEOUT,
+                 min_timeout: float = MIN_REQUEST_TIMEOUT,
+                 timeout_factor: float = LATENCY_TIMEOUT_FACTOR):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.max_timeout = max_timeout
+        self.min_timeout = min_timeout
+        self.timeout_factor = timeout_factor
+        self.hosts: Dict[str, HostState] = {}
+
+    def _state(self, host: str) -> HostState:
+        if host not in self.hosts:
+            self.hosts[host] = HostState()
+        return self.hosts[host]
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry attempt (0-based)"""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def seconds_until_closed(self, host: str) -> float:
+        """Remaining cooldown for a host, 0 if requests are allowed"""
+        state = self._state(host)
+        if state.opened_at is None:
+            return 0.0
+        return max(0.0, state.opened_at + self.breaker_cooldown - time.monotonic())
+
+    def check(self, host: str):
+        """Raise CircuitOpenError if the host is currently paused"""
+        retry_in = self.seconds_until_closed(host)
+        if retry_in > 0:
+            raise CircuitOpenError(host, retry_in)
+
+    def timeout_for(self, host: str) -> float:
+        """Latency-aware timeout: a multiple of the host's observed latency"""
+        state = self._state(host)
+        if state.latency is None:
+            return self.max_timeout
+        timeout = state.latency * self.timeout_factor
+        return max(self.min_timeout, min(self.max_timeout, timeout))
+
+    def record_success(self, host: str, latency: float):
+        state = self._state(host)
+        state.consecutive_failures = 0
+        state.opened_at = None
+        if state.latency is None:
+            state.latency = latency
+        else:
+            state.latency = 0.8 * state.latency + 0.2 * latency
+
+    def record_failure(self, host: str):
+        state = self._state(host)
+        state.consecutive_failures += 1
+        if state.consecutive_failures >= self.breaker_threshold:
+            state.opened_at = time.monotonic()
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Check if an error is transient and worth another attempt"""
+        import requests
+        if isinstance(error, CircuitOpenError):
+            return True
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return error.response.status_code in RETRYABLE_STATUS_CODES
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
@@ -0,0 +1,146 @@
+"""
+Priority-ordered crawl frontier
+
+URLs are scored by link depth, position in the site navigation, path
+affinity to the start URL and sitemap priority, so a time- or
+budget-limited crawl fetches the most valuable pages first.
+"""
+
+import heapq
+import itertools
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# Import config settings
+try:
+    from .config import FRONTIER_WEIGHTS, LOW_VALUE_PATHS
+except ImportError:
+    try:
+        from config import FRONTIER_WEIGHTS, LOW_VALUE_PATHS
+    except ImportError:
+        # Fallback if config import fails
+        FRONTIER_WEIGHTS = {
+            'depth': 1.0, 'navigation': 1.5, 'path_affinity': 2.0,
+            'sitemap': 1.0, 'low_value': 2.0, 'footer': 1.0,
+        }
+        LOW_VALUE_PATHS = ['changelog', 'release-notes', 'blog', 'legal', 'privacy', 'terms']
+
+DEFAULT_SITEMAP_PRIORITY = 0.5
+
+
+def _path_segments(url: str) -> List[str]:
+    return [segment for segment in urlparse(url).path.lower().split('/') if segment]
+
+
+def parse_sitemap(xml_text: str) -> Dict[str, float]:
+    """Parse a sitemap.xml document into a url -> priority mapping"""
+
+    priorities = {}
+    try:
+        root = ET.fromstring(xml_text)
+    except ET.ParseError:
+        return priorities
+
+    for element in root.iter():
+        if not element.tag.endswith('url'):
+            continue
+        loc = None
+        priority = DEFAULT_SITEMAP_PRIORITY
+        for child in element:
+            tag = child.tag.rsplit('}', 1)[-1]
+            if tag == 'loc' and child.text:
+                loc = child.text.strip()
+            elif tag == 'priority' and child.text:
+                try:
+                    priority = float(child.text.strip())
+                except ValueError:
+                    pass
+        if loc:
+            priorities[loc.rstrip('/')] = priority
+
+    return priorities
+
+
+class CrawlFrontier:
+    """Max-priority queue of (url, depth) pairs waiting to be fetched
+
+    A URL pushed more than once keeps its best score; stale heap entries are
+    skipped lazily on pop.
+    """
+
+    def __init__(self, start_url: str, sitemap_priorities: Optional[Dict[str, float]] = None,
+                 weights: Optional[Dict[str, float]] = None):
+        self.start_segments = _path_segments(start_url)
+        self.sitemap_priorities = sitemap_priorities or {}
+        self.weights = dict(FRONTIER_WEIGHTS)
+        if weights:
+            self.weights.update(weights)
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._best: Dict[str, float] = {}
+        self._counter = itertools.count()  # FIFO tie-breaker for equal scores
+
+    def __len__(self) -> int:
+        return len(self._best)
+
+    def __bool__(self) -> bool:
+        return bool(self._best)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._best
+
+    def path_affinity(self, url: str) -> float:
+        """Fraction of the start URL's path that this URL shares (1.0 = inside it)"""
+        if not self.start_segments:
+            return 1.0
+        segments = _path_segments(url)
+        shared = 0
+        for start_segment, segment in zip(self.start_segments, segments):
+            if start_segment != segment:
+                break
+            shared += 1
+        return shared / len(self.start_segments)
+
+    def score(self, url: str, depth: int, nav_position: Optional[float] = None,
+              in_footer: bool = False) -> float:
+        """Score a URL; higher scores are fetched first
+
+        Args:
+            url: Absolute URL to score
+            depth: Link depth from the start URL
+            nav_position: Relative position (0.0 = first) of the link in the
+                page navigation/sidebar, or None if it is not a nav link
+            in_footer: Whether the link was only found in a page footer
+        """
+        weights = self.weights
+        score = -weights['depth'] * depth
+        if nav_position is not None:
+            score += weights['navigation'] * (1.0 - nav_position)
+        score += weights['path_affinity'] * self.path_affinity(url)
+        priority = self.sitemap_priorities.get(url.rstrip('/'), DEFAULT_SITEMAP_PRIORITY)
+        score += weights['sitemap'] * priority
+        path = urlparse(url).path.lower()
+        if any(keyword in path for keyword in LOW_VALUE_PATHS):
+            score -= weights['low_value']
+        if in_footer:
+            score -= weights['footer']
+        return score
+
+    def push(self, url: str, depth: int, nav_position: Optional[float] = None,
+             in_footer: bool = False) -> bool:
+        """Queue a URL, returns False if it is already queued with a better score"""
+        score = self.score(url, depth, nav_position, in_footer)
+        if url in self._best and self._best[url] >= score:
+            return False
+        self._best[url] = score
+        heapq.heappush(self._heap, (-score, next(self._counter), url, depth))
+        return True
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        """Remove and return the highest-priority (url, depth), or None if empty"""
+        while self._heap:
+            neg_score, _, url, depth = heapq.heappop(self._heap)
+            if self._best.get(url) == -neg_score:
+                del self._best[url]
+                return url, depth
+        return None
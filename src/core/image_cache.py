@@ -0,0 +1,225 @@
+"""
+Content-addressed cache of images prepared for PDF output
+
+Images are downloaded once, downscaled to the PDF's target resolution and
+recompressed, and stored under a hash of their content and the processing
+settings, so the same image is reused across pages, URLs and jobs. An index
+maps image URLs to cached files so later crawls skip the download.
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Iterable, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# Import config settings
+try:
+    from .config import (
+        IMAGE_CACHE_DIR, IMAGE_MAX_WIDTH_PX, IMAGE_JPEG_QUALITY, IMAGE_MIN_PX,
+        IMAGE_MAX_SOURCE_BYTES, IMAGE_FETCH_CONCURRENCY
+    )
+except ImportError:
+    try:
+        from config import (
+            IMAGE_CACHE_DIR, IMAGE_MAX_WIDTH_PX, IMAGE_JPEG_QUALITY, IMAGE_MIN_PX,
+            IMAGE_MAX_SOURCE_BYTES, IMAGE_FETCH_CONCURRENCY
+        )
+    except ImportError:
+        # Fallback if config import fails
+        IMAGE_CACHE_DIR = os.path.join("cache", "images")
+        IMAGE_MAX_WIDTH_PX = 940
+        IMAGE_JPEG_QUALITY = 80
+        IMAGE_MIN_PX = 32
+        IMAGE_MAX_SOURCE_BYTES = 10 * 1024 * 1024
+        IMAGE_FETCH_CONCURRENCY = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    url TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,  -- '' for images that were skipped (too small, undecodable)
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+INDEX_FILENAME = 'images.sqlite'  # URL -> cached file index inside the cache directory
+
+
+class CachedImage(NamedTuple):
+    path: str
+    width: int  # Pixels after downscaling
+    height: int
+    size: int  # Bytes on disk
+
+
+def pillow_available() -> bool:
+    try:
+        import PIL  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class ImageCache:
+    """Downscaled, recompressed images keyed by content hash"""
+
+    def __init__(self, directory: str = IMAGE_CACHE_DIR, max_width: int = IMAGE_MAX_WIDTH_PX,
+                 quality: int = IMAGE_JPEG_QUALITY, min_px: int = IMAGE_MIN_PX,
+                 max_source_bytes: int = IMAGE_MAX_SOURCE_BYTES):
+        self.directory = directory
+        self.max_width = max_width
+        self.quality = quality
+        self.min_px = min_px
+        self.max_source_bytes = max_source_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(directory, INDEX_FILENAME), check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(SCHEMA)
+
+    def lookup(self, url: str) -> Optional[CachedImage]:
+        """Cached image for a URL, or None if it must be (re)fetched
+
+        Skipped images are returned with an empty path so they aren't
+        downloaded again.
+        """
+        with self._lock:
+            row = self._db.execute('SELECT filename, width, height FROM images WHERE url = ?', (url,)).fetchone()
+        if row is None:
+            return None
+        filename, width, height = row
+        if not filename:
+            return CachedImage('', 0, 0, 0)
+        path = os.path.join(self.directory, filename)
+        try:
+            return CachedImage(path, width, height, os.path.getsize(path))
+        except OSError:
+            return None  # Removed by the storage janitor
+
+    def store(self, url: str, data: bytes) -> CachedImage:
+        """Process downloaded image bytes (blocking) and record them for the URL"""
+        digest = hashlib.blake2b(data, digest_size=16)
+        digest.update(f"{self.max_width}:{self.quality}".encode())
+        digest = digest.hexdigest()
+
+        image = self._existing(digest)
+        if image is None:
+            image = self._process(digest, data)
+
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO images (url, filename, width, height, fetched_at) VALUES (?, ?, ?, ?, ?)',
+                (url, os.path.basename(image.path), image.width, image.height, time.time())
+            )
+            self._db.commit()
+        return image
+
+    def _existing(self, digest: str) -> Optional[CachedImage]:
+        # The same content was already processed, possibly under another URL
+        from PIL import Image
+
+        for extension in ('.jpg', '.png'):
+            path = os.path.join(self.directory, digest + extension)
+            if os.path.exists(path):
+                try:
+                    with Image.open(path) as img:
+                        return CachedImage(path, img.width, img.height, os.path.getsize(path))
+                except (OSError, Image.DecompressionBombError) as e:
+                    # Truncated or corrupt cache file: drop it and process the download again
+                    logger.warning(f"Discarding unreadable cached image {path}: {e}")
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+        return None
+
+    def _process(self, digest: str, data: bytes) -> CachedImage:
+        from PIL import Image, UnidentifiedImageError
+
+        try:
+            img = Image.open(io.BytesIO(data))
+            img.load()
+        except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+            logger.info(f"Skipping undecodable image: {e}")
+            return CachedImage('', 0, 0, 0)
+
+        if img.width < self.min_px or img.height < self.min_px:
+            return CachedImage('', 0, 0, 0)  # Icons, badges and spacers
+
+        if img.width > self.max_width:
+            height = max(1, round(img.height * self.max_width / img.width))
+            img = img.resize((self.max_width, height), Image.LANCZOS)
+
+        # Transparent and palette images (diagrams, screenshots of UIs) stay PNG, photos become JPEG
+        has_alpha = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+        if has_alpha or img.mode in ('P', '1', 'L'):
+            path = os.path.join(self.directory, digest + '.png')
+            if img.mode not in ('RGBA', 'LA', 'L', 'P', '1'):
+                img = img.convert('RGBA')
+            save_options = {'format': 'PNG', 'optimize': True}
+        else:
+            path = os.path.join(self.directory, digest + '.jpg')
+            img = img.convert('RGB')
+            save_options = {'format': 'JPEG', 'quality': self.quality, 'optimize': True, 'progressive': True}
+
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            img.save(tmp_path, **save_options)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return CachedImage(path, img.width, img.height, os.path.getsize(path))
+
+    async def fetch_all(self, urls: Iterable[str], fetch: Callable[[str], Awaitable[bytes]],
+                        concurrency: int = IMAGE_FETCH_CONCURRENCY) -> Dict[str, CachedImage]:
+        """Resolve image URLs to cached images, downloading missing ones concurrently
+
+        Each URL is fetched at most once; images that fail to download or to
+        process, or are skipped, are left out of the result.
+        """
+        slots = asyncio.Semaphore(concurrency)
+        loop = asyncio.get_event_loop()
+        results: Dict[str, CachedImage] = {}
+
+        async def resolve(url: str):
+            image = self.lookup(url)
+            if image is None:
+                async with slots:
+                    try:
+                        data = await fetch(url)
+                    except Exception as e:
+                        logger.warning(f"Could not fetch image {url}: {str(e)[:100]}")
+                        return
+                if len(data) > self.max_source_bytes:
+                    logger.info(f"Skipping image over {self.max_source_bytes} bytes: {url}")
+                    return
+                # Decoding and resizing are CPU-bound, keep them off the event loop
+                try:
+                    image = await loop.run_in_executor(None, self.store, url, data)
+                except Exception as e:  # One bad image (or full disk) must not cost the PDF its other images
+                    logger.warning(f"Could not process image {url}: {str(e)[:100]}")
+                    return
+            if image.path:
+                results[url] = image
+
+        await asyncio.gather(*(resolve(url) for url in dict.fromkeys(urls)))
+        return results
+
+    def prune(self, older_than: float) -> int:
+        """Forget URLs fetched before a timestamp, so they are fetched again; returns rows removed"""
+        with self._lock:
+            removed = self._db.execute('DELETE FROM images WHERE fetched_at < ?', (older_than,)).rowcount
+            self._db.commit()
+        return removed
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,341 @@
+"""
+Background storage janitor with age and size based retention
+
+Temp files, generated artifacts, their copies in the user's Downloads folder
+and caches are swept periodically by one task owned by the application
+lifecycle instead of on every crawl. Files are ranked by last use (the later
+of last download and last modification), so within a size quota the least
+recently downloaded files go first. Old rows of the cache databases are
+pruned by age in the same sweep.
+"""
+
+import asyncio
+import fnmatch
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Import config settings
+try:
+    from .config import (
+        OUTPUT_DIR, USER_DOWNLOADS_DIR, TEMP_DIR, CACHE_DIR, JANITOR_INTERVAL_SECONDS, STORAGE_RETENTION,
+        PUBLISHED_LEDGER_FILE, SEARCH_INDEX_FILE, IMAGE_CACHE_DIR, CRAWL_BACKEND_URL, WARC_DIR
+    )
+except ImportError:
+    from config import (
+        OUTPUT_DIR, USER_DOWNLOADS_DIR, TEMP_DIR, CACHE_DIR, JANITOR_INTERVAL_SECONDS, STORAGE_RETENTION,
+        PUBLISHED_LEDGER_FILE, SEARCH_INDEX_FILE, IMAGE_CACHE_DIR, CRAWL_BACKEND_URL, WARC_DIR
+    )
+
+logger = logging.getLogger(__name__)
+
+# Files that are open for the life of the process and must never be swept
+PROTECTED_PATTERNS = ['*.sqlite', '*.sqlite-wal', '*.sqlite-shm', '*.json']
+
+_ledger_lock = threading.Lock()  # Publishing (event loop executor) and sweeps (janitor thread) share the ledger
+
+
+class PublishedLedger:
+    """Files this app published outside its own directories, e.g. to ~/Downloads
+
+    Each path is recorded with its size and modification time when it is
+    published, so retention only ever removes files we wrote, and not a
+    file the user saved (or edited) under the same name later.
+    """
+
+    def __init__(self, path: str = PUBLISHED_LEDGER_FILE):
+        self.path = path
+
+    def _load(self) -> Dict[str, List[int]]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read {self.path}: {e}")
+            return {}
+
+    def _save(self, entries: Dict[str, List[int]]):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.path)
+
+    def record(self, path: str):
+        """Record a file that was just published (blocking)"""
+        stat = os.stat(path)
+        with _ledger_lock:
+            entries = self._load()
+            entries[os.path.abspath(path)] = [stat.st_size, stat.st_mtime_ns]
+            self._save(entries)
+
+    def entries(self) -> Dict[str, List[int]]:
+        with _ledger_lock:
+            return self._load()
+
+    @staticmethod
+    def owns(entries: Dict[str, List[int]], path: str, stat: os.stat_result) -> bool:
+        return entries.get(os.path.abspath(path)) == [stat.st_size, stat.st_mtime_ns]
+
+    def forget_missing(self):
+        """Drop entries whose file was removed or has changed since it was published"""
+        with _ledger_lock:
+            entries = self._load()
+            kept = {}
+            for path, recorded in entries.items():
+                try:
+                    if self.owns(entries, path, os.stat(path, follow_symlinks=False)):
+                        kept[path] = recorded
+                except OSError:
+                    pass
+            if len(kept) != len(entries):
+                self._save(kept)
+
+
+class StorageArea:
+    """A directory (or part of one) under a retention policy
+
+    With a ``ledger``, only files recorded in it (and unchanged since) are
+    considered, whatever else matches the patterns.
+    """
+
+    def __init__(self, name: str, directory: str, patterns: Optional[List[str]] = None,
+                 exclude: Optional[List[str]] = None, recursive: bool = False,
+                 max_age_hours: Optional[float] = None, max_bytes: Optional[int] = None,
+                 ledger: Optional[PublishedLedger] = None):
+        self.name = name
+        self.directory = directory
+        self.patterns = patterns or ['*']
+        self.exclude = exclude or []
+        self.recursive = recursive
+        self.max_age = max_age_hours * 3600 if max_age_hours is not None else None
+        self.max_bytes = max_bytes
+        self.ledger = ledger
+
+    def matches(self, filename: str) -> bool:
+        return (any(fnmatch.fnmatch(filename, pattern) for pattern in self.patterns)
+                and not any(fnmatch.fnmatch(filename, pattern) for pattern in self.exclude))
+
+    def files(self) -> List[os.DirEntry]:
+        """Matching files, without following symlinks"""
+        owned = self.ledger.entries() if self.ledger else None
+        found = []
+        pending = [self.directory]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if self.recursive:
+                                pending.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False) and self.matches(entry.name):
+                            if owned is not None and \
+                                    not PublishedLedger.owns(owned, entry.path, entry.stat(follow_symlinks=False)):
+                                continue
+                            found.append(entry)
+            except FileNotFoundError:
+                continue
+        return found
+
+
+class DatabaseArea:
+    """Rows of a cache database under an age limit
+
+    ``open_db(path)`` opens a separate connection, so sweeps never share the
+    app's connection across threads; it returns an object with
+    ``prune(older_than) -> rows removed`` and ``close()``. SQLite reuses the
+    freed pages, so the file stops growing rather than shrinking. With
+    ``is_file=False`` the path is a server URL (e.g. a Redis frontier).
+    """
+
+    def __init__(self, name: str, path: str, open_db: Callable[[str], object],
+                 max_age_hours: Optional[float] = None, is_file: bool = True):
+        self.name = name
+        self.path = path
+        self.open_db = open_db
+        self.max_age = max_age_hours * 3600 if max_age_hours is not None else None
+        self.is_file = is_file
+
+    def prune(self, now: float) -> int:
+        if self.max_age is None or (self.is_file and not os.path.exists(self.path)):
+            return 0
+        db = self.open_db(self.path)
+        try:
+            return db.prune(now - self.max_age)
+        finally:
+            db.close()
+
+
+def last_used(stat: os.stat_result) -> float:
+    """When a file was last downloaded or written, whichever is later"""
+    return max(stat.st_atime, stat.st_mtime)
+
+
+def mark_downloaded(path: str):
+    """Record a download of a file for LRU retention
+
+    The access time is set explicitly because most filesystems are mounted
+    with relatime/noatime and don't update it on reads. The modification
+    time is kept to the nanosecond, as download ETags are derived from it.
+    """
+    try:
+        os.utime(path, ns=(time.time_ns(), os.stat(path).st_mtime_ns))
+    except OSError as e:
+        logger.debug(f"Could not record download of {path}: {e}")
+
+
+def default_areas() -> List[StorageArea]:
+    """Storage areas and retention limits from config"""
+    try:
+        from .doc_scraper import OUTPUT_FORMATS
+        from .page_store import PAGE_STORE_PREFIX
+        from .artifacts import ENCODING_SUFFIXES
+    except ImportError:
+        from doc_scraper import OUTPUT_FORMATS
+        from page_store import PAGE_STORE_PREFIX
+        from artifacts import ENCODING_SUFFIXES
+
+    def area(name: str, directory: str, **kwargs) -> StorageArea:
+        return StorageArea(name, directory, **kwargs, **STORAGE_RETENTION.get(name, {}))
+
+    artifact_patterns = [f"documentation_*{extension}" for extension, _ in OUTPUT_FORMATS.values()]
+    # Our outputs and their precompressed variants; anything else put in OUTPUT_DIR is left alone
+    variant_patterns = [pattern + suffix for pattern in artifact_patterns for suffix in ENCODING_SUFFIXES.values()]
+    return [
+        area('temp', TEMP_DIR, patterns=['temp_doc_*.html', f'{PAGE_STORE_PREFIX}*']),
+        area('artifacts', OUTPUT_DIR, patterns=artifact_patterns + variant_patterns),
+        area('warc', WARC_DIR, patterns=['*.warc.gz']),  # A subdirectory, which 'artifacts' doesn't descend into
+        area('user_downloads', USER_DOWNLOADS_DIR, patterns=artifact_patterns, ledger=PublishedLedger()),
+        area('cache', CACHE_DIR, exclude=PROTECTED_PATTERNS, recursive=True),
+    ]
+
+
+def default_databases() -> List[DatabaseArea]:
+    """Cache databases pruned by age, from config"""
+    try:
+        from .search_index import SearchIndex
+        from .image_cache import ImageCache, INDEX_FILENAME
+        from .distributed import SQLiteFrontierBackend, open_backend
+    except ImportError:
+        from search_index import SearchIndex
+        from image_cache import ImageCache, INDEX_FILENAME
+        from distributed import SQLiteFrontierBackend, open_backend
+
+    def area(name: str, path: str, open_db: Callable[[str], object], **kwargs) -> DatabaseArea:
+        return DatabaseArea(name, path, open_db, **kwargs, **STORAGE_RETENTION.get(name, {}))
+
+    databases = [
+        area('search_index', SEARCH_INDEX_FILE, SearchIndex),
+        area('image_index', os.path.join(IMAGE_CACHE_DIR, INDEX_FILENAME),
+             lambda path: ImageCache(os.path.dirname(path))),
+    ]
+    if CRAWL_BACKEND_URL.startswith('sqlite:///'):
+        databases.append(area('crawl_frontier', CRAWL_BACKEND_URL[len('sqlite:///'):], SQLiteFrontierBackend))
+    else:
+        databases.append(area('crawl_frontier', CRAWL_BACKEND_URL, open_backend, is_file=False))
+    return databases
+
+
+class StorageJanitor:
+    """Applies retention to storage areas and reports their disk usage"""
+
+    def __init__(self, areas: Optional[List[StorageArea]] = None,
+                 databases: Optional[List[DatabaseArea]] = None,
+                 interval_seconds: float = JANITOR_INTERVAL_SECONDS):
+        self.areas = areas if areas is not None else default_areas()
+        self.databases = databases if databases is not None else default_databases()
+        self.interval_seconds = interval_seconds
+        self.last_report: Optional[Dict] = None
+
+    def sweep(self) -> Dict:
+        """Apply retention to every area once (blocking) and return a usage report"""
+        now = time.time()
+        report = {'swept_at': now, 'areas': {}, 'databases': {}}
+
+        for area in self.areas:
+            files = []
+            for entry in area.files():
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                files.append((last_used(stat), stat.st_size, entry.path))
+            files.sort()  # Least recently used first
+
+            removed_files = removed_bytes = 0
+            total_bytes = sum(size for _, size, _ in files)
+            kept = []
+            for used, size, path in files:
+                expired = area.max_age is not None and now - used > area.max_age
+                over_quota = area.max_bytes is not None and total_bytes > area.max_bytes
+                if (expired or over_quota) and self._remove(path):
+                    removed_files += 1
+                    removed_bytes += size
+                    total_bytes -= size
+                else:
+                    kept.append(path)
+
+            if removed_files:
+                logger.info(f"Janitor removed {removed_files} files ({removed_bytes} bytes) from {area.name}")
+            report['areas'][area.name] = {
+                'directory': os.path.abspath(area.directory),
+                'files': len(kept),
+                'bytes': total_bytes,
+                'max_bytes': area.max_bytes,
+                'removed_files': removed_files,
+                'removed_bytes': removed_bytes,
+            }
+            try:
+                disk = shutil.disk_usage(area.directory)
+                report['areas'][area.name]['disk_free_bytes'] = disk.free
+            except OSError:
+                pass
+            if area.ledger:
+                area.ledger.forget_missing()
+
+        for database in self.databases:
+            try:
+                removed_rows = database.prune(now)
+            except Exception as e:  # sqlite3.Error, or a locked database
+                logger.warning(f"Could not prune {database.name}: {e}")
+                removed_rows = 0
+            if removed_rows:
+                logger.info(f"Janitor pruned {removed_rows} rows from {database.name}")
+            is_local = database.is_file and os.path.exists(database.path)
+            report['databases'][database.name] = {
+                'path': os.path.abspath(database.path) if database.is_file else database.path,
+                'bytes': os.path.getsize(database.path) if is_local else 0,
+                'removed_rows': removed_rows,
+            }
+
+        self.last_report = report
+        return report
+
+    def _remove(self, path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return True
+        except OSError as e:
+            logger.warning(f"Could not remove {path}: {e}")
+            return False
+
+    async def run_forever(self):
+        """Sweep every ``interval_seconds`` until cancelled, off the event loop"""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await loop.run_in_executor(None, self.sweep)
+            except Exception as e:
+                logger.warning(f"Storage sweep failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
@@ -0,0 +1,233 @@
+"""
+Persistent job store for web download jobs
+
+Every job's state, progress counters, timings and artifacts are recorded in
+a small SQLite database, so running and finished jobs survive page reloads
+and server restarts and can be polled over plain HTTP instead of a
+WebSocket. Jobs running in this process are kept in memory and written
+through at most every JOB_PERSIST_INTERVAL seconds (and on every state
+change), so per-page progress updates stay cheap; long-polling clients are
+woken as soon as a job's version changes.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Import config settings
+try:
+    from .config import JOB_STORE_FILE, JOB_HISTORY_LIMIT, JOB_PERSIST_INTERVAL
+except ImportError:
+    try:
+        from config import JOB_STORE_FILE, JOB_HISTORY_LIMIT, JOB_PERSIST_INTERVAL
+    except ImportError:
+        # Fallback if config import fails
+        JOB_STORE_FILE = os.path.join("cache", "jobs.sqlite")
+        JOB_HISTORY_LIMIT = 1000
+        JOB_PERSIST_INTERVAL = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_created ON jobs (created_at);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, created_at);
+"""
+
+FINISHED_STATES = ('completed', 'failed', 'cancelled', 'interrupted')
+
+
+def new_job(job_id: str, url: str, output_formats: List[str]) -> Dict:
+    now = time.time()
+    return {
+        'id': job_id,
+        'state': 'queued',
+        'url': url,
+        'output_formats': list(output_formats),
+        'step': 0,
+        'total_steps': 7,
+        'progress': 0.0,
+        'message': '',
+        'details': '',
+        'pages': 0,
+        'failed_pages': 0,
+        'bytes_downloaded': 0,
+        'artifacts': [],
+        'error': None,
+        'timings': {},
+        'created_at': now,
+        'started_at': None,
+        'finished_at': None,
+        'updated_at': now,
+        'version': 1,
+    }
+
+
+class JobStore:
+    """SQLite-backed record of download jobs, with in-memory live jobs"""
+
+    def __init__(self, path: str = JOB_STORE_FILE, persist_interval: float = JOB_PERSIST_INTERVAL):
+        self.path = path
+        self.persist_interval = persist_interval
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(SCHEMA)
+        self._live: Dict[str, Dict] = {}  # Jobs running in this process
+        self._persisted_at: Dict[str, float] = {}
+        self._changed: Dict[str, asyncio.Event] = {}
+
+    def recover(self, keep: int = JOB_HISTORY_LIMIT) -> int:
+        """Mark jobs left unfinished by a previous process as interrupted and prune old ones
+
+        Returns the number of interrupted jobs.
+        """
+        now = time.time()
+        interrupted = 0
+        placeholders = ', '.join('?' for _ in FINISHED_STATES)
+        rows = self._db.execute(
+            f'SELECT data FROM jobs WHERE state NOT IN ({placeholders})', FINISHED_STATES
+        ).fetchall()
+        for (data,) in rows:
+            job = json.loads(data)
+            if job['id'] in self._live:
+                continue
+            job.update(state='interrupted', error='The server stopped while the job was running',
+                       finished_at=now, updated_at=now, version=job['version'] + 1)
+            self._write(job)
+            interrupted += 1
+
+        self._db.execute(
+            'DELETE FROM jobs WHERE id IN (SELECT id FROM jobs ORDER BY created_at DESC LIMIT -1 OFFSET ?)',
+            (keep,)
+        )
+        self._db.commit()
+        if interrupted:
+            logger.info(f"Marked {interrupted} unfinished jobs as interrupted")
+        return interrupted
+
+    def _write(self, job: Dict):
+        self._db.execute(
+            'INSERT OR REPLACE INTO jobs (id, state, created_at, data) VALUES (?, ?, ?, ?)',
+            (job['id'], job['state'], job['created_at'], json.dumps(job))
+        )
+        self._persisted_at[job['id']] = time.monotonic()
+
+    def create(self, job_id: str, url: str, output_formats: List[str]) -> Dict:
+        job = new_job(job_id, url, output_formats)
+        self._live[job_id] = job
+        self._write(job)
+        self._db.commit()
+        return job
+
+    def update(self, job_id: str, **fields):
+        """Change fields of a live job, waking long-polling clients
+
+        State changes are written through immediately; progress-only
+        changes at most every ``persist_interval`` seconds.
+        """
+        job = self._live.get(job_id)
+        if job is None:
+            return
+        state_changed = 'state' in fields and fields['state'] != job['state']
+        job.update(fields)
+        job['updated_at'] = time.time()
+        job['version'] += 1
+
+        finished = job['state'] in FINISHED_STATES
+        if finished and job['finished_at'] is None:
+            job['finished_at'] = job['updated_at']
+        if state_changed or finished or \
+                time.monotonic() - self._persisted_at.get(job_id, 0) >= self.persist_interval:
+            try:
+                self._write(job)
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not persist job {job_id}: {e}")
+        if finished:
+            del self._live[job_id]
+            self._persisted_at.pop(job_id, None)
+
+        event = self._changed.pop(job_id, None)
+        if event:
+            event.set()
+
+    def set_artifact(self, job_id: str, artifact: Dict):
+        """Add or replace the artifact entry for one output format"""
+        job = self._live.get(job_id)
+        if job is None:
+            return
+        artifacts = [entry for entry in job['artifacts'] if entry['format'] != artifact['format']]
+        artifacts.append(artifact)
+        self.update(job_id, artifacts=artifacts)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        job = self._live.get(job_id)
+        if job is not None:
+            return dict(job)
+        row = self._db.execute('SELECT data FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def wait(self, job_id: str, since: Optional[int], timeout: float) -> Optional[Dict]:
+        """Long-poll: a job once its version differs from ``since``, or after ``timeout``
+
+        Only jobs running in this process can wake a waiter early; others
+        are returned as stored when the timeout expires.
+        """
+        job = self.get(job_id)
+        if job is None or since is None or job['version'] != since or job['state'] in FINISHED_STATES:
+            return job
+        event = self._changed.setdefault(job_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.get(job_id)
+
+    def list_jobs(self, limit: int = 20, offset: int = 0, state: Optional[str] = None) -> List[Dict]:
+        """Jobs newest first, with live progress for jobs running in this process"""
+        sql = 'SELECT id, data FROM jobs'
+        params: list = []
+        if state:
+            sql += ' WHERE state = ?'
+            params.append(state)
+        sql += ' ORDER BY created_at DESC, id LIMIT ? OFFSET ?'
+        params.extend([limit, offset])
+        return [
+            dict(self._live[job_id]) if job_id in self._live else json.loads(data)
+            for job_id, data in self._db.execute(sql, params)
+        ]
+
+    def count(self, state: Optional[str] = None) -> int:
+        if state:
+            return self._db.execute('SELECT COUNT(*) FROM jobs WHERE state = ?', (state,)).fetchone()[0]
+        return self._db.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+    def close(self):
+        for job in self._live.values():
+            self._write(job)
+        self._db.commit()
+        self._db.close()
+
+
+_store: Optional[JobStore] = None
+
+
+def get_job_store() -> JobStore:
+    """Process-wide job store"""
+    global _store
+    if _store is None:
+        _store = JobStore()
+    return _store
@@ -0,0 +1,116 @@
+"""
+Chunked JSONL export for downstream indexing pipelines
+
+Each page is split into section-sized chunks along its headings, and every
+chunk becomes one JSON line with the page URL and title, the heading path
+leading to it, a content hash and at most JSONL_CHUNK_CHARS of text. The
+file can be written while the crawl runs, one flushed page at a time, so
+consumers can tail it.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Iterator, List, Optional
+
+# Import config settings
+try:
+    from .config import JSONL_CHUNK_CHARS
+except ImportError:
+    try:
+        from config import JSONL_CHUNK_CHARS
+    except ImportError:
+        JSONL_CHUNK_CHARS = 2000  # Fallback if config import fails
+
+try:
+    from .normalize import page_blocks, block_text
+except ImportError:
+    from normalize import page_blocks, block_text
+
+
+def _split_block(block: str, max_chars: int) -> Iterator[str]:
+    """Split an oversized block at line breaks, then at spaces, then hard"""
+    while len(block) > max_chars:
+        cut = block.rfind('\n', 0, max_chars)
+        if cut <= 0:
+            cut = block.rfind(' ', 0, max_chars)
+        if cut <= 0:
+            cut = max_chars
+        yield block[:cut].rstrip()
+        block = block[cut:].lstrip()
+    if block:
+        yield block
+
+
+def iter_sections(page: Dict) -> Iterator[tuple]:
+    """Yield (heading path, blocks) for each section of a page
+
+    Sections follow the heading blocks of the page's normalized text, so a
+    heading path is only as deep as the extraction found headings for.
+    """
+    path: List[tuple] = []  # (level, text)
+    blocks: List[str] = []
+
+    for block in page_blocks(page):
+        if block[0] == 'h':
+            if blocks:
+                yield [text for _, text in path], blocks
+                blocks = []
+            level, text = block[1], block[2]
+            path = [(lvl, txt) for lvl, txt in path if lvl < level] + [(level, text)]
+            continue
+        blocks.append(block_text(block, markers=True))
+
+    if blocks:
+        yield [text for _, text in path], blocks
+
+
+def chunk_page(page: Dict, max_chars: int = JSONL_CHUNK_CHARS) -> List[Dict]:
+    """Split a page into JSONL records of at most max_chars of text each"""
+    records = []
+
+    def emit(heading_path: List[str], text: str):
+        records.append({
+            'url': page['url'],
+            'title': page.get('title', ''),
+            'heading_path': heading_path,
+            'chunk_index': len(records),
+            'content_hash': hashlib.sha256(text.encode('utf-8')).hexdigest(),
+            'text': text,
+        })
+
+    for heading_path, blocks in iter_sections(page):
+        current = ''
+        for block in blocks:
+            for piece in _split_block(block, max_chars):
+                if current and len(current) + 2 + len(piece) > max_chars:
+                    emit(heading_path, current)
+                    current = ''
+                current = f"{current}\n\n{piece}" if current else piece
+        if current:
+            emit(heading_path, current)
+    return records
+
+
+class JsonlWriter:
+    """Appends the chunks of each page to a JSONL file as the page arrives"""
+
+    def __init__(self, path: str, max_chars: int = JSONL_CHUNK_CHARS):
+        self.path = path
+        self.max_chars = max_chars
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file: Optional[object] = open(path, 'w', encoding='utf-8')
+        self.chunks = 0
+
+    def add_page(self, page: Dict):
+        lines = [json.dumps(record, ensure_ascii=False) + '\n' for record in chunk_page(page, self.max_chars)]
+        self._file.write(''.join(lines))
+        self._file.flush()  # Complete lines only, so tailing consumers never see half a record
+        self.chunks += len(lines)
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,163 @@
+"""
+HTML to Markdown conversion of page content in worker processes
+
+The main-content subtree of each page is converted with markdownify when
+the page is extracted, keeping the headings, code blocks, tables and links
+that plain-text extraction flattens. Conversion is CPU-bound, so it runs in
+a small process pool off the event loop. A crawl awaits each page's
+conversion before fetching the next page, so the pool keeps the event loop
+responsive rather than speeding up one crawl; its workers are shared by the
+jobs running concurrently. Converted fragments are cached on
+disk under a hash of the HTML, so repeat crawls of unchanged pages skip it;
+the storage janitor expires them with the rest of CACHE_DIR.
+"""
+
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import re
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Import config settings
+try:
+    from .config import MARKDOWN_CACHE_DIR, MARKDOWN_WORKERS
+except ImportError:
+    try:
+        from config import MARKDOWN_CACHE_DIR, MARKDOWN_WORKERS
+    except ImportError:
+        MARKDOWN_CACHE_DIR = os.path.join("cache", "markdown")  # Fallback if config import fails
+        MARKDOWN_WORKERS = 2
+
+CONVERTER_VERSION = '1'  # Part of the cache key; bump when the conversion output changes
+HEADING_OFFSET = 2  # Page titles are ## in the Markdown document, so content headings start at ###
+FENCE_RE = re.compile(r'^\s*(```|~~~)')
+ATX_HEADING_RE = re.compile(r'^(#{1,6})(?= )')
+
+
+def html_to_markdown(html: str) -> str:
+    """Convert an HTML fragment to Markdown (runs in the worker processes)"""
+    from markdownify import markdownify
+
+    return nest_headings(markdownify(html, heading_style='ATX', bullets='-', strip=['img']))
+
+
+def nest_headings(markdown: str) -> str:
+    """Nest headings under the page title and drop runs of blank lines, outside code blocks"""
+    lines = []
+    in_fence = False
+    for line in markdown.split('\n'):
+        if FENCE_RE.match(line):
+            in_fence = not in_fence
+        elif not in_fence:
+            if not line.strip():
+                if lines and not lines[-1]:
+                    continue
+                line = ''
+            else:
+                line = ATX_HEADING_RE.sub(lambda m: '#' * min(len(m.group(1)) + HEADING_OFFSET, 6), line)
+        lines.append(line)
+    return '\n'.join(lines).strip('\n')
+
+
+class MarkdownCache:
+    """Converted fragments stored as files named by the hash of their HTML"""
+
+    def __init__(self, directory: str = MARKDOWN_CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(html: str) -> str:
+        digest = hashlib.blake2b(html.encode('utf-8'), digest_size=16)
+        digest.update(CONVERTER_VERSION.encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + '.md')
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                markdown = f.read()
+            os.utime(path)  # Keep frequently reused fragments from being expired
+            return markdown
+        except OSError:
+            return None
+
+    def put(self, key: str, markdown: str):
+        path = self._path(key)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(markdown)
+            os.replace(temp_path, path)  # Concurrent jobs may write the same fragment
+        except OSError as e:
+            logger.warning(f"Could not cache Markdown fragment: {e}")
+
+
+class MarkdownConverter:
+    """Converts HTML fragments through the cache and a shared process pool"""
+
+    def __init__(self, workers: int = MARKDOWN_WORKERS, cache: Optional[MarkdownCache] = None):
+        self.workers = workers
+        self.cache = cache or MarkdownCache()
+        self._executor: Optional[Executor] = None
+        self.conversions = 0
+        self.cache_hits = 0
+
+    def _get_executor(self) -> Optional[Executor]:
+        # Started on first use; None runs conversions in the event loop's default thread pool
+        if self._executor is None and self.workers > 0:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    async def convert(self, html: str) -> str:
+        key = self.cache.key(html)
+        markdown = self.cache.get(key)
+        if markdown is not None:
+            self.cache_hits += 1
+            return markdown
+
+        loop = asyncio.get_event_loop()
+        try:
+            markdown = await loop.run_in_executor(self._get_executor(), html_to_markdown, html)
+        except BrokenProcessPool:
+            self._executor = None  # A worker died; start a fresh pool for the next page
+            raise
+        self.conversions += 1
+        self.cache.put(key, markdown)
+        return markdown
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+_converter: Optional[MarkdownConverter] = None
+
+
+def get_markdown_converter() -> MarkdownConverter:
+    """Process-wide converter, so all scrapers share one worker pool"""
+    global _converter
+    if _converter is None:
+        _converter = MarkdownConverter()
+    return _converter
+
+
+def shutdown_markdown_converter():
+    """Stop the shared worker pool, if a converter was ever created"""
+    global _converter
+    if _converter is not None:
+        _converter.shutdown()
+        _converter = None
@@ -0,0 +1,115 @@
+"""
+Shared text normalization for all output formats
+
+Extracted page text is normalized once per page, when the page is stored,
+into a list of blocks that every renderer consumes. Renderers then only
+escape and wrap the block texts for their format instead of each running
+their own regex and replace passes over the whole page.
+
+Blocks are JSON-serialisable lists, so they spill to disk with the page:
+
+    ['h', level, text]      heading recorded during extraction
+    ['p', text]             paragraph, lines separated by '\n'
+    ['ul', [item, ...]]     bulleted list, markers removed
+    ['ol', [item, ...], n]  numbered list, markers removed, numbered from n
+"""
+
+import re
+from typing import Dict, List, Optional
+
+# A line starting with a bullet or number marker, e.g. "• item", "- item", "2. item"
+LIST_MARKER_RE = re.compile(r'^(?:([•·▪‣◦*-])|(\d{1,3})[.)])\s+')
+SPACES_RE = re.compile(r'[ \t\u00a0]+')
+HEADING_LOOKAHEAD = 8  # Recorded headings that may be skipped, e.g. removed as boilerplate
+
+
+def _clean_line(line: str) -> str:
+    return SPACES_RE.sub(' ', line).strip()
+
+
+def _list_block(lines: List[str]) -> Optional[List]:
+    """['ul', items] or ['ol', items, start] if every line of a block is a list item"""
+    matches = [LIST_MARKER_RE.match(line) for line in lines]
+    if not all(matches):
+        return None
+    ordered = all(match.group(2) for match in matches)
+    if not ordered and any(match.group(2) for match in matches):
+        return None  # Mixed markers are more likely prose than a list
+    items = [line[match.end():] for line, match in zip(lines, matches)]
+    if ordered:
+        return ['ol', items, int(matches[0].group(2))]  # Lists continued after a paragraph don't start at 1
+    return ['ul', items]
+
+
+def _match_heading(line: str, headings: List[List], start: int) -> Optional[int]:
+    for index in range(start, min(start + HEADING_LOOKAHEAD, len(headings))):
+        if headings[index][1] == line:
+            return index
+    return None
+
+
+def normalize_content(content: str, headings: Optional[List[List]] = None) -> List[List]:
+    """Split extracted page text into heading, paragraph and list blocks
+
+    Paragraphs matching the page's recorded headings (in document order)
+    become heading blocks; nothing is guessed from text shape alone.
+    """
+    headings = headings or []
+    next_heading = 0
+    blocks = []
+
+    for raw in content.split('\n\n'):
+        lines = [line for line in (_clean_line(line) for line in raw.split('\n')) if line]
+        if not lines:
+            continue
+
+        if len(lines) == 1:
+            index = _match_heading(lines[0], headings, next_heading)
+            if index is not None:
+                blocks.append(['h', headings[index][0], lines[0]])
+                next_heading = index + 1
+                continue
+
+        blocks.append(_list_block(lines) or ['p', '\n'.join(lines)])
+
+    return blocks
+
+
+def page_blocks(page: Dict) -> List[List]:
+    """A page's normalized blocks, computed on first use and kept on the page"""
+    blocks = page.get('blocks')
+    if blocks is None:
+        blocks = normalize_content(page['content'], page.get('headings'))
+        page['blocks'] = blocks
+    return blocks
+
+
+def list_start(block: List) -> int:
+    """Number of the first item of an 'ol' block (1 for blocks stored without one)"""
+    return block[2] if len(block) > 2 else 1
+
+
+def block_text(block: List, markers: bool = False) -> str:
+    """Plain text of a block, with list markers if requested"""
+    kind = block[0]
+    if kind == 'h':
+        return block[2]
+    if kind == 'p':
+        return block[1]
+    if not markers:
+        return '\n'.join(block[1])
+    if kind == 'ol':
+        return '\n'.join(f"{number}. {item}" for number, item in enumerate(block[1], list_start(block)))
+    return '\n'.join(f"- {item}" for item in block[1])
+
+
+def anchor_key(text: str) -> str:
+    """Normalize an image anchor line the way its block's text was normalized"""
+    text = _clean_line(text)
+    match = LIST_MARKER_RE.match(text)
+    return text[match.end():] if match else text
+
+
+def escape_markup(text: str) -> str:
+    """Escape text for HTML and ReportLab paragraph markup"""
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
@@ -0,0 +1,134 @@
+"""
+Page store that keeps recent pages in memory and spills older ones to disk
+
+Scraped pages are appended in crawl order. Once the in-memory pages exceed
+the configured memory limit the oldest ones are moved to an append-only
+SQLite file in TEMP_DIR, so very large crawls run in a fixed memory budget.
+Iteration streams pages back in crawl order from disk and memory.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import uuid
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Import config settings
+try:
+    from .config import TEMP_DIR, PAGE_STORE_MEMORY_LIMIT
+except ImportError:
+    try:
+        from config import TEMP_DIR, PAGE_STORE_MEMORY_LIMIT
+    except ImportError:
+        TEMP_DIR = "temp"  # Fallback if config import fails
+        PAGE_STORE_MEMORY_LIMIT = 32 * 1024 * 1024
+
+PAGE_STORE_PREFIX = 'page_store_'
+READ_BATCH_SIZE = 256
+MMAP_SIZE = 256 * 1024 * 1024  # Let SQLite memory-map the spill file for reads
+
+
+def _page_size(page: Dict) -> int:
+    """Approximate in-memory size of a page (text fields dominate)"""
+    size = sum(len(value) for value in page.values() if isinstance(value, str))
+    if 'blocks' in page:
+        size += len(page.get('content', ''))  # Normalized blocks hold about the same text again
+    return size
+
+
+class PageStore:
+    """Append-only, order-preserving collection of scraped pages
+
+    Behaves like a read-only sequence for the renderers: ``len(store)``,
+    truthiness and repeated iteration are supported. Only JSON-serialisable
+    page fields are kept.
+    """
+
+    def __init__(self, memory_limit: int = PAGE_STORE_MEMORY_LIMIT, directory: str = TEMP_DIR):
+        self.memory_limit = memory_limit
+        self.directory = directory
+        self.path: Optional[str] = None
+        self._db: Optional[sqlite3.Connection] = None
+        self._memory: "OrderedDict[int, Dict]" = OrderedDict()
+        self._memory_bytes = 0
+        self._count = 0
+        self.spilled = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __bool__(self) -> bool:
+        return self._count > 0
+
+    def append(self, page: Dict):
+        """Add a page, spilling the oldest in-memory pages if over the limit"""
+        seq = self._count
+        self._count += 1
+        self._memory[seq] = page
+        self._memory_bytes += _page_size(page)
+
+        # Always keep the newest page in memory
+        while self._memory_bytes > self.memory_limit and len(self._memory) > 1:
+            self._spill_oldest()
+
+    def _open(self) -> sqlite3.Connection:
+        if self._db is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self.path = os.path.join(self.directory, f"{PAGE_STORE_PREFIX}{uuid.uuid4().hex}.sqlite")
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=OFF')
+            self._db.execute('PRAGMA synchronous=OFF')
+            self._db.execute(f'PRAGMA mmap_size={MMAP_SIZE}')
+            self._db.execute('CREATE TABLE pages (seq INTEGER PRIMARY KEY, data TEXT NOT NULL)')
+            logger.info(f"Page store spilling to {self.path}")
+        return self._db
+
+    def _spill_oldest(self):
+        seq, page = self._memory.popitem(last=False)
+        self._memory_bytes -= _page_size(page)
+        db = self._open()
+        db.execute('INSERT INTO pages (seq, data) VALUES (?, ?)', (seq, json.dumps(page)))
+        self.spilled += 1
+        if self.spilled % READ_BATCH_SIZE == 0:
+            db.commit()
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Stream pages in crawl order, reading spilled pages in batches"""
+        total = self._count
+        seq = 0
+        while seq < total:
+            page = self._memory.get(seq)
+            if page is not None:
+                yield page
+                seq += 1
+                continue
+
+            rows = self._db.execute(
+                'SELECT seq, data FROM pages WHERE seq >= ? AND seq < ? ORDER BY seq LIMIT ?',
+                (seq, total, READ_BATCH_SIZE)
+            ).fetchall()
+            if not rows or rows[0][0] != seq:
+                raise KeyError(f"Page {seq} missing from page store")
+            for row_seq, data in rows:
+                if row_seq != seq:
+                    break
+                yield json.loads(data)
+                seq += 1
+
+    def close(self):
+        """Release memory and delete the spill file"""
+        self._memory.clear()
+        self._memory_bytes = 0
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        if self.path and os.path.exists(self.path):
+            try:
+                os.remove(self.path)
+            except OSError as e:
+                logger.warning(f"Could not remove page store {self.path}: {e}")
+        self.path = None
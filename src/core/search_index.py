@@ -0,0 +1,154 @@
+"""
+Full-text search index over downloaded documentation
+
+Every scraped page is added to an on-disk SQLite FTS5 index as it arrives,
+keyed by page URL and job, so the whole archive of crawls can be searched
+with ranked page-level hits instead of grepping generated files.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Import config settings
+try:
+    from .config import SEARCH_INDEX_ENABLED, SEARCH_INDEX_FILE
+except ImportError:
+    try:
+        from config import SEARCH_INDEX_ENABLED, SEARCH_INDEX_FILE
+    except ImportError:
+        # Fallback if config import fails
+        SEARCH_INDEX_ENABLED = True
+        SEARCH_INDEX_FILE = os.path.join("cache", "search_index.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    indexed_at REAL NOT NULL,
+    UNIQUE (url, job_id)
+);
+CREATE INDEX IF NOT EXISTS documents_job ON documents (job_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, content, tokenize = 'porter unicode61'
+);
+"""
+
+# bm25() column weights: a title hit counts more than a body hit
+TITLE_WEIGHT = 5.0
+CONTENT_WEIGHT = 1.0
+
+
+def _quote_query(query: str) -> str:
+    """Turn free text into an FTS5 query of quoted terms (all must match)"""
+    terms = [term.replace('"', '""') for term in query.split()]
+    return ' '.join(f'"{term}"' for term in terms if term)
+
+
+class SearchIndex:
+    """SQLite FTS5 index of scraped pages"""
+
+    def __init__(self, path: str = SEARCH_INDEX_FILE):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(SCHEMA)
+
+    def add_page(self, job_id: str, page: Dict):
+        """Index (or re-index) a page for a job"""
+        url = page['url']
+        title = page.get('title', '')
+        content = page.get('content', '')
+        db = self._db
+
+        row = db.execute('SELECT id FROM documents WHERE url = ? AND job_id = ?', (url, job_id)).fetchone()
+        if row:
+            doc_id = row[0]
+            db.execute('UPDATE documents SET title = ?, indexed_at = ? WHERE id = ?', (title, time.time(), doc_id))
+            db.execute('DELETE FROM documents_fts WHERE rowid = ?', (doc_id,))
+        else:
+            cursor = db.execute(
+                'INSERT INTO documents (url, job_id, title, indexed_at) VALUES (?, ?, ?, ?)',
+                (url, job_id, title, time.time())
+            )
+            doc_id = cursor.lastrowid
+        db.execute('INSERT INTO documents_fts (rowid, title, content) VALUES (?, ?, ?)', (doc_id, title, content))
+        db.commit()
+
+    def search(self, query: str, limit: int = 20, offset: int = 0, job_id: Optional[str] = None) -> List[Dict]:
+        """Return ranked page-level hits for a query
+
+        The query may use FTS5 syntax (phrases, OR, prefix*); if it does not
+        parse, it is retried as plain terms that must all match.
+        """
+        try:
+            return self._search(query, limit, offset, job_id)
+        except sqlite3.OperationalError:
+            quoted = _quote_query(query)
+            if not quoted:
+                return []
+            return self._search(quoted, limit, offset, job_id)
+
+    def _search(self, match: str, limit: int, offset: int, job_id: Optional[str]) -> List[Dict]:
+        sql = (
+            'SELECT d.url, d.title, d.job_id, d.indexed_at, '
+            "snippet(documents_fts, 1, '[', ']', ' … ', 24), "
+            f'bm25(documents_fts, {TITLE_WEIGHT}, {CONTENT_WEIGHT}) AS rank '
+            'FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid '
+            'WHERE documents_fts MATCH ?'
+        )
+        params: list = [match]
+        if job_id:
+            sql += ' AND d.job_id = ?'
+            params.append(job_id)
+        sql += ' ORDER BY rank LIMIT ? OFFSET ?'
+        params.extend([limit, offset])
+
+        return [
+            {
+                'url': url,
+                'title': title,
+                'job_id': job,
+                'indexed_at': indexed_at,
+                'snippet': snippet,
+                'score': round(-rank, 4),  # bm25() is lower-is-better
+            }
+            for url, title, job, indexed_at, snippet, rank in self._db.execute(sql, params)
+        ]
+
+    def prune(self, older_than: float) -> int:
+        """Drop pages indexed before a timestamp; returns the number removed"""
+        db = self._db
+        db.execute('DELETE FROM documents_fts WHERE rowid IN (SELECT id FROM documents WHERE indexed_at < ?)',
+                   (older_than,))
+        removed = db.execute('DELETE FROM documents WHERE indexed_at < ?', (older_than,)).rowcount
+        db.commit()
+        return removed
+
+    def close(self):
+        self._db.close()
+
+
+_index: Optional[SearchIndex] = None
+
+
+def get_search_index() -> Optional[SearchIndex]:
+    """Process-wide search index, or None if disabled or FTS5 is unavailable"""
+    global _index
+    if _index is None and SEARCH_INDEX_ENABLED:
+        try:
+            _index = SearchIndex()
+        except sqlite3.Error as e:
+            logger.warning(f"Search index unavailable: {e}")
+            return None
+    return _index
@@ -0,0 +1,374 @@
+"""
+Structured-data fast path for JavaScript documentation frameworks
+
+Many documentation sites publish their pages in a much lighter form than
+the rendered HTML shell: an ``llms.txt`` manifest linking a Markdown
+version of each page (Mintlify serves ``<page>.md`` for every page), or,
+for Next.js sites with static props, the page's data as JSON under
+``/_next/data/<buildId>/``. Once a site is recognized, its pages are
+fetched in that form instead of as HTML, skipping navigation chrome and
+most of the parsing. A page whose payload is missing or unusable is
+fetched as HTML as before, and a site whose payloads keep failing is
+crawled as HTML only.
+
+Docusaurus and VitePress are recognized too; they take the fast path when
+their llms.txt plugins publish a manifest.
+"""
+
+import abc
+import json
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+logger = logging.getLogger(__name__)
+
+# Import config settings
+try:
+    from .config import FAST_PATH_MAX_MISSES
+except ImportError:
+    try:
+        from config import FAST_PATH_MAX_MISSES
+    except ImportError:
+        FAST_PATH_MAX_MISSES = 3  # Fallback if config import fails
+
+GENERATOR_FRAMEWORKS = ('docusaurus', 'vitepress', 'mintlify', 'nextra')
+MARKDOWN_ALTERNATE_FRAMEWORKS = ('mintlify',)  # Serve every page as Markdown at <page>.md
+MINTLIFY_ASSET_RE = re.compile(r'mintlify|mintcdn\.com')
+NEXT_STATIC_RE = re.compile(r'/_next/static/')
+MARKDOWN_SUFFIXES = ('.md', '.mdx')
+
+LLMS_LINK_RE = re.compile(r'^\s*[-*+]\s*\[([^\]]+)\]\(\s*<?([^)\s>]+)>?[^)]*\)', re.M)
+
+# Payload bodies: the longest string in a page's JSON that looks like HTML or Markdown
+MIN_BODY_CHARS = 200
+MAX_TITLE_CHARS = 200
+HTML_BODY_RE = re.compile(r'<(?:p|h[1-6]|ul|ol|pre|table|section|article|div)[\s>]', re.I)
+MARKDOWN_BODY_RE = re.compile(r'^(?:#{1,6} |```|[-*] |\d+\. )', re.M)
+COMPILED_CODE_HINTS = ('_createMdxContent', 'jsxRuntime', '"use strict"')
+
+FRONTMATTER_RE = re.compile(r'\A\ufeff?---\s*\n(.*?)\n---\s*\n', re.S)
+FRONTMATTER_TITLE_RE = re.compile(r'^title:\s*["\']?(.*?)["\']?\s*$', re.M)
+FENCE_RE = re.compile(r'^\s*(```|~~~)')
+HEADING_RE = re.compile(r'^(#{1,6})\s+(.*?)(?:\s+#+)?\s*$')
+IMAGE_RE = re.compile(r'!\[([^\]]*)\]\(\s*<?([^)\s>]+)>?(?:\s+"[^"]*")?\s*\)')
+LINK_RE = re.compile(r'(?<!!)\[([^\]]*)\]\(\s*<?([^)\s>]+)>?(?:\s+"[^"]*")?\s*\)')
+TAG_RE = re.compile(r'</?[A-Za-z][^<>]*>')
+COMPONENT_TAG_RE = re.compile(r'</?[A-Z][A-Za-z0-9.]*(?:\s[^<>]*)?/?>')  # MDX components such as <Note>
+EMPHASIS_RE = re.compile(r'(\*\*|__|~~|`)(.+?)\1|(?<!\w)[*_](?=\S)(.+?)(?<=\S)[*_](?!\w)')
+LIST_ITEM_RE = re.compile(r'^\s*[-*+]\s+')
+ORDERED_ITEM_RE = re.compile(r'^\s*(\d{1,3})[.)]\s+')
+TABLE_RULE_RE = re.compile(r'^\s*\|?\s*:?-{3,}:?\s*(?:\|\s*:?-{3,}:?\s*)*\|?\s*$')
+
+
+def detect_framework(soup) -> Optional[str]:
+    """Name of the documentation framework that rendered a page, if recognized"""
+    generator = soup.find('meta', attrs={'name': 'generator'})
+    content = (generator.get('content') or '').lower() if generator else ''
+    for framework in GENERATOR_FRAMEWORKS:
+        if framework in content:
+            return framework
+    if soup.find(['script', 'link'], src=MINTLIFY_ASSET_RE) or soup.find('link', href=MINTLIFY_ASSET_RE):
+        return 'mintlify'
+    if soup.find('script', id='__NEXT_DATA__') or soup.find('script', src=NEXT_STATIC_RE):
+        return 'nextjs'
+    return None
+
+
+def canonical_page_url(url: str) -> str:
+    """Page URL for a Markdown alternate (``/guide/setup.md`` -> ``/guide/setup``)"""
+    parsed = urlparse(url)
+    path = parsed.path
+    for suffix in MARKDOWN_SUFFIXES:
+        if path.lower().endswith(suffix):
+            path = path[:-len(suffix)]
+            if path.endswith('/index'):
+                path = path[:-len('index')]
+            break
+    return parsed._replace(path=path, fragment='').geturl()
+
+
+def parse_llms_txt(text: str, manifest_url: str) -> List[Tuple[str, str]]:
+    """(absolute URL, title) of the pages linked from an llms.txt manifest
+
+    A manifest must start with a Markdown H1, which also rejects HTML
+    pages served with status 200 for missing files.
+    """
+    if not text.lstrip('\ufeff \t\r\n').startswith('# '):
+        return []
+    entries = []
+    for match in LLMS_LINK_RE.finditer(text):
+        title, href = match.group(1).strip(), match.group(2)
+        entries.append((urljoin(manifest_url, href).split('#')[0], title))
+    return entries
+
+
+def _find_title(data) -> Optional[str]:
+    """Shallowest short string under a 'title' key"""
+    level = [data]
+    for _ in range(4):
+        next_level = []
+        for value in level:
+            if isinstance(value, dict):
+                title = value.get('title')
+                if isinstance(title, str) and 0 < len(title.strip()) <= MAX_TITLE_CHARS:
+                    return title.strip()
+                next_level.extend(value.values())
+            elif isinstance(value, list):
+                next_level.extend(value)
+        level = next_level
+    return None
+
+
+def _find_body(data) -> Optional[Tuple[str, str]]:
+    """('html'|'markdown', text) of the longest string in a JSON document that looks like page content"""
+    best = None
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+        elif isinstance(value, str) and len(value) >= MIN_BODY_CHARS:
+            if best and len(value) <= len(best[1]):
+                continue
+            if any(hint in value for hint in COMPILED_CODE_HINTS):
+                continue
+            if HTML_BODY_RE.search(value):
+                best = ('html', value)
+            elif '\n\n' in value and MARKDOWN_BODY_RE.search(value):
+                best = ('markdown', value)
+    return best
+
+
+class StructuredSource(abc.ABC):
+    """A site's lighter per-page payloads, used until they keep failing"""
+
+    name = 'structured'
+
+    def __init__(self, max_misses: int = FAST_PATH_MAX_MISSES):
+        self.max_misses = max_misses
+        self.misses = 0  # Consecutive pages without a usable payload
+        self.hits = 0
+
+    @property
+    def active(self) -> bool:
+        return self.misses < self.max_misses
+
+    @abc.abstractmethod
+    def payload_url(self, url: str) -> Optional[str]:
+        """URL of a page's payload, or None to fetch its HTML"""
+
+    @abc.abstractmethod
+    def parse(self, url: str, text: str) -> Optional[Dict]:
+        """{'title': ..., 'markdown' or 'html': ...} from a payload, or None if unusable"""
+
+    def record(self, url: str, hit: bool):
+        if hit:
+            self.hits += 1
+            self.misses = 0
+        else:
+            self.misses += 1
+            if not self.active:
+                logger.info(f"{self.name} payloads keep failing, falling back to HTML")
+
+
+class MarkdownAlternates(StructuredSource):
+    """Markdown versions of pages, listed in llms.txt or at ``<page>.md``"""
+
+    def __init__(self, framework: str, alternates: Optional[Dict[str, str]] = None,
+                 titles: Optional[Dict[str, str]] = None, guess: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.name = f"{framework} Markdown"
+        self.alternates = alternates or {}  # Page URL -> Markdown URL from the manifest
+        self.titles = titles or {}
+        self.guess = guess  # Try <page>.md for pages not in the manifest
+
+    @property
+    def active(self) -> bool:
+        # Listed pages count as misses too, so a stale manifest is given up on like failing guesses
+        return super().active and (bool(self.alternates) or self.guess)
+
+    def payload_url(self, url: str) -> Optional[str]:
+        listed = self.alternates.get(url)
+        if listed:
+            return listed
+        path = urlparse(url).path
+        if self.guess and path and not path.endswith('/') and not path.lower().endswith(MARKDOWN_SUFFIXES):
+            return url + '.md'
+        return None
+
+    def parse(self, url: str, text: str) -> Optional[Dict]:
+        text = text.strip()
+        if not text or text.startswith('<'):
+            return None  # Empty, or an HTML page served for a missing file
+        return {'title': self.titles.get(url), 'markdown': text}
+
+
+class NextDataSource(StructuredSource):
+    """Page props of a Next.js site from its ``/_next/data/<buildId>/<path>.json`` routes"""
+
+    name = 'Next.js page data'
+
+    def __init__(self, origin: str, base_path: str, build_id: str, **kwargs):
+        super().__init__(**kwargs)
+        self.origin = origin
+        self.base_path = base_path
+        self.build_id = build_id
+
+    @classmethod
+    def from_soup(cls, soup, url: str) -> Optional['NextDataSource']:
+        """Source for a page's site, if it embeds ``__NEXT_DATA__`` for statically rendered props"""
+        script = soup.find('script', id='__NEXT_DATA__')
+        if script is None or not script.string:
+            return None
+        try:
+            data = json.loads(script.string)
+        except ValueError:
+            return None
+        build_id = data.get('buildId')
+        if not isinstance(build_id, str) or not (data.get('gsp') or data.get('gssp')):
+            return None  # Data routes only exist for pages with getStaticProps/getServerSideProps
+
+        parsed = urlparse(url)
+        base_path = ''
+        asset = soup.find('script', src=NEXT_STATIC_RE)
+        if asset is not None:
+            asset_url = urlparse(urljoin(url, asset['src']))
+            if asset_url.netloc == parsed.netloc:
+                base_path = asset_url.path.split('/_next/static/')[0]
+        return cls(f"{parsed.scheme}://{parsed.netloc}", base_path, build_id)
+
+    def payload_url(self, url: str) -> Optional[str]:
+        path = urlparse(url).path
+        if self.base_path and path.startswith(self.base_path):
+            path = path[len(self.base_path):]
+        path = path.rstrip('/') or '/index'
+        return f"{self.origin}{self.base_path}/_next/data/{self.build_id}{path}.json"
+
+    def parse(self, url: str, text: str) -> Optional[Dict]:
+        try:
+            props = json.loads(text).get('pageProps')
+        except (ValueError, AttributeError):
+            return None
+        if not isinstance(props, dict) or '__N_REDIRECT' in props:
+            return None
+        body = _find_body(props)
+        if body is None:
+            return None
+        kind, content = body
+        return {'title': _find_title(props), kind: content}
+
+
+def _strip_frontmatter(markdown: str) -> Tuple[str, Optional[str]]:
+    match = FRONTMATTER_RE.match(markdown)
+    if not match:
+        return markdown, None
+    title = FRONTMATTER_TITLE_RE.search(match.group(1))
+    return markdown[match.end():], title.group(1).strip() if title else None
+
+
+def _inline_text(line: str) -> str:
+    line = LINK_RE.sub(lambda m: m.group(1), line)
+    line = TAG_RE.sub('', line)
+    return EMPHASIS_RE.sub(lambda m: m.group(2) or m.group(3), line)
+
+
+def markdown_title(markdown: str) -> Optional[str]:
+    """Frontmatter title or first level-1 heading of a Markdown page"""
+    body, title = _strip_frontmatter(markdown)
+    if title:
+        return title
+    for line in body.split('\n'):
+        match = HEADING_RE.match(line)
+        if match and len(match.group(1)) == 1:
+            return ' '.join(_inline_text(match.group(2)).split())
+    return None
+
+
+def markdown_to_text(markdown: str, url: str,
+                     image_placeholder: Optional[str] = None) -> Tuple[str, List[List], List[Dict], List[str]]:
+    """Plain text of a Markdown page in the scraper's extracted-text shape
+
+    Returns (text, headings, images, links): blocks separated by blank
+    lines with list items marked as in HTML extraction, [level, text]
+    headings, {'src', 'alt'} images (replaced by ``image_placeholder``
+    when given, dropped otherwise) and absolute link targets.
+    """
+    body, _ = _strip_frontmatter(markdown)
+    headings, images, links = [], [], []
+
+    def image(match):
+        if image_placeholder is None:
+            return ''
+        images.append({'src': urljoin(url, match.group(2)), 'alt': match.group(1).strip()})
+        return image_placeholder.format(len(images) - 1)
+
+    lines = []
+    in_fence = False
+    for line in body.split('\n'):
+        if FENCE_RE.match(line):
+            in_fence = not in_fence
+            lines.append('')  # A code block is a block of its own
+            continue
+        if in_fence:
+            lines.append(line)
+            continue
+
+        heading = HEADING_RE.match(line)
+        if heading:
+            text = ' '.join(_inline_text(heading.group(2)).split())
+            if text:
+                headings.append([len(heading.group(1)), text])
+                lines.extend(['', text, ''])
+            continue
+        if TABLE_RULE_RE.match(line):
+            continue
+
+        for match in LINK_RE.finditer(line):
+            href = match.group(2)
+            if not href.startswith(('#', 'mailto:')):
+                links.append(urljoin(url, href).split('#')[0])
+        line = IMAGE_RE.sub(image, line)
+        line = re.sub(r'^\s*(?:>\s?)+', '', line)
+        if line.lstrip().startswith('|'):
+            line = ' | '.join(cell.strip() for cell in line.strip().strip('|').split('|'))
+        line = LIST_ITEM_RE.sub('• ', line)
+        line = ORDERED_ITEM_RE.sub(lambda m: f"{m.group(1)}. ", line)
+        lines.append(_inline_text(line).rstrip())
+
+    text = '\n'.join(lines)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text.strip(), headings, images, links
+
+
+def _link_target(url: str, href: str) -> str:
+    """Absolute link target, pointing same-site Markdown alternates at their pages"""
+    target = urljoin(url, href)
+    if urlparse(target).netloc == urlparse(url).netloc:
+        return canonical_page_url(target) + ('#' + target.split('#', 1)[1] if '#' in target else '')
+    return target
+
+
+def prepare_markdown(markdown: str, url: str, keep_images: bool = False) -> str:
+    """A Markdown page as a document section: absolute link targets, no
+    frontmatter or MDX component tags, images only if kept (headings are
+    nested by the caller)
+    """
+    body, _ = _strip_frontmatter(markdown)
+    lines = []
+    in_fence = False
+    for line in body.split('\n'):
+        if FENCE_RE.match(line):
+            in_fence = not in_fence
+        elif not in_fence:
+            if keep_images:
+                line = IMAGE_RE.sub(lambda m: f"![{m.group(1)}]({urljoin(url, m.group(2))})", line)
+            else:
+                line = IMAGE_RE.sub('', line)
+            line = LINK_RE.sub(lambda m: f"[{m.group(1)}]({_link_target(url, m.group(2))})", line)
+            line = COMPONENT_TAG_RE.sub('', line)
+        lines.append(line)
+    return '\n'.join(lines).strip()
@@ -0,0 +1,231 @@
+"""
+WARC recording and offline replay of crawls
+
+Every response fetched during a crawl can be written to a gzip-compressed
+WARC 1.1 file (one gzip member per record, as read by standard WARC tools).
+A recorded crawl can then be replayed from the archive without network
+access, so extraction and rendering changes can be reproduced and
+benchmarked deterministically.
+
+Bodies are stored as decoded by requests, so Content-Encoding and
+Transfer-Encoding headers are dropped and Content-Length is rewritten.
+"""
+
+import base64
+import hashlib
+import logging
+import os
+import threading
+import uuid
+import zlib
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+from urllib.parse import urljoin
+
+if TYPE_CHECKING:
+    import requests
+
+try:
+    from .version import __version__
+except ImportError:
+    from version import __version__
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK = 64 * 1024
+MAX_REPLAY_REDIRECTS = 10
+DROPPED_HEADERS = ('content-encoding', 'transfer-encoding', 'content-length')
+
+
+class ArchiveMiss(LookupError):
+    """Raised in replay mode for a URL the archive has no response for"""
+
+
+def _warc_date() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _http_block(response: 'requests.Response') -> bytes:
+    """Serialize a response as an HTTP/1.1 message with its decoded body"""
+    body = response.content or b''
+    lines = [f"HTTP/1.1 {response.status_code} {response.reason or ''}".rstrip()]
+    for name, value in response.headers.items():
+        if name.lower() not in DROPPED_HEADERS:
+            lines.append(f"{name}: {value}")
+    lines.append(f"Content-Length: {len(body)}")
+    head = ('\r\n'.join(lines) + '\r\n\r\n').encode('iso-8859-1', errors='replace')
+    return head + body
+
+
+class WarcWriter:
+    """Appends response records to a .warc.gz file (thread-safe)"""
+
+    def __init__(self, path: str, start_url: Optional[str] = None):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'ab')
+        self._lock = threading.Lock()
+        self.records = 0
+        info = f"software: documentation-downloader/{__version__}\r\nformat: WARC File Format 1.1\r\n"
+        if start_url:
+            info += f"start-url: {start_url}\r\n"
+        self._write('warcinfo', None, 'application/warc-fields', info.encode('utf-8'))
+
+    def _write(self, warc_type: str, target_uri: Optional[str], content_type: str, block: bytes,
+               extra_headers: Optional[Dict[str, str]] = None):
+        headers = [
+            ('WARC-Type', warc_type),
+            ('WARC-Record-ID', f"<urn:uuid:{uuid.uuid4()}>"),
+            ('WARC-Date', _warc_date()),
+        ]
+        if target_uri:
+            headers.append(('WARC-Target-URI', target_uri))
+        headers.extend((extra_headers or {}).items())
+        headers.append(('Content-Type', content_type))
+        headers.append(('Content-Length', str(len(block))))
+        head = 'WARC/1.1\r\n' + ''.join(f"{name}: {value}\r\n" for name, value in headers) + '\r\n'
+
+        # One gzip member per record, so records can be read individually by offset
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        data = compressor.compress(head.encode('utf-8')) + compressor.compress(block)
+        data += compressor.compress(b'\r\n\r\n') + compressor.flush()
+        with self._lock:
+            self._file.write(data)
+            self.records += 1
+
+    def write_response(self, response: 'requests.Response'):
+        """Record a response, including any redirects that led to it"""
+        for hop in list(response.history) + [response]:
+            block = _http_block(hop)
+            body = hop.content or b''
+            digest = base64.b32encode(hashlib.sha1(body).digest()).decode('ascii')
+            self._write('response', hop.url, 'application/http;msgtype=response', block,
+                        {'WARC-Payload-Digest': f"sha1:{digest}"})
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def iter_records(path: str) -> Iterator[Tuple[int, Dict[str, str], bytes]]:
+    """Yield (file offset, WARC headers, block) for every record of a .warc.gz file"""
+    with open(path, 'rb') as f:
+        offset = 0
+        pending = b''
+        while True:
+            data = pending or f.read(READ_CHUNK)
+            if not data:
+                return
+            start = offset
+            decompressor = zlib.decompressobj(31)
+            parts = []
+            while True:
+                parts.append(decompressor.decompress(data))
+                if decompressor.eof:
+                    pending = decompressor.unused_data
+                    offset += len(data) - len(pending)
+                    break
+                offset += len(data)
+                data = f.read(READ_CHUNK)
+                if not data:
+                    raise ValueError(f"Truncated WARC record at offset {start} in {path}")
+            headers, block = _parse_record(b''.join(parts))
+            yield start, headers, block
+
+
+def _parse_record(record: bytes) -> Tuple[Dict[str, str], bytes]:
+    head, _, rest = record.partition(b'\r\n\r\n')
+    headers = {}
+    for line in head.decode('utf-8', errors='replace').split('\r\n')[1:]:
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get('content-length', len(rest)))
+    return headers, rest[:length]
+
+
+def _parse_http(block: bytes) -> Tuple[int, str, List[Tuple[str, str]], bytes]:
+    head, _, body = block.partition(b'\r\n\r\n')
+    lines = head.decode('iso-8859-1').split('\r\n')
+    parts = lines[0].split(' ', 2)
+    status = int(parts[1])
+    reason = parts[2] if len(parts) > 2 else ''
+    headers = []
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        headers.append((name.strip(), value.strip()))
+    return status, reason, headers, body
+
+
+class WarcArchive:
+    """Serves recorded responses from a .warc.gz file, without network access"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.start_url: Optional[str] = None
+        self._offsets: Dict[str, int] = {}  # url -> offset of its latest response record
+        for offset, headers, block in iter_records(path):
+            warc_type = headers.get('warc-type')
+            if warc_type == 'response' and 'warc-target-uri' in headers:
+                self._offsets[headers['warc-target-uri']] = offset
+            elif warc_type == 'warcinfo' and self.start_url is None:
+                for line in block.decode('utf-8', errors='replace').split('\r\n'):
+                    if line.startswith('start-url:'):
+                        self.start_url = line.split(':', 1)[1].strip()
+        self._lock = threading.Lock()
+        self._file = open(path, 'rb')
+        logger.info(f"Replaying {len(self._offsets)} recorded responses from {path}")
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._offsets
+
+    def _read_record(self, offset: int) -> bytes:
+        decompressor = zlib.decompressobj(31)
+        parts = []
+        with self._lock:
+            self._file.seek(offset)
+            while not decompressor.eof:
+                data = self._file.read(READ_CHUNK)
+                if not data:
+                    break
+                parts.append(decompressor.decompress(data))
+        return _parse_record(b''.join(parts))[1]
+
+    def _build_response(self, url: str) -> 'requests.Response':
+        import requests
+        from requests.structures import CaseInsensitiveDict
+        from requests.utils import get_encoding_from_headers
+
+        offset = self._offsets.get(url)
+        if offset is None:
+            # Recorded URLs are as requests prepared them (e.g. with a trailing slash on bare hosts)
+            offset = self._offsets.get(requests.Request('GET', url).prepare().url)
+        if offset is None:
+            raise ArchiveMiss(f"No recorded response for {url}")
+        status, reason, headers, body = _parse_http(self._read_record(offset))
+
+        response = requests.Response()
+        response.status_code = status
+        response.reason = reason
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = body
+        response.url = url
+        response.encoding = get_encoding_from_headers(response.headers)
+        return response
+
+    def get(self, url: str) -> 'requests.Response':
+        """Recorded response for a URL, following recorded redirects like requests does"""
+        history = []
+        response = self._build_response(url)
+        while response.is_redirect and len(history) < MAX_REPLAY_REDIRECTS:
+            history.append(response)
+            response = self._build_response(urljoin(response.url, response.headers['location']))
+        response.history = history
+        return response
+
+    def close(self):
+        self._file.close()
@@ -1,23 +1,64 @@
 from fastapi import FastAPI, Request, Form, HTTPException, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, StreamingResponse, Response
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-import aiofiles
+from contextlib import asynccontextmanager
 import asyncio
+import logging
 import os
-import shutil
 import json
+import time
 import uuid
 from datetime import datetime
+from email.utils import formatdate
 from pathlib import Path
+from typing import Dict, List, Optional
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from core.doc_scraper import DocumentationScraper
-from core.config import OUTPUT_DIR, USER_DOWNLOADS_DIR, TEMP_DIR, TEMPLATE_DIR
+from core.doc_scraper import DocumentationScraper, OUTPUT_FORMATS
+from core.archive_export import ZipStreamWriter
+from core.config import (
+    OUTPUT_DIR, USER_DOWNLOADS_DIR, TEMP_DIR, TEMPLATE_DIR, PDF_IMAGES, WARC_RECORD, WARC_DIR,
+    CANCEL_ON_DISCONNECT, DISCONNECT_GRACE_SECONDS, WEBSOCKET_PING_SECONDS, JOB_LONG_POLL_MAX_SECONDS,
+    ensure_directories
+)
+from core.search_index import get_search_index
+from core.janitor import StorageJanitor, mark_downloaded
+from core.job_store import FINISHED_STATES, get_job_store
+from core.markdown_convert import shutdown_markdown_converter
+from core.artifacts import (
+    ENCODING_SUFFIXES, RangeNotSatisfiable, publish_artifact, precompress, pick_variant, etag_for,
+    etag_matches, parse_range, iter_file_range
+)
 
-app = FastAPI(title="Documentation Downloader", description="Download and convert documentation to PDF or Markdown")
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown: everything with side effects happens here, not at import"""
+    logging.basicConfig(level=logging.INFO)
+    
+    # Create output directories if they don't exist
+    ensure_directories()
+    os.makedirs(USER_DOWNLOADS_DIR, exist_ok=True)
+    
+    # Retention for temp files, artifacts and caches runs in the background
+    app.state.janitor = StorageJanitor()
+    janitor_task = asyncio.create_task(app.state.janitor.run_forever())
+    
+    # Jobs that were running when the server last stopped can't resume
+    get_job_store().recover()
+    
+    yield
+    
+    janitor_task.cancel()
+    get_job_store().close()
+    shutdown_markdown_converter()
+
+app = FastAPI(title="Documentation Downloader", description="Download and convert documentation to PDF or Markdown",
+              lifespan=lifespan)
 
 # Setup templates and static files
 templates_dir = Path(__file__).parent / "templates"
@@ -25,20 +66,34 @@ static_dir = Path(__file__).parent / "static"
 templates = Jinja2Templates(directory=str(templates_dir))
 app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 
-# Create output directories if they don't exist
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-os.makedirs(USER_DOWNLOADS_DIR, exist_ok=True)
-os.makedirs(TEMP_DIR, exist_ok=True)
-
 # Store active WebSocket connections
 active_connections = {}
 
+# Running download jobs by connection ID, so they can be cancelled
+active_jobs: Dict[str, asyncio.Task] = {}
+
+# Zip archives still being built, by filename, so downloads can stream them as they grow
+live_archives: Dict[str, ZipStreamWriter] = {}
+
 class ProgressTracker:
-    def __init__(self, connection_id: str):
+    def __init__(self, connection_id: str, job_id: Optional[str] = None):
         self.connection_id = connection_id
+        self.job_id = job_id
         self.websocket = active_connections.get(connection_id)
+        self.scraper = None  # Source of the page counters recorded with the job
     
     async def send_progress(self, step: int, total_steps: int, message: str, details: str = ""):
+        if self.job_id:
+            counters = {}
+            if self.scraper:
+                counters = {
+                    "pages": self.scraper.page_count,
+                    "failed_pages": len(self.scraper.failed_urls),
+                    "bytes_downloaded": self.scraper.bytes_downloaded,
+                }
+            get_job_store().update(self.job_id, step=step, total_steps=total_steps, message=message,
+                                   details=details, progress=round((step / total_steps) * 100, 1), **counters)
+        
         websocket = active_connections.get(self.connection_id)
         if websocket:
             try:
@@ -48,13 +103,38 @@ class ProgressTracker:
                     "total_steps": total_steps,
                     "message": message,
                     "details": details,
-                    "progress": round((step / total_steps) * 100, 1)
+                    "progress": round((step / total_steps) * 100, 1),
+                    "sent_at": time.time()  # Lets clients measure delivery latency
                 }
                 await websocket.send_text(json.dumps(progress_data))
                 print(f"Progress sent: Step {step}/{total_steps} - {message}")  # Debug log
             except Exception as e:
                 print(f"Failed to send progress: {e}")  # Debug log
                 pass
+    
+    async def send_artifact(self, output_format: str, filename: Optional[str], error: str = "",
+                            streaming: bool = False):
+        """Report completion (or failure) of one output file of the job
+        
+        ``streaming`` announces a file that can already be downloaded while
+        it is still being written.
+        """
+        artifact = {
+            "format": output_format,
+            "status": "failed" if error else ("streaming" if streaming else "ready"),
+            "filename": filename,
+            "url": f"/download/{filename}" if filename else None,
+            "error": error,
+        }
+        if self.job_id:
+            get_job_store().set_artifact(self.job_id, artifact)
+        
+        websocket = active_connections.get(self.connection_id)
+        if websocket:
+            try:
+                await websocket.send_text(json.dumps({"type": "artifact", **artifact, "sent_at": time.time()}))
+            except Exception as e:
+                logger.warning(f"Failed to send artifact: {e}")
 
 @app.websocket("/ws/{connection_id}")
 async def websocket_endpoint(websocket: WebSocket, connection_id: str):
@@ -65,7 +145,7 @@ async def websocket_endpoint(websocket: WebSocket, connection_id: str):
         while True:
             # Wait for messages or send periodic ping
             try:
-                data = await asyncio.wait_for(websocket.receive_text(), timeout=1.0)
+                data = await asyncio.wait_for(websocket.receive_text(), timeout=WEBSOCKET_PING_SECONDS)
                 # Echo back any received messages
                 await websocket.send_text(json.dumps({"type": "ping", "message": "Connection alive"}))
             except asyncio.TimeoutError:
@@ -76,8 +156,19 @@ async def websocket_endpoint(websocket: WebSocket, connection_id: str):
     except WebSocketDisconnect:
         pass
     finally:
-        if connection_id in active_connections:
+        # A reconnect may already have replaced this socket
+        if active_connections.get(connection_id) is websocket:
             del active_connections[connection_id]
+            if CANCEL_ON_DISCONNECT and connection_id in active_jobs:
+                asyncio.create_task(cancel_after_grace_period(connection_id))
+
+async def cancel_after_grace_period(connection_id: str):
+    """Cancel a job whose client disconnected, unless it reconnects in time"""
+    await asyncio.sleep(DISCONNECT_GRACE_SECONDS)
+    task = active_jobs.get(connection_id)
+    if task and connection_id not in active_connections:
+        logger.info(f"Client {connection_id} did not reconnect, cancelling its job")
+        task.cancel()
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
@@ -88,32 +179,123 @@ async def home(request: Request):
 async def download_documentation(
     request: Request,
     url: str = Form(...),
-    output_format: str = Form(...),
-    connection_id: str = Form(...)
+    output_format: List[str] = Form(...),
+    connection_id: str = Form(...),
+    include_images: bool = Form(PDF_IMAGES)
 ):
-    """Process the documentation URL and generate the requested format"""
+    """Process the documentation URL and generate the requested formats
+    
+    ``output_format`` may be repeated to produce several formats from a
+    single crawl; ``include_images`` embeds page images in the PDF.
+    """
+    
+    invalid = [fmt for fmt in output_format if fmt not in OUTPUT_FORMATS]
+    if invalid or not output_format:
+        raise HTTPException(status_code=400,
+                            detail=f"Invalid output format. Choose from: {', '.join(OUTPUT_FORMATS)}")
+    
+    if connection_id in active_jobs:
+        raise HTTPException(status_code=409, detail="A job is already running for this connection")
+    
+    # Record the job, then start background task for processing
+    job_id = uuid.uuid4().hex
+    jobs = get_job_store()
+    jobs.create(job_id, url, output_format)
+    task = asyncio.create_task(
+        process_documentation_task(url, output_format, connection_id, include_images, job_id)
+    )
+    active_jobs[connection_id] = task
     
-    if output_format not in ["pdf", "markdown"]:
-        raise HTTPException(status_code=400, detail="Invalid output format. Choose 'pdf' or 'markdown'")
+    def job_done(finished: asyncio.Task):
+        active_jobs.pop(connection_id, None)
+        job = jobs.get(job_id)
+        if job and job['state'] not in FINISHED_STATES:  # Cancelled before it started
+            jobs.update(job_id, state='cancelled')
     
-    # Start background task for processing
-    asyncio.create_task(process_documentation_task(url, output_format, connection_id))
+    task.add_done_callback(job_done)
     
-    return {"status": "started", "connection_id": connection_id}
+    return {"status": "started", "connection_id": connection_id, "job_id": job_id,
+            "output_formats": output_format}
 
-async def process_documentation_task(url: str, output_format: str, connection_id: str):
+@app.post("/cancel/{connection_id}")
+async def cancel_job(connection_id: str):
+    """Cancel a running job, stopping its crawl and rendering and removing partial files"""
+    task = active_jobs.get(connection_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="No running job for this connection")
+    task.cancel()
+    return {"status": "cancelling", "connection_id": connection_id}
+
+def log_precompressed(future: asyncio.Future):
+    """Done-callback of a background precompress() run"""
+    if future.cancelled():
+        return
+    if future.exception():
+        logger.warning(f"Precompressing failed: {future.exception()}")
+    elif future.result():
+        logger.info(f"Precompressed {', '.join(os.path.basename(path) for path in future.result())}")
+
+def remove_job_files(paths: List[str]):
+    """Delete the files a cancelled job recorded creating (partial outputs, variants, Downloads copies)"""
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove {path}: {e}")
+
+async def process_documentation_task(url: str, output_formats: List[str], connection_id: str,
+                                     include_images: bool = PDF_IMAGES, job_id: Optional[str] = None):
     """Background task to process documentation"""
     
     # Initialize progress tracker
-    progress = ProgressTracker(connection_id)
+    job_id = job_id or uuid.uuid4().hex
+    progress = ProgressTracker(connection_id, job_id)
+    jobs = get_job_store()
+    scraper = None
+    base_filename = None
+    job_files: List[str] = []  # Everything this job writes, removed again if it is cancelled
+    pending_writes: List[asyncio.Future] = []  # Threads writing job_files, which cancelling can't stop
+    started = time.time()
     
     try:
+        jobs.update(job_id, state='running', started_at=started)
+        
         # Step 1: Initialize
         await progress.send_progress(1, 7, "🚀 Starting documentation download", f"Initializing scraper for {url}")
         await asyncio.sleep(0.5)  # Small delay to ensure message is sent
         
-        # Initialize the scraper
-        scraper = DocumentationScraper(url, progress_tracker=progress)
+        # Timestamp for readable filenames, job ID so jobs started in the same second never share one
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base_filename = f"documentation_{timestamp}_{job_id}"
+        
+        # Initialize the scraper, indexing pages for search under the job ID as they are scraped
+        warc_path = os.path.join(WARC_DIR, f"{base_filename}.warc.gz") if WARC_RECORD else None
+        if warc_path:
+            job_files.append(warc_path)
+        scraper = DocumentationScraper(
+            url, progress_tracker=progress,
+            include_images=include_images and 'pdf' in output_formats,
+            warc_path=warc_path,
+            convert_markdown=bool({'markdown', 'zip'} & set(output_formats))
+        )
+        progress.scraper = scraper
+        search_index = get_search_index()
+        if search_index:
+            scraper.page_listeners.append(lambda page: search_index.add_page(job_id, page))
+        # Every renderer output (and the PDF's printable-HTML fallback), whether streamed or rendered at the end
+        job_files.extend(os.path.join(OUTPUT_DIR, base_filename + OUTPUT_FORMATS[fmt][0]) for fmt in output_formats)
+        if 'pdf' in output_formats:
+            job_files.append(os.path.join(OUTPUT_DIR, base_filename + '_printable.html'))
+        if 'jsonl' in output_formats:
+            # Chunked page by page while crawling; announced for download once rendering completes it
+            scraper.stream_jsonl(os.path.join(OUTPUT_DIR, base_filename + '.jsonl'))
+        if 'zip' in output_formats:
+            # Built while crawling; /download streams it to the client as pages are added
+            archive_filename = base_filename + '.zip'
+            live_archives[archive_filename] = scraper.stream_zip(os.path.join(OUTPUT_DIR, archive_filename))
+            await progress.send_artifact('zip', archive_filename, streaming=True)
         
         # Step 2: Begin scraping
         await progress.send_progress(2, 7, "🌐 Visiting the URL", f"Connecting to {url}")
@@ -121,97 +303,219 @@ async def process_documentation_task(url: str, output_format: str, connection_id
         
         # Scrape the documentation (get all available pages)
         pages = await scraper.scrape_documentation()
+        timings = {"crawl_seconds": round(time.time() - started, 3)}
+        jobs.update(job_id, timings=timings)
         
         if not pages:
             await progress.send_progress(7, 7, "❌ No pages found", "Unable to scrape the documentation")
+            jobs.update(job_id, state='failed', error="No pages found")
             return
         
         # Step 4: Processing complete
-        await progress.send_progress(4, 7, "✅ Documentation extracted", f"Successfully extracted {len(pages)} pages")
+        details = f"Successfully extracted {len(pages)} pages"
+        if scraper.boilerplate and scraper.boilerplate.bytes_removed:
+            details += f" ({scraper.boilerplate.bytes_removed // 1024} KB of repeated boilerplate removed)"
+        if scraper.structured_pages:
+            details += f", {scraper.structured_pages} fetched as {scraper.structured_source.name}"
+        await progress.send_progress(4, 7, "✅ Documentation extracted", details)
         await asyncio.sleep(0.5)
         
-        # Generate timestamp for unique filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        base_filename = f"documentation_{timestamp}"
+        # Step 5: Render every requested format from the one crawl
+        await progress.send_progress(5, 7, "📄 Creating output files",
+                                     f"Generating {', '.join(output_formats)} from extracted content")
+        render_started = time.time()
+        filenames = []
+        all_copied = True
+        loop = asyncio.get_event_loop()
         
-        if output_format == "pdf":
-            # Step 5: Creating PDF
-            await progress.send_progress(5, 7, "📄 Creating PDF file", "Generating PDF from extracted content")
-            
-            filename = f"{base_filename}.pdf"
-            file_path = os.path.join(OUTPUT_DIR, filename)
-            await scraper.generate_pdf(pages, file_path, progress)
-            
-            # Copy to user's Downloads folder
-            user_file_path = os.path.join(USER_DOWNLOADS_DIR, filename)
-            try:
-                shutil.copy2(file_path, user_file_path)
-                copy_success = True
-            except Exception as e:
-                copy_success = False
-                print(f"Warning: Could not copy to Downloads folder: {e}")
+        async def deliver(fmt: str, result):
+            """Publish and announce one format as soon as its renderer finishes"""
+            nonlocal all_copied
+            if isinstance(result, Exception):
+                await progress.send_artifact(fmt, None, error=str(result))
+                return
             
-            # Step 6: PDF ready
-            if copy_success:
-                await progress.send_progress(6, 7, "✅ PDF generation complete", f"PDF saved: {filename}")
-                # Step 7: Complete
-                await progress.send_progress(7, 7, "📁 Check your Download folder", 
-                                           f"PDF file {filename} saved to Downloads folder")
-            else:
-                await progress.send_progress(6, 7, "✅ PDF file created", f"File: {filename}")
-                # Step 7: Complete  
-                await progress.send_progress(7, 7, "🎉 Download complete!", 
-                                           f"PDF file {filename} is ready for download")
-        
-        else:  # markdown
-            # Step 5: Creating Markdown
-            await progress.send_progress(5, 7, "📝 Creating Markdown file", "Converting content to Markdown format")
+            filename = os.path.basename(result)
+            filenames.append(filename)
+            job_files.append(result)
+            job_files.extend(result + suffix for suffix in ENCODING_SUFFIXES.values())
+            job_files.append(os.path.join(USER_DOWNLOADS_DIR, filename))  # Before publishing, which may be cancelled
             
-            filename = f"{base_filename}.md"
-            file_path = os.path.join(OUTPUT_DIR, filename)
-            await scraper.generate_markdown(pages, file_path)
+            # Build compressed variants for downloads once, off the event loop
+            compressing = loop.run_in_executor(None, precompress, result)
+            compressing.add_done_callback(log_precompressed)
+            pending_writes.append(compressing)
             
-            # Copy to user's Downloads folder
-            user_file_path = os.path.join(USER_DOWNLOADS_DIR, filename)
+            # Link (or copy) into the user's Downloads folder and run any publish command
+            publishing = asyncio.ensure_future(publish_artifact(result))
+            pending_writes.append(publishing)
             try:
-                shutil.copy2(file_path, user_file_path)
-                copy_success = True
+                all_copied = await asyncio.shield(publishing) is not None and all_copied
             except Exception as e:
-                copy_success = False
-                print(f"Warning: Could not copy to Downloads folder: {e}")
+                all_copied = False
+                logger.warning(f"Could not publish {filename} to the Downloads folder: {e}")
             
-            # Step 6: Markdown ready
-            if copy_success:
-                await progress.send_progress(6, 7, "✅ Markdown processing complete", f"Markdown saved: {filename}")
-                # Step 7: Complete
-                await progress.send_progress(7, 7, "📁 Check your Download folder", 
-                                           f"Markdown file {filename} saved to Downloads folder")
-            else:
-                await progress.send_progress(6, 7, "✅ Markdown processing complete", f"File: {filename}")
-                # Step 7: Complete
-                await progress.send_progress(7, 7, "🎉 Download complete!", 
-                                           f"Markdown file {filename} is ready for download")
+            await progress.send_artifact(fmt, filename)
+        
+        await scraper.generate_outputs(
+            pages, output_formats, os.path.join(OUTPUT_DIR, base_filename), progress, on_result=deliver
+        )
+        timings["render_seconds"] = round(time.time() - render_started, 3)
+        jobs.update(job_id, timings=timings)
+        
+        if not filenames:
+            await progress.send_progress(7, 7, "❌ Error occurred", "No output file could be generated")
+            jobs.update(job_id, state='failed', error="No output file could be generated")
+            return
+        
+        # Step 6: Files ready
+        await progress.send_progress(6, 7, "✅ Output files created", f"Files: {', '.join(filenames)}")
+        
+        # Step 7: Complete
+        if all_copied:
+            await progress.send_progress(7, 7, "📁 Check your Download folder",
+                                         f"{', '.join(filenames)} saved to Downloads folder")
+        else:
+            await progress.send_progress(7, 7, "🎉 Download complete!",
+                                         f"{', '.join(filenames)} ready for download")
+        jobs.update(job_id, state='completed')
+    
+    except asyncio.CancelledError:
+        # Stop work running in threads (PDF build) and drop everything this job produced
+        if scraper:
+            scraper.cancel()
+        await asyncio.gather(*pending_writes, return_exceptions=True)  # So nothing is written after removal
+        remove_job_files(job_files)
+        await progress.send_progress(7, 7, "🛑 Cancelled", "The download was cancelled and partial files removed")
+        jobs.update(job_id, state='cancelled')
+        raise
     
     except Exception as e:
         await progress.send_progress(7, 7, "❌ Error occurred", f"Error processing documentation: {str(e)}")
+        jobs.update(job_id, state='failed', error=str(e))
+    
+    finally:
+        # Release scraped pages (and any spilled page store) once rendering is done
+        if scraper:
+            scraper.close()
+        if base_filename:
+            live_archives.pop(base_filename + '.zip', None)
 
 @app.get("/download/{filename}")
-async def download_file(filename: str):
-    """Download the generated file"""
-    file_path = os.path.join(OUTPUT_DIR, filename)
-    if os.path.exists(file_path):
-        return FileResponse(
-            path=file_path,
-            filename=filename,
-            media_type='application/octet-stream'
+async def download_file(filename: str, request: Request):
+    """Download the generated file
+    
+    A zip archive that is still being built is streamed with chunked
+    transfer encoding until the job completes it. Finished files support
+    If-None-Match, single byte ranges (with If-Range) for resuming, and
+    are sent precompressed when a gzip/zstd variant exists.
+    """
+    archive = live_archives.get(filename)
+    if archive is not None and not archive.finished:
+        return StreamingResponse(
+            archive.follow(),
+            media_type='application/zip',
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
         )
-    else:
+    
+    file_path = os.path.join(OUTPUT_DIR, filename)
+    try:
+        stat = os.stat(file_path)
+    except OSError:
         raise HTTPException(status_code=404, detail="File not found")
+    mark_downloaded(file_path)
+    
+    headers = {
+        'Accept-Ranges': 'bytes',
+        'Content-Disposition': f'attachment; filename="{filename}"',
+        'Last-Modified': formatdate(stat.st_mtime, usegmt=True),
+        'Vary': 'Accept-Encoding',
+    }
+    range_header = request.headers.get('range')
+    if_range = request.headers.get('if-range')
+    if range_header and if_range and if_range.strip() != etag_for(stat):
+        range_header = None  # The file changed since the client's partial download, send it all
+    
+    # Ranges refer to the uncompressed file; whole downloads may use a precompressed variant
+    serve_path, encoding = (file_path, None) if range_header else \
+        pick_variant(file_path, request.headers.get('accept-encoding', ''))
+    headers['ETag'] = etag_for(stat, encoding)
+    
+    if etag_matches(request.headers.get('if-none-match', ''), headers['ETag']):
+        return Response(status_code=304, headers=headers)
+    
+    if range_header:
+        try:
+            byte_range = parse_range(range_header, stat.st_size)
+        except RangeNotSatisfiable:
+            return Response(status_code=416, headers={'Content-Range': f"bytes */{stat.st_size}"})
+        if byte_range:
+            start, end = byte_range
+            headers['Content-Range'] = f"bytes {start}-{end}/{stat.st_size}"
+            headers['Content-Length'] = str(end - start + 1)
+            return StreamingResponse(iter_file_range(file_path, start, end), status_code=206,
+                                     headers=headers, media_type='application/octet-stream')
+    
+    if encoding:
+        headers['Content-Encoding'] = encoding
+        mark_downloaded(serve_path)  # Variants age with their artifact, not independently
+    if 'range' in request.headers:
+        # The range was ignored; FileResponse would still apply it (or reject it) itself
+        size = os.stat(serve_path).st_size if encoding else stat.st_size
+        headers['Content-Length'] = str(size)
+        return StreamingResponse(iter_file_range(serve_path, 0, size - 1), headers=headers,
+                                 media_type='application/octet-stream')
+    return FileResponse(path=serve_path, headers=headers, media_type='application/octet-stream')
+
+@app.get("/jobs")
+async def list_jobs(limit: int = 20, offset: int = 0, state: Optional[str] = None):
+    """Recorded jobs, newest first, optionally only those in one state"""
+    limit = max(1, min(limit, 100))
+    offset = max(offset, 0)
+    jobs = get_job_store()
+    results = jobs.list_jobs(limit=limit, offset=offset, state=state)
+    return {"count": len(results), "total": jobs.count(state), "offset": offset, "jobs": results}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str, wait: float = 0, since: Optional[int] = None):
+    """State, progress, timings and artifacts of one job
+    
+    With ``since`` (the ``version`` of the last response) and ``wait``
+    seconds, the request is held until the job changes, finishes or the
+    wait expires, so clients can follow a job without a WebSocket.
+    """
+    wait = max(0.0, min(wait, JOB_LONG_POLL_MAX_SECONDS))
+    job = await get_job_store().wait(job_id, since if wait else None, wait)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.get("/search")
+async def search(q: str, limit: int = 20, offset: int = 0, job: Optional[str] = None):
+    """Search all downloaded documentation, returning ranked page-level hits
+    
+    ``job`` restricts hits to one crawl, by the ``job_id`` returned from
+    ``POST /download``.
+    """
+    search_index = get_search_index()
+    if search_index is None:
+        raise HTTPException(status_code=503, detail="Search index is not available")
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Query must not be empty")
+    
+    limit = max(1, min(limit, 100))
+    hits = search_index.search(q, limit=limit, offset=max(offset, 0), job_id=job)
+    return {"query": q, "count": len(hits), "results": hits}
 
 @app.get("/status")
 async def status():
-    """Health check endpoint"""
-    return {"status": "healthy", "message": "Documentation Downloader is running"}
+    """Health check endpoint, including disk usage from the last storage sweep"""
+    janitor = getattr(app.state, 'janitor', None)
+    return {
+        "status": "healthy",
+        "message": "Documentation Downloader is running",
+        "storage": janitor.last_report if janitor else None,
+    }
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,36 @@
+"""
+Shared test setup
+
+The packages live in src/ (like the app's own entry points add it to the
+path) and helper scripts in scripts/. Every test runs in its own temporary
+working directory so the relative OUTPUT_DIR, TEMP_DIR and CACHE_DIR never
+touch the checkout.
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+sys.path.insert(1, os.path.join(ROOT_DIR, 'scripts'))  # Offline fixture site of the load test
+
+
+@pytest.fixture(autouse=True)
+def isolated_cwd(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def fixture_site(monkeypatch):
+    """The offline documentation site of scripts/load_test.py, crawled without politeness delay"""
+    from load_test import FixtureSite
+    import core.doc_scraper
+
+    monkeypatch.setattr(core.doc_scraper, 'REQUEST_DELAY', 0.0)
+    site = FixtureSite(pages=5, latency=0)
+    site.start()
+    yield site
+    site.stop()
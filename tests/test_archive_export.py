@@ -0,0 +1,99 @@
+"""Streamed per-page zip archives"""
+
+import asyncio
+import os
+import zipfile
+
+import pytest
+
+import core.archive_export as archive_export
+from core.archive_export import ZipStreamWriter, page_archive_path
+
+
+def render(page):
+    return f"# {page['title']}\n\n{page['content']}\n"
+
+
+def page(url: str, content: str = 'Some text that compresses well. ' * 20) -> dict:
+    return {'url': url, 'title': url.rsplit('/', 1)[-1] or 'Index', 'content': content}
+
+
+def test_archive_paths_mirror_urls():
+    assert page_archive_path('https://docs.test/guide/install.html') == 'docs.test/guide/install.md'
+    assert page_archive_path('https://docs.test/guide/') == 'docs.test/guide/index.md'
+    assert page_archive_path('https://docs.test') == 'docs.test/index.md'
+    assert page_archive_path('https://docs.test/a/../b%3Fc') == 'docs.test/a/_/b_c.md'
+    with_query = page_archive_path('https://docs.test/search?q=1')
+    assert with_query.startswith('docs.test/search_') and with_query != page_archive_path('https://docs.test/search?q=2')
+
+
+def test_closed_archive_is_valid_and_in_crawl_order(tmp_path):
+    path = str(tmp_path / 'out' / 'docs.zip')
+    writer = ZipStreamWriter(path, render, workers=3)
+    urls = [f'https://docs.test/guide/page-{i}' for i in range(20)]
+    for url in urls:
+        writer.add_page(page(url))
+    writer.add_page(page(urls[0], 'Same URL again'))
+    writer.add_file('docs.test/größe.md', os.urandom(256))  # Incompressible, stored as is
+    writer.close()
+
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None
+        names = archive.namelist()
+        assert names == [page_archive_path(url) for url in urls] + \
+            ['docs.test/guide/page-0-2.md', 'docs.test/größe.md']
+        assert archive.read('docs.test/guide/page-0-2.md').decode('utf-8') == "# page-0\n\nSame URL again\n"
+        assert archive.getinfo('docs.test/größe.md').compress_type == zipfile.ZIP_STORED
+        assert archive.getinfo(names[0]).compress_type == zipfile.ZIP_DEFLATED
+    assert writer.entries == 22 and writer.finished
+
+
+def test_zip64_records_when_entry_limit_is_reached(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive_export, 'ZIP32_MAX_ENTRIES', 2)
+    path = str(tmp_path / 'docs.zip')
+    writer = ZipStreamWriter(path, render)
+    for i in range(3):
+        writer.add_page(page(f'https://docs.test/{i}'))
+    writer.close()
+
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None
+        assert len(archive.namelist()) == 3
+
+
+def test_follow_streams_the_finished_archive(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive_export, 'FOLLOW_POLL_SECONDS', 0.01)
+    path = str(tmp_path / 'docs.zip')
+    writer = ZipStreamWriter(path, render)
+
+    async def stream():
+        follower = asyncio.ensure_future(collect(writer.follow(chunk_size=512)))
+        for i in range(10):
+            writer.add_page(page(f'https://docs.test/{i}'))
+            await asyncio.sleep(0.005)
+        await asyncio.get_event_loop().run_in_executor(None, writer.close)
+        return await follower
+
+    streamed = asyncio.run(stream())
+    with open(path, 'rb') as f:
+        assert streamed == f.read()
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None and len(archive.namelist()) == 10
+
+
+def test_aborted_archive_fails_followers(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive_export, 'FOLLOW_POLL_SECONDS', 0.01)
+    path = str(tmp_path / 'docs.zip')
+    writer = ZipStreamWriter(path, render)
+    writer.add_page(page('https://docs.test/a'))
+    writer.abort()
+
+    with pytest.raises(RuntimeError, match='aborted'):
+        asyncio.run(collect(writer.follow()))
+    with pytest.raises(zipfile.BadZipFile):
+        zipfile.ZipFile(path)  # Never given a central directory
+    writer.add_page(page('https://docs.test/b'))  # Ignored once finished
+
+
+async def collect(chunks) -> bytes:
+    return b''.join([chunk async for chunk in chunks])
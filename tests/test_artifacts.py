@@ -0,0 +1,99 @@
+"""Download helpers: byte ranges, ETags and precompressed variants"""
+
+import gzip
+import os
+
+import pytest
+
+from core.artifacts import (
+    RangeNotSatisfiable, accepted_encodings, etag_for, etag_matches, iter_file_range, parse_range,
+    pick_variant, precompress
+)
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('bytes=0-99', (0, 99)),
+    ('bytes=100-', (100, 999)),
+    ('bytes=900-5000', (900, 999)),  # Clamped to the last byte
+    ('bytes=-100', (900, 999)),
+    ('bytes=-5000', (0, 999)),
+    ('bytes=5-5', (5, 5)),
+])
+def test_satisfiable_ranges(header, expected):
+    assert parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize('header', [
+    'bytes=9-3',  # Last byte before the first is invalid, not unsatisfiable
+    'bytes=0-1,5-9',
+    'items=0-9',
+    'bytes=a-b',
+    'bytes=10',
+    'bytes=--3',  # Not a suffix range of -3 bytes
+    'bytes=+1-5',
+    'bytes=-',
+])
+def test_invalid_ranges_are_ignored(header):
+    assert parse_range(header, 1000) is None
+
+
+@pytest.mark.parametrize('header, size', [
+    ('bytes=1000-', 1000),
+    ('bytes=2000-3000', 1000),
+    ('bytes=-0', 1000),
+    ('bytes=-5', 0),  # No byte of an empty file is in any range
+    ('bytes=0-', 0),
+])
+def test_unsatisfiable_ranges(header, size):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range(header, size)
+
+
+def test_file_ranges_are_inclusive(tmp_path):
+    path = tmp_path / 'docs.md'
+    path.write_bytes(bytes(range(256)) * 4)
+    data = b''.join(iter_file_range(str(path), 250, 260, chunk_size=4))
+    assert data == (bytes(range(256)) * 4)[250:261]
+
+
+def test_etags_change_with_the_file_and_encoding(tmp_path):
+    path = tmp_path / 'docs.md'
+    path.write_text('one')
+    first = etag_for(os.stat(path))
+    assert first.startswith('"') and first.endswith('"')
+    assert etag_for(os.stat(path), 'gzip') != first
+
+    path.write_text('two!')
+    assert etag_for(os.stat(path)) != first
+
+    assert etag_matches(first, first)
+    assert etag_matches(f'"other", W/{first}', first)  # Weak comparison for If-None-Match
+    assert etag_matches('*', first)
+    assert not etag_matches('"other"', first)
+
+
+def test_variants_are_served_by_accept_encoding(tmp_path):
+    path = str(tmp_path / 'docs.md')
+    with open(path, 'w') as f:
+        f.write('# Docs\n\n' + 'Compressible text. ' * 200)
+    written = precompress(path, ['gzip'])
+    assert written == [path + '.gz']
+    with gzip.open(path + '.gz', 'rt') as f, open(path) as original:
+        assert f.read() == original.read()
+
+    assert accepted_encodings('gzip;q=1.0, br, zstd;q=0') == ['gzip', 'br']
+    assert pick_variant(path, 'gzip, deflate') == (path + '.gz', 'gzip')
+    assert pick_variant(path, 'zstd') == (path, None)  # No zstd variant was written
+    assert pick_variant(path, 'gzip;q=0') == (path, None)
+    assert pick_variant(path, '') == (path, None)
+
+    # A variant older than its artifact is stale
+    stat = os.stat(path)
+    os.utime(path + '.gz', ns=(stat.st_atime_ns, stat.st_mtime_ns - 10 ** 9))
+    assert pick_variant(path, 'gzip') == (path, None)
+
+
+def test_only_text_artifacts_are_precompressed(tmp_path):
+    path = tmp_path / 'docs.pdf'
+    path.write_bytes(b'%PDF-1.4 ' * 100)
+    assert precompress(str(path)) == []
@@ -0,0 +1,29 @@
+"""Headless batch crawling"""
+
+import asyncio
+import json
+import os
+
+from core.batch import BatchRunner, read_url_file
+
+
+def test_read_url_file_skips_comments_blanks_and_duplicates(tmp_path):
+    path = tmp_path / 'urls.txt'
+    path.write_text('# docs\nhttps://a.test/\n\nhttps://b.test/\nhttps://a.test/\n')
+    assert read_url_file(str(path)) == ['https://a.test/', 'https://b.test/']
+
+
+def test_batch_reports_each_site(fixture_site):
+    runner = BatchRunner(['markdown', 'jsonl'], output_dir='out', concurrency=2, index_pages=False)
+    summary = asyncio.run(runner.run([fixture_site.url, fixture_site.url + 'missing']))
+
+    assert (summary['succeeded'], summary['failed']) == (1, 1)
+    ok, missing = summary['sites']
+    assert ok['status'] == 'ok' and ok['pages'] == 6
+    assert sorted(ok['artifacts']) == ['jsonl', 'markdown']
+    assert all(os.path.getsize(path) > 0 for path in ok['artifacts'].values())
+    with open(ok['artifacts']['jsonl'], encoding='utf-8') as f:
+        assert {json.loads(line)['url'] for line in f} >= {fixture_site.url.rstrip('/')}
+
+    assert missing['status'] == 'failed'
+    assert missing['errors'] == {'crawl': 'No pages found'}
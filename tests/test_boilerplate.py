@@ -0,0 +1,51 @@
+"""Cross-page boilerplate removal"""
+
+from core.boilerplate import BoilerplateFilter
+
+NAV = "Home Guides Reference API Community Support"
+BANNER = "We use cookies to improve your experience on this site."
+
+
+def page_text(i: int) -> str:
+    return f"{NAV}\n\nUnique content for page number {i} of the guide.\n\n{BANNER}"
+
+
+def test_repeated_blocks_removed_once_ready():
+    bp = BoilerplateFilter(threshold=0.5, min_pages=3, min_block_chars=20)
+    blocks = bp.observe(page_text(0))
+    assert not bp.ready
+    assert bp.clean(blocks) == page_text(0)
+
+    for i in range(1, 4):
+        blocks = bp.observe(page_text(i))
+    assert bp.ready
+    assert bp.clean(blocks) == "Unique content for page number 3 of the guide."
+    assert bp.blocks_removed == 2
+
+
+def test_list_markers_and_whitespace_do_not_change_fingerprints():
+    bp = BoilerplateFilter(threshold=0.6, min_pages=3, min_block_chars=10)
+    bp.observe("- Getting started guide\n- Reference manual\n\nbody one is here")
+    bp.observe("1. Getting started guide\n2. Reference manual\n\nbody two is here")
+    blocks = bp.observe("• Getting started  guide\n• Reference manual\n\nbody three is here")
+    assert bp.clean(blocks) == "body three is here"
+
+
+def test_short_blocks_and_whole_pages_are_kept():
+    bp = BoilerplateFilter(threshold=0.5, min_pages=2, min_block_chars=20)
+    for _ in range(3):
+        blocks = bp.observe(f"Overview\n\n{BANNER}")
+    # The banner is boilerplate, the short heading is never removed
+    assert bp.clean(blocks) == "Overview"
+
+    blocks = bp.observe(BANNER)
+    assert bp.clean(blocks) == BANNER  # A page is never emptied
+
+
+def test_clean_markdown_matches_text_and_keeps_code():
+    bp = BoilerplateFilter(threshold=0.5, min_pages=2, min_block_chars=20)
+    for i in range(3):
+        bp.observe(f"{BANNER}\n\nBody {i}")
+
+    markdown = f"# Title\n\n**{BANNER[:-1]}**.\n\n```\n{BANNER}\n```\n\nBody"
+    assert bp.clean_markdown(markdown) == f"# Title\n\n```\n{BANNER}\n```\n\nBody"
@@ -0,0 +1,142 @@
+"""Shared crawl frontier: claims, leases and retries"""
+
+import time
+
+import pytest
+
+from core.distributed import FrontierBackend, RedisFrontierBackend, SQLiteFrontierBackend
+
+
+@pytest.fixture(params=['sqlite', 'redis'])
+def make_backend(request, tmp_path):
+    """Factory for a backend of each kind sharing one store"""
+    if request.param == 'sqlite':
+        path = str(tmp_path / 'frontier.sqlite')
+        return lambda lease_seconds=120: SQLiteFrontierBackend(path, lease_seconds)
+
+    fakeredis = pytest.importorskip('fakeredis')
+    pytest.importorskip('lupa')  # Lua scripting in fakeredis
+    server = fakeredis.FakeServer()
+    return lambda lease_seconds=120: RedisFrontierBackend(
+        fakeredis.FakeRedis(server=server, decode_responses=True), lease_seconds=lease_seconds
+    )
+
+
+def test_backend_interface_is_abstract():
+    with pytest.raises(TypeError):
+        FrontierBackend()
+
+
+def test_claims_follow_score_and_urls_are_queued_once(make_backend):
+    backend = make_backend()
+    backend.create_job('job', {'formats': ['markdown']})
+    assert backend.job_options('job') == {'formats': ['markdown']}
+    assert backend.push('job', 'https://docs.test/low', 2, 1.0)
+    assert backend.push('job', 'https://docs.test/high', 1, 5.0)
+    assert not backend.push('job', 'https://docs.test/high', 0, 9.0)
+
+    assert backend.claim('job') == ('https://docs.test/high', 1, 0)
+    assert backend.claim('job') == ('https://docs.test/low', 2, 0)
+    assert backend.claim('job') is None
+    assert not backend.is_finished('job')
+
+    backend.complete('job', 'https://docs.test/high')
+    backend.fail('job', 'https://docs.test/low', retry=False, error='404')
+    counts = backend.counts('job')
+    assert (counts['queued'], counts['claimed'], counts['done'], counts['failed']) == (0, 0, 1, 1)
+    assert backend.is_finished('job')
+
+
+def test_a_claim_is_handed_out_only_once_across_workers(make_backend):
+    workers = [make_backend(), make_backend()]
+    workers[0].create_job('job', {})
+    for i in range(10):
+        workers[0].push('job', f'https://docs.test/{i}', 1, float(i))
+
+    claimed = []
+    while True:
+        claims = [worker.claim('job') for worker in workers]
+        claimed.extend(claim[0] for claim in claims if claim)
+        if not all(claims):
+            break
+    assert sorted(claimed) == sorted(f'https://docs.test/{i}' for i in range(10))
+
+
+def test_retried_urls_keep_their_score(make_backend):
+    backend = make_backend()
+    backend.create_job('job', {})
+    backend.push('job', 'https://docs.test/important', 1, 5.0)
+    backend.push('job', 'https://docs.test/minor', 1, 1.0)
+
+    url, _, _ = backend.claim('job')
+    backend.fail('job', url, retry=True, error='503')
+    assert backend.claim('job') == ('https://docs.test/important', 1, 1)
+
+
+def test_expired_lease_is_reclaimed_with_its_score(make_backend):
+    backend = make_backend(lease_seconds=0)
+    backend.create_job('job', {})
+    backend.push('job', 'https://docs.test/important', 1, 5.0)
+    backend.push('job', 'https://docs.test/minor', 1, 1.0)
+
+    assert backend.claim('job')[0] == 'https://docs.test/important'
+    time.sleep(0.01)  # The worker holding the claim died
+    assert backend.claim('job')[0] == 'https://docs.test/important'
+    assert backend.counts('job')['claimed'] == 1
+
+
+def test_pages_stream_in_arrival_order_with_byte_counts(make_backend):
+    backend = make_backend()
+    backend.create_job('job', {})
+    for i in range(300):
+        backend.add_page('job', {'url': f'https://docs.test/{i}'}, nbytes=10)
+
+    assert [page['url'] for page in backend.iter_pages('job')] == [f'https://docs.test/{i}' for i in range(300)]
+    counts = backend.counts('job')
+    assert (counts['pages'], counts['bytes']) == (300, 3000)
+
+
+def test_prune_removes_old_jobs_only(make_backend):
+    backend = make_backend()
+    backend.create_job('old', {})
+    backend.push('old', 'https://docs.test/a', 0, 1.0)
+    backend.push('old', 'https://docs.test/b', 0, 1.0)
+    backend.claim('old')
+    backend.fail('old', 'https://docs.test/a', retry=False, error='gone')
+    backend.add_page('old', {'url': 'https://docs.test/b'}, 10)
+    cutoff = time.time()
+    time.sleep(0.01)
+    backend.create_job('new', {'keep': True})
+    backend.push('new', 'https://docs.test/a', 0, 1.0)
+
+    assert backend.prune(cutoff) > 0
+    with pytest.raises(KeyError):
+        backend.job_options('old')
+    assert backend.counts('old') == {'queued': 0, 'claimed': 0, 'done': 0, 'failed': 0, 'pages': 0, 'bytes': 0}
+    assert backend.push('old', 'https://docs.test/a', 0, 1.0)  # Its seen-set is gone too
+    assert backend.job_options('new') == {'keep': True}
+    assert backend.counts('new')['queued'] == 1
+    assert backend.prune(cutoff) == 0
+
+
+def test_redis_jobs_are_pruned_by_the_janitor():
+    fakeredis = pytest.importorskip('fakeredis')
+    pytest.importorskip('lupa')
+    from core.janitor import DatabaseArea, StorageJanitor
+
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    backend = RedisFrontierBackend(client)
+    backend.create_job('old', {})
+    backend.push('old', 'https://docs.test/', 0, 1.0)
+    client.zadd('docdl:jobs', {'old': time.time() - 8 * 24 * 3600})  # Created eight days ago
+    backend.create_job('new', {})
+
+    area = DatabaseArea('crawl_frontier', 'redis://fake/0', is_file=False, max_age_hours=7 * 24,
+                        open_db=lambda url: RedisFrontierBackend(
+                            fakeredis.FakeRedis(server=server, decode_responses=True)))
+    report = StorageJanitor(areas=[], databases=[area]).sweep()
+    assert report['databases']['crawl_frontier']['removed_rows'] == 5  # options, seen, depth, score, queue
+    assert report['databases']['crawl_frontier']['path'] == 'redis://fake/0'
+    assert sorted(client.keys('docdl:old:*')) == []
+    assert client.zrange('docdl:jobs', 0, -1) == ['new']
@@ -0,0 +1,39 @@
+"""Rendering several output formats from one crawl"""
+
+import asyncio
+
+from core.doc_scraper import DocumentationScraper
+
+
+class StubScraper(DocumentationScraper):
+    """Renderers that finish in a known order without touching the disk"""
+
+    async def generate_markdown(self, pages, output_path, progress_tracker=None):
+        return output_path
+
+    async def generate_pdf(self, pages, output_path, progress_tracker=None):
+        await asyncio.sleep(0.05)
+        return output_path
+
+    async def generate_jsonl(self, pages, output_path, progress_tracker=None):
+        raise RuntimeError('disk full')
+
+
+def test_each_format_is_delivered_as_its_renderer_finishes():
+    scraper = StubScraper('http://docs.test/', convert_markdown=False)
+    delivered = []
+
+    async def on_result(fmt, result):
+        delivered.append((fmt, result))
+
+    results = asyncio.run(scraper.generate_outputs(
+        [], ['pdf', 'markdown', 'jsonl', 'markdown'], 'out/doc', on_result=on_result
+    ))
+
+    # Batch callers still get every format, in the requested order
+    assert list(results) == ['pdf', 'markdown', 'jsonl']
+    assert results['pdf'] == 'out/doc.pdf'
+    assert isinstance(results['jsonl'], RuntimeError)
+    # The slow PDF doesn't hold back the Markdown file or the failure report
+    assert [fmt for fmt, _ in delivered] == ['markdown', 'jsonl', 'pdf']
+    assert delivered[1][1] is results['jsonl']
@@ -0,0 +1,58 @@
+"""Learned and pinned extraction selectors"""
+
+import json
+
+from core.extraction_profile import DEFAULT_SELECTORS, ExtractionProfiles
+
+
+def test_selector_is_learned_after_enough_pages_and_persisted(tmp_path):
+    profile_path = tmp_path / 'profiles.json'
+    profiles = ExtractionProfiles(str(profile_path), overrides_path='', learn_pages=3)
+    assert profiles.selectors('docs.test', 'content') == list(DEFAULT_SELECTORS['content'])
+
+    for _ in range(3):
+        profiles.record('docs.test', 'content', '.rst-content')
+    assert profiles.selectors('docs.test', 'content')[0] == '.rst-content'
+    assert profiles.selectors('other.test', 'content')[0] == DEFAULT_SELECTORS['content'][0]
+
+    reloaded = ExtractionProfiles(str(profile_path), overrides_path='', learn_pages=3)
+    assert reloaded.learned_selector('docs.test', 'content') == '.rst-content'
+
+
+def test_overrides_come_before_learned_selectors(tmp_path):
+    overrides = tmp_path / 'overrides.json'
+    overrides.write_text(json.dumps({'docs.test': {'title': ['h1.title']}}))
+    profiles = ExtractionProfiles(str(tmp_path / 'profiles.json'), str(overrides), learn_pages=1)
+    profiles.record('docs.test', 'title', 'title')
+
+    order = profiles.selectors('docs.test', 'title')
+    assert order[:2] == ['h1.title', 'title']
+    assert len(order) == len(set(order))
+
+
+def test_unreadable_profile_starts_empty(tmp_path):
+    profile_path = tmp_path / 'profiles.json'
+    profile_path.write_text('{broken')
+    assert ExtractionProfiles(str(profile_path), overrides_path='').tallies == {}
+
+
+def test_concurrent_saves_never_share_a_temp_file(tmp_path):
+    import threading
+
+    profile_path = tmp_path / 'profiles.json'
+    writers = [ExtractionProfiles(str(profile_path), overrides_path='', learn_pages=1) for _ in range(4)]
+
+    def save_repeatedly(profiles, domain):
+        for i in range(50):
+            profiles.record(domain, 'content', f'.content-{i}')
+
+    threads = [threading.Thread(target=save_repeatedly, args=(profiles, f'site{n}.test'))
+               for n, profiles in enumerate(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with open(profile_path, encoding='utf-8') as f:
+        assert len(json.load(f)) == 1  # Last writer wins, but the file is always whole
+    assert [path.name for path in tmp_path.iterdir()] == ['profiles.json']
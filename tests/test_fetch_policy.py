@@ -0,0 +1,72 @@
+"""Retry backoff, circuit breaker and retry-pass behaviour"""
+
+import asyncio
+
+import pytest
+import requests
+
+from core.doc_scraper import DocumentationScraper
+from core.fetch_policy import CircuitOpenError, FetchPolicy
+
+
+def http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+def test_backoff_is_jittered_below_capped_ceiling():
+    policy = FetchPolicy(backoff_base=0.5, backoff_max=2.0)
+    for attempt in range(6):
+        ceiling = min(2.0, 0.5 * 2 ** attempt)
+        assert all(0 <= policy.backoff_delay(attempt) <= ceiling for _ in range(50))
+
+
+def test_retryable_errors():
+    policy = FetchPolicy()
+    assert policy.is_retryable(http_error(503))
+    assert policy.is_retryable(requests.ConnectionError())
+    assert policy.is_retryable(requests.Timeout())
+    assert policy.is_retryable(CircuitOpenError('host', 1.0))
+    assert not policy.is_retryable(http_error(404))
+    assert not policy.is_retryable(ValueError())
+
+
+def test_circuit_opens_after_threshold_and_closes_on_success():
+    policy = FetchPolicy(breaker_threshold=3, breaker_cooldown=60)
+    for _ in range(2):
+        policy.record_failure('a')
+    policy.check('a')
+    policy.record_failure('a')
+    with pytest.raises(CircuitOpenError):
+        policy.check('a')
+    policy.check('b')  # Other hosts are unaffected
+
+    policy.record_success('a', 0.1)
+    policy.check('a')
+    assert policy.seconds_until_closed('a') == 0
+
+
+def test_timeout_follows_observed_latency():
+    policy = FetchPolicy(max_timeout=10, min_timeout=2, timeout_factor=4)
+    assert policy.timeout_for('a') == 10
+    policy.record_success('a', 0.1)
+    assert policy.timeout_for('a') == 2
+    policy.record_success('b', 1.0)
+    assert policy.timeout_for('b') == 4
+
+
+def test_retry_pass_skips_hosts_paused_past_the_timeout():
+    policy = FetchPolicy(breaker_threshold=1, breaker_cooldown=600)
+    scraper = DocumentationScraper('http://docs.test/', fetch_policy=policy, convert_markdown=False)
+    try:
+        policy.record_failure('paused.test')
+        scraper.retry_queue = [('http://paused.test/a', 1), ('http://docs.test/b', 2), ('http://docs.test/b', 1)]
+        scraper.failed_urls = {'http://paused.test/a': 'boom', 'http://docs.test/b': 'boom'}
+
+        queued = asyncio.run(scraper._prepare_retry_pass(remaining_seconds=30))
+
+        assert queued == [('http://docs.test/b', 1)]
+        assert scraper.failed_urls == {'http://paused.test/a': 'Not retried before timeout'}
+    finally:
+        scraper.close()
@@ -0,0 +1,82 @@
+"""Crawl frontier scoring and ordering"""
+
+from core.frontier import CrawlFrontier, parse_sitemap
+
+
+SITEMAP = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://docs.test/guide/</loc><priority>0.9</priority></url>
+  <url><loc>https://docs.test/guide/old</loc><priority>bogus</priority></url>
+  <url><loc>https://docs.test/about</loc></url>
+</urlset>"""
+
+
+def drain(frontier):
+    order = []
+    while frontier:
+        order.append(frontier.pop())
+    return order
+
+
+def test_parse_sitemap_priorities():
+    assert parse_sitemap(SITEMAP) == {
+        'https://docs.test/guide': 0.9,
+        'https://docs.test/guide/old': 0.5,
+        'https://docs.test/about': 0.5,
+    }
+    assert parse_sitemap('<not xml') == {}
+
+
+def test_shallow_pages_inside_start_path_come_first():
+    frontier = CrawlFrontier('https://docs.test/guide/')
+    frontier.push('https://docs.test/other/deep', 2)
+    frontier.push('https://docs.test/guide/intro', 1)
+    frontier.push('https://docs.test/guide/advanced/deep', 2)
+    frontier.push('https://docs.test/blog/post', 1)
+
+    assert [url for url, _ in drain(frontier)] == [
+        'https://docs.test/guide/intro',
+        'https://docs.test/guide/advanced/deep',
+        'https://docs.test/other/deep',
+        'https://docs.test/blog/post',
+    ]
+
+
+def test_navigation_order_and_footer_penalty():
+    frontier = CrawlFrontier('https://docs.test/')
+    frontier.push('https://docs.test/footer-only', 1, in_footer=True)
+    frontier.push('https://docs.test/plain', 1)
+    frontier.push('https://docs.test/nav-last', 1, nav_position=0.9)
+    frontier.push('https://docs.test/nav-first', 1, nav_position=0.0)
+
+    assert [url for url, _ in drain(frontier)] == [
+        'https://docs.test/nav-first',
+        'https://docs.test/nav-last',
+        'https://docs.test/plain',
+        'https://docs.test/footer-only',
+    ]
+
+
+def test_sitemap_priority_breaks_ties():
+    frontier = CrawlFrontier('https://docs.test/', parse_sitemap(SITEMAP))
+    frontier.push('https://docs.test/about', 1)
+    frontier.push('https://docs.test/guide/', 1)
+    assert frontier.pop() == ('https://docs.test/guide/', 1)
+
+
+def test_equal_scores_pop_in_insertion_order():
+    frontier = CrawlFrontier('https://docs.test/')
+    for name in 'abc':
+        frontier.push(f'https://docs.test/{name}', 1)
+    assert [url[-1] for url, _ in drain(frontier)] == ['a', 'b', 'c']
+
+
+def test_repushed_url_keeps_best_score_once():
+    frontier = CrawlFrontier('https://docs.test/')
+    assert frontier.push('https://docs.test/page', 3)
+    assert frontier.push('https://docs.test/page', 1)
+    assert not frontier.push('https://docs.test/page', 2)
+    assert len(frontier) == 1 and 'https://docs.test/page' in frontier
+
+    assert drain(frontier) == [('https://docs.test/page', 1)]
+    assert frontier.pop() is None
@@ -0,0 +1,89 @@
+"""Image cache: downscaling, reuse and per-image failures"""
+
+import asyncio
+import glob
+import io
+import os
+
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+
+from core.image_cache import ImageCache  # noqa: E402
+
+
+def image_bytes(width: int, height: int, mode: str = 'RGB', fmt: str = 'PNG', color=(200, 40, 40)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new(mode, (width, height), color).save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def fetch_all(cache, images, urls=None):
+    """Run fetch_all with a fetch that serves bytes from ``images`` and counts calls"""
+    calls = []
+
+    async def fetch(url):
+        calls.append(url)
+        if isinstance(images[url], Exception):
+            raise images[url]
+        return images[url]
+
+    results = asyncio.run(cache.fetch_all(urls or list(images), fetch))
+    return results, calls
+
+
+def test_images_are_downscaled_and_reused(tmp_path):
+    cache = ImageCache(str(tmp_path / 'images'), max_width=100, min_px=16)
+    photo = image_bytes(400, 200, fmt='JPEG')
+    images = {
+        'https://docs.test/photo.jpg': photo,
+        'https://docs.test/same-photo.jpg': photo,
+        'https://docs.test/diagram.png': image_bytes(50, 50, mode='RGBA', color=(0, 0, 0, 0)),
+        'https://docs.test/icon.png': image_bytes(8, 8),
+    }
+    results, calls = fetch_all(cache, images)
+
+    photo_entry = results['https://docs.test/photo.jpg']
+    assert (photo_entry.width, photo_entry.height) == (100, 50) and photo_entry.path.endswith('.jpg')
+    assert results['https://docs.test/same-photo.jpg'].path == photo_entry.path
+    assert results['https://docs.test/diagram.png'].path.endswith('.png')
+    assert 'https://docs.test/icon.png' not in results
+
+    # A later crawl resolves every URL, including the skipped icon, without downloading
+    results, calls = fetch_all(cache, images)
+    assert calls == [] and len(results) == 3
+
+
+def test_a_failing_image_is_skipped_without_losing_the_others(tmp_path, monkeypatch):
+    cache = ImageCache(str(tmp_path / 'images'))
+    process = cache._process
+
+    def flaky_process(digest, data):
+        if data == images['https://docs.test/unsavable.png']:
+            raise OSError('No space left on device')
+        return process(digest, data)
+
+    monkeypatch.setattr(cache, '_process', flaky_process)
+    images = {
+        'https://docs.test/ok.png': image_bytes(64, 64),
+        'https://docs.test/unsavable.png': image_bytes(64, 64, color=(1, 2, 3)),
+        'https://docs.test/garbage.png': b'not an image',
+        'https://docs.test/offline.png': ConnectionError('refused'),
+    }
+    results, _ = fetch_all(cache, images)
+    assert list(results) == ['https://docs.test/ok.png']
+    assert glob.glob(str(tmp_path / 'images' / '*.tmp')) == []
+
+
+def test_corrupt_cached_file_is_processed_again(tmp_path):
+    cache = ImageCache(str(tmp_path / 'images'))
+    data = image_bytes(64, 64)
+    first = cache.store('https://docs.test/a.png', data)
+    with open(first.path, 'wb') as f:
+        f.write(b'truncated')
+
+    again = cache.store('https://docs.test/b.png', data)
+    assert again.path == first.path and again.width == 64
+    with Image.open(again.path) as img:
+        assert img.size == (64, 64)
+    assert os.path.getsize(again.path) == again.size
@@ -0,0 +1,15 @@
+"""Import-time budgets of the core modules (see scripts/check_import_time.py)"""
+
+import os
+
+import pytest
+
+from check_import_time import IMPORT_BUDGETS_MS, check_module
+
+# Slow CI machines can scale the budgets, like --budget-scale of the script
+BUDGET_SCALE = float(os.environ.get('IMPORT_BUDGET_SCALE', '1.0'))
+
+
+@pytest.mark.parametrize('module', sorted(IMPORT_BUDGETS_MS))
+def test_import_within_budget_without_heavy_dependencies(module):
+    assert check_module(module, IMPORT_BUDGETS_MS[module] * BUDGET_SCALE, runs=3) == []
@@ -0,0 +1,114 @@
+"""Storage retention: files by age and size, published copies and database rows"""
+
+import asyncio
+import os
+import time
+
+from core.artifacts import publish_artifact
+from core.distributed import SQLiteFrontierBackend
+from core.image_cache import ImageCache, INDEX_FILENAME
+from core.config import OUTPUT_DIR, WARC_DIR
+from core.janitor import DatabaseArea, PublishedLedger, StorageArea, StorageJanitor, default_areas
+from core.search_index import SearchIndex
+
+DAY = 24 * 3600
+
+
+def write(path, size: int = 10, age_days: float = 0):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+    then = time.time() - age_days * DAY
+    os.utime(path, (then, then))
+    return str(path)
+
+
+def sweep(*areas, databases=()):
+    return StorageJanitor(areas=list(areas), databases=list(databases)).sweep()
+
+
+def test_expired_and_least_recently_used_files_are_removed(tmp_path):
+    old = write(tmp_path / 'out' / 'old.md', age_days=10)
+    lru = write(tmp_path / 'out' / 'lru.md', size=100, age_days=2)
+    new = write(tmp_path / 'out' / 'new.md', size=100)
+
+    report = sweep(StorageArea('out', str(tmp_path / 'out'), max_age_hours=7 * 24, max_bytes=150))
+    assert [os.path.exists(path) for path in (old, lru, new)] == [False, False, True]
+    assert report['areas']['out']['removed_files'] == 2
+    assert report['areas']['out']['bytes'] == 100
+
+
+def test_recorded_crawls_expire_with_the_default_areas():
+    warc = write(os.path.join(WARC_DIR, 'documentation_x.warc.gz'), age_days=10)
+    areas = {area.name: area for area in default_areas()}
+    report = sweep(areas['artifacts'], areas['warc'])
+    assert not os.path.exists(warc)
+    assert report['areas']['warc']['removed_files'] == 1
+
+
+def test_only_our_artifacts_and_variants_expire_in_the_output_dir():
+    artifact = write(os.path.join(OUTPUT_DIR, 'documentation_20260101_120000_job.md'), age_days=10)
+    variant = write(artifact + '.gz', age_days=10)
+    other = write(os.path.join(OUTPUT_DIR, 'notes.md'), age_days=10)
+    areas = {area.name: area for area in default_areas()}
+    report = sweep(areas['artifacts'])
+    assert [os.path.exists(path) for path in (artifact, variant, other)] == [False, False, True]
+    assert report['areas']['artifacts']['removed_files'] == 2
+
+
+def test_only_unchanged_published_files_expire(tmp_path):
+    downloads = tmp_path / 'Downloads'
+    ledger = PublishedLedger(str(tmp_path / 'published.json'))
+    ours = write(downloads / 'documentation_20250101_000000.pdf', age_days=40)
+    ledger.record(ours)
+    theirs = write(downloads / 'documentation_notes.pdf', age_days=40)
+    edited = write(downloads / 'documentation_20250101_000001.md', age_days=40)
+    ledger.record(edited)
+    write(edited, size=20, age_days=40)  # The user edited our file since
+
+    sweep(StorageArea('user_downloads', str(downloads), patterns=['documentation_*'],
+                      max_age_hours=30 * 24, ledger=ledger))
+    assert not os.path.exists(ours)
+    assert os.path.exists(theirs) and os.path.exists(edited)
+    assert ledger.entries() == {}  # Removed and changed files are forgotten
+
+
+def test_publishing_records_the_copy(tmp_path):
+    source = write(tmp_path / 'out' / 'documentation_x.md')
+    os.makedirs(tmp_path / 'Downloads')
+    published = asyncio.run(publish_artifact(source, str(tmp_path / 'Downloads'), mode='copy', command=None))
+    assert PublishedLedger.owns(PublishedLedger().entries(), published, os.stat(published))
+
+
+def test_old_database_rows_are_pruned(tmp_path):
+    index_path = str(tmp_path / 'search.sqlite')
+    index = SearchIndex(index_path)
+    index.add_page('job1', {'url': 'https://docs.test/a', 'title': 'A', 'content': 'alpha'})
+    index.close()
+
+    images = ImageCache(str(tmp_path / 'images'))
+    images._db.execute("INSERT INTO images VALUES ('https://docs.test/a.png', '', 0, 0, ?)", (time.time() - 40 * DAY,))
+    images._db.execute("INSERT INTO images VALUES ('https://docs.test/b.png', '', 0, 0, ?)", (time.time(),))
+    images._db.commit()
+    images.close()
+
+    frontier_path = str(tmp_path / 'frontier.sqlite')
+    frontier = SQLiteFrontierBackend(frontier_path)
+    frontier.create_job('job', {})
+    frontier.push('job', 'https://docs.test/', 0, 0.0)
+    frontier.add_page('job', {'url': 'https://docs.test/'})
+    frontier.close()
+
+    report = sweep(databases=[
+        DatabaseArea('search_index', index_path, SearchIndex, max_age_hours=0),
+        DatabaseArea('image_index', str(tmp_path / 'images' / INDEX_FILENAME),
+                     lambda path: ImageCache(os.path.dirname(path)), max_age_hours=30 * 24),
+        DatabaseArea('crawl_frontier', frontier_path, SQLiteFrontierBackend, max_age_hours=0),
+        DatabaseArea('missing', str(tmp_path / 'missing.sqlite'), SearchIndex, max_age_hours=0),
+    ])
+
+    removed = {name: entry['removed_rows'] for name, entry in report['databases'].items()}
+    assert removed == {'search_index': 1, 'image_index': 1, 'crawl_frontier': 3, 'missing': 0}
+    assert SearchIndex(index_path).search('alpha') == []
+    assert ImageCache(str(tmp_path / 'images')).lookup('https://docs.test/b.png') is not None
+    assert not os.path.exists(tmp_path / 'missing.sqlite')
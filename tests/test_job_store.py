@@ -0,0 +1,81 @@
+"""Persistent job store and long-polling"""
+
+import asyncio
+
+from core.job_store import JobStore
+
+
+def test_state_changes_persist_and_progress_is_throttled(tmp_path):
+    path = str(tmp_path / 'jobs.sqlite')
+    store = JobStore(path, persist_interval=3600)
+    store.create('a', 'https://docs.test/', ['pdf'])
+    store.update('a', state='running')
+    store.update('a', step=3, message='Crawling')
+
+    assert store.get('a')['step'] == 3  # Live jobs are read from memory
+    other = JobStore(path)
+    assert other.get('a')['state'] == 'running' and other.get('a')['step'] == 0
+
+    store.update('a', state='completed')
+    job = other.get('a')
+    assert (job['state'], job['step']) == ('completed', 3)
+    assert job['finished_at'] is not None
+    store.close()
+    other.close()
+
+
+def test_artifacts_are_replaced_per_format(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.sqlite'))
+    store.create('a', 'https://docs.test/', ['zip', 'pdf'])
+    store.set_artifact('a', {'format': 'zip', 'status': 'streaming', 'filename': 'a.zip'})
+    store.set_artifact('a', {'format': 'pdf', 'status': 'ready', 'filename': 'a.pdf'})
+    store.set_artifact('a', {'format': 'zip', 'status': 'ready', 'filename': 'a.zip'})
+    assert [(entry['format'], entry['status']) for entry in store.get('a')['artifacts']] == \
+        [('pdf', 'ready'), ('zip', 'ready')]
+    store.close()
+
+
+def test_long_poll_wakes_on_change_and_times_out(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.sqlite'))
+    version = store.create('a', 'https://docs.test/', ['pdf'])['version']
+
+    async def poll():
+        # A stale version (or none) answers at once
+        assert (await store.wait('a', version - 1, timeout=10))['version'] == version
+        assert (await store.wait('a', None, timeout=10))['version'] == version
+
+        waiter = asyncio.ensure_future(store.wait('a', version, timeout=10))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        store.update('a', step=2)
+        woken = await asyncio.wait_for(waiter, 1)
+        assert (woken['version'], woken['step']) == (version + 1, 2)
+
+        unchanged = await store.wait('a', version + 1, timeout=0.05)
+        assert unchanged['version'] == version + 1
+
+        store.update('a', state='failed')
+        finished = store.get('a')['version']
+        assert (await asyncio.wait_for(store.wait('a', finished, timeout=10), 1))['state'] == 'failed'
+        assert await store.wait('missing', 1, timeout=10) is None
+
+    asyncio.run(poll())
+    store.close()
+
+
+def test_recover_interrupts_unfinished_jobs_and_prunes_history(tmp_path):
+    path = str(tmp_path / 'jobs.sqlite')
+    previous = JobStore(path)
+    for job_id in ('old', 'done', 'running'):
+        previous.create(job_id, 'https://docs.test/', ['pdf'])
+    previous.update('done', state='completed')
+    previous.update('running', state='running')
+    previous.close()
+
+    store = JobStore(path)
+    assert store.recover(keep=2) == 2
+    assert [job['id'] for job in store.list_jobs()] == ['running', 'done']
+    assert store.get('running')['state'] == 'interrupted'
+    assert store.count() == 2 and store.count('completed') == 1
+    assert [job['id'] for job in store.list_jobs(limit=1, offset=1)] == ['done']
+    store.close()
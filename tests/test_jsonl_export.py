@@ -0,0 +1,57 @@
+"""Chunked JSONL export"""
+
+import hashlib
+import json
+
+from core.jsonl_export import JsonlWriter, chunk_page
+
+PARAGRAPH = "The retry option controls how often a failed request is repeated."
+
+
+def make_page(content: str, headings=None, url='https://docs.test/guide') -> dict:
+    return {'url': url, 'title': 'Guide', 'content': content, 'headings': headings or []}
+
+
+def test_chunks_follow_heading_paths():
+    page = make_page(
+        f"Guide\n\nIntro text\n\nInstall\n\n{PARAGRAPH}\n\nOn Linux\n\n- apt\n- snap\n\nUsage\n\nRun it",
+        [[1, 'Guide'], [2, 'Install'], [3, 'On Linux'], [2, 'Usage']],
+    )
+    records = chunk_page(page)
+    assert [(record['heading_path'], record['text']) for record in records] == [
+        (['Guide'], 'Intro text'),
+        (['Guide', 'Install'], PARAGRAPH),
+        (['Guide', 'Install', 'On Linux'], '- apt\n- snap'),
+        (['Guide', 'Usage'], 'Run it'),
+    ]
+    assert [record['chunk_index'] for record in records] == [0, 1, 2, 3]
+    assert all(record['url'] == page['url'] and record['title'] == 'Guide' for record in records)
+    assert records[1]['content_hash'] == hashlib.sha256(PARAGRAPH.encode('utf-8')).hexdigest()
+
+
+def test_blocks_are_packed_and_split_to_max_chars():
+    page = make_page('\n\n'.join([PARAGRAPH] * 5))
+    records = chunk_page(page, max_chars=150)
+    assert all(len(record['text']) <= 150 for record in records)
+    assert [record['text'] for record in records] == [f"{PARAGRAPH}\n\n{PARAGRAPH}"] * 2 + [PARAGRAPH]
+
+    # An oversized block is cut at spaces, never losing words
+    long = ' '.join(['word'] * 100)
+    records = chunk_page(make_page(long), max_chars=50)
+    assert all(len(record['text']) <= 50 for record in records)
+    assert ' '.join(record['text'] for record in records) == long
+
+
+def test_writer_appends_complete_lines_per_page(tmp_path):
+    path = str(tmp_path / 'out' / 'docs.jsonl')
+    writer = JsonlWriter(path)
+    writer.add_page(make_page(PARAGRAPH, url='https://docs.test/a'))
+    with open(path, encoding='utf-8') as f:
+        assert [json.loads(line)['url'] for line in f] == ['https://docs.test/a']  # Flushed before close
+
+    writer.add_page(make_page(f"{PARAGRAPH}\n\nGrüße", url='https://docs.test/b'))
+    writer.close()
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    assert writer.chunks == len(lines) == 2
+    assert json.loads(lines[1])['text'] == f"{PARAGRAPH}\n\nGrüße"
@@ -0,0 +1,35 @@
+"""HTML to Markdown conversion and its cache"""
+
+import asyncio
+
+import core.markdown_convert as markdown_convert
+from core.markdown_convert import MarkdownCache, MarkdownConverter, nest_headings
+
+
+def test_headings_nest_under_the_page_title_outside_code():
+    markdown = "# Intro\n\n\n\ntext\n\n```\n# comment\n\n\n```\n###### Deep"
+    assert nest_headings(markdown) == "### Intro\n\ntext\n\n```\n# comment\n\n\n```\n###### Deep"
+
+
+def test_conversions_are_cached_by_html(tmp_path):
+    converter = MarkdownConverter(workers=0, cache=MarkdownCache(str(tmp_path / 'md')))
+    html = '<h2>Usage</h2><p>Run <code>tool</code></p>'
+
+    async def convert_twice():
+        return await converter.convert(html), await converter.convert(html)
+
+    first, second = asyncio.run(convert_twice())
+    assert first == second == "#### Usage\n\nRun `tool`"
+    assert (converter.conversions, converter.cache_hits) == (1, 1)
+
+
+def test_shutdown_only_stops_a_created_converter(monkeypatch):
+    monkeypatch.setattr(markdown_convert, '_converter', None)
+    markdown_convert.shutdown_markdown_converter()
+    assert markdown_convert._converter is None  # Not created just to be shut down
+
+    converter = markdown_convert.get_markdown_converter()
+    stopped = []
+    monkeypatch.setattr(converter, 'shutdown', lambda: stopped.append(True))
+    markdown_convert.shutdown_markdown_converter()
+    assert stopped == [True] and markdown_convert._converter is None
@@ -0,0 +1,51 @@
+"""Shared text normalization into blocks"""
+
+from core.doc_scraper import DocumentationScraper
+from core.normalize import anchor_key, block_text, normalize_content, page_blocks
+
+
+def test_headings_paragraphs_and_lists():
+    content = "Setup\n\nFirst  line\nsecond line\n\n• apt\n• snap\n\n1. Download\n2) Install\n\n- one\n2. two"
+    assert normalize_content(content, [[2, 'Setup']]) == [
+        ['h', 2, 'Setup'],
+        ['p', 'First line\nsecond line'],
+        ['ul', ['apt', 'snap']],
+        ['ol', ['Download', 'Install'], 1],
+        ['p', '- one\n2. two'],  # Mixed markers stay prose
+    ]
+
+
+def test_each_recorded_heading_is_used_once():
+    blocks = normalize_content("Usage\n\nRun it\n\nUsage", [[2, 'Usage']])
+    assert blocks == [['h', 2, 'Usage'], ['p', 'Run it'], ['p', 'Usage']]
+
+
+def test_ordered_lists_keep_their_start_number():
+    blocks = normalize_content("3. Configure\n4. Run")
+    assert blocks == [['ol', ['Configure', 'Run'], 3]]
+    assert block_text(blocks[0], markers=True) == "3. Configure\n4. Run"
+    assert block_text(blocks[0]) == "Configure\nRun"
+    assert block_text(['ol', ['Old', 'Block']], markers=True) == "1. Old\n2. Block"  # Stored without a start
+
+    scraper = DocumentationScraper('https://docs.test/')
+    assert scraper._blocks_to_html(blocks) == '<ol start="3">\n<li>Configure</li>\n<li>Run</li>\n</ol>'
+    assert scraper._blocks_to_html([['ol', ['a'], 1]]) == '<ol>\n<li>a</li>\n</ol>'
+    assert scraper._blocks_to_markdown(blocks) == "3. Configure\n4. Run"
+    scraper.close()
+
+
+def test_extracted_list_numbers_follow_the_start_attribute():
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup('<div><p>Then</p><ol start="5"><li>Deploy</li><li>Verify</li></ol></div>', 'html.parser')
+    scraper = DocumentationScraper('https://docs.test/')
+    text = scraper._text_with_block_breaks(soup.div)
+    scraper.close()
+    assert normalize_content(text)[-1] == ['ol', ['Deploy', 'Verify'], 5]
+
+
+def test_page_blocks_are_cached_and_anchor_keys_match():
+    page = {'content': '• Install the CLI', 'headings': []}
+    blocks = page_blocks(page)
+    assert page['blocks'] is blocks and page_blocks(page) is blocks
+    assert anchor_key('  •  Install   the CLI ') == blocks[0][1][0]
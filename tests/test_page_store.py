@@ -0,0 +1,47 @@
+"""Page store spilling and crawl-order iteration"""
+
+import os
+
+from core.page_store import PageStore
+
+
+def page(i: int) -> dict:
+    return {'url': f'https://docs.test/{i}', 'title': f'Page {i}', 'content': 'x' * 100}
+
+
+def test_small_store_stays_in_memory(tmp_path):
+    store = PageStore(memory_limit=10_000, directory=str(tmp_path))
+    for i in range(5):
+        store.append(page(i))
+    assert store.spilled == 0 and store.path is None
+    assert [p['url'] for p in store] == [page(i)['url'] for i in range(5)]
+
+
+def test_spilled_pages_stream_back_in_order(tmp_path):
+    store = PageStore(memory_limit=500, directory=str(tmp_path))
+    for i in range(600):
+        store.append(page(i))
+
+    assert len(store) == 600 and store
+    assert store.spilled > 256  # More than one read batch on disk
+    assert os.path.exists(store.path)
+    for _ in range(2):  # Renderers iterate the store more than once
+        assert [p['url'] for p in store] == [page(i)['url'] for i in range(600)]
+
+
+def test_newest_page_is_kept_even_if_over_limit(tmp_path):
+    store = PageStore(memory_limit=10, directory=str(tmp_path))
+    store.append(page(0))
+    store.append(page(1))
+    assert store.spilled == 1
+    assert list(store)[-1] == page(1)
+
+
+def test_close_removes_spill_file(tmp_path):
+    store = PageStore(memory_limit=10, directory=str(tmp_path))
+    for i in range(3):
+        store.append(page(i))
+    path = store.path
+    assert os.path.exists(path)
+    store.close()
+    assert not os.path.exists(path) and store.path is None
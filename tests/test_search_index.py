@@ -0,0 +1,50 @@
+"""Full-text search index"""
+
+import pytest
+
+from core.search_index import SearchIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = SearchIndex(str(tmp_path / 'search.sqlite'))
+    yield index
+    index.close()
+
+
+def page(url: str, title: str, content: str) -> dict:
+    return {'url': url, 'title': title, 'content': content}
+
+
+def test_title_hits_rank_above_body_hits(index):
+    index.add_page('job1', page('https://docs.test/a', 'Installing', 'Run the setup script.'))
+    index.add_page('job1', page('https://docs.test/b', 'Overview', 'See installing for details.'))
+    for i in range(5):  # bm25 needs a corpus where the term is rare
+        index.add_page('job1', page(f'https://docs.test/other{i}', 'Other', 'Unrelated text.'))
+
+    hits = index.search('installing')
+    assert [hit['url'] for hit in hits] == ['https://docs.test/a', 'https://docs.test/b']
+    assert hits[0]['score'] > hits[1]['score']
+    assert '[' in hits[1]['snippet']
+
+
+def test_hits_can_be_restricted_to_one_job(index):
+    for job_id in ('job1', 'job2'):
+        index.add_page(job_id, page('https://docs.test/a', 'Caching', f'Cache settings of {job_id}'))
+
+    assert len(index.search('cache')) == 2
+    hits = index.search('cache', job_id='job2')
+    assert [hit['job_id'] for hit in hits] == ['job2']
+
+
+def test_reindexing_a_page_replaces_its_content(index):
+    index.add_page('job1', page('https://docs.test/a', 'Page', 'old wording'))
+    index.add_page('job1', page('https://docs.test/a', 'Page', 'new wording'))
+    assert index.search('old') == []
+    assert len(index.search('new')) == 1
+
+
+def test_invalid_fts_syntax_falls_back_to_plain_terms(index):
+    index.add_page('job1', page('https://docs.test/a', 'Page', 'configure the "proxy" option'))
+    assert len(index.search('proxy (')) == 1
+    assert index.search('""') == []
@@ -0,0 +1,108 @@
+"""Structured-data fast path: llms.txt manifests and Next.js page data"""
+
+import json
+
+import pytest
+from bs4 import BeautifulSoup
+
+from core.site_frameworks import (
+    MarkdownAlternates, NextDataSource, StructuredSource, canonical_page_url, detect_framework,
+    markdown_to_text, parse_llms_txt
+)
+
+BODY = '<h2>Install</h2><p>' + 'Run the installer and follow the prompts. ' * 10 + '</p>'
+
+
+def next_page(data: dict, asset: str = '/docs/_next/static/chunks/main.js') -> BeautifulSoup:
+    return BeautifulSoup(
+        f'<html><head><script src="{asset}"></script></head><body>'
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(data)}</script></body></html>',
+        'html.parser'
+    )
+
+
+def test_llms_txt_links_resolve_against_the_manifest():
+    manifest = ("# Example Docs\n\n> Summary\n\n## Guides\n\n"
+                "- [Install](/docs/install.md): Getting set up\n"
+                "* [Usage](usage.md#top)\n"
+                "- [API](<https://api.test/reference.md>)\n"
+                "Not a [list link](/docs/other.md)\n")
+    assert parse_llms_txt(manifest, 'https://docs.test/docs/llms.txt') == [
+        ('https://docs.test/docs/install.md', 'Install'),
+        ('https://docs.test/docs/usage.md', 'Usage'),
+        ('https://api.test/reference.md', 'API'),
+    ]
+    # HTML served with status 200 for a missing manifest
+    assert parse_llms_txt('<!doctype html><h1>Not found</h1>\n- [x](/x.md)', 'https://docs.test/llms.txt') == []
+
+
+def test_markdown_alternates_map_to_page_urls():
+    assert canonical_page_url('https://docs.test/guide/setup.md') == 'https://docs.test/guide/setup'
+    assert canonical_page_url('https://docs.test/guide/index.mdx') == 'https://docs.test/guide/'
+    assert canonical_page_url('https://docs.test/guide/setup#usage') == 'https://docs.test/guide/setup'
+
+
+def test_frameworks_are_detected():
+    def soup(head):
+        return BeautifulSoup(f'<html><head>{head}</head></html>', 'html.parser')
+
+    assert detect_framework(soup('<meta name="generator" content="Docusaurus v3.1">')) == 'docusaurus'
+    assert detect_framework(soup('<link rel="preload" href="https://mintcdn.com/x.css">')) == 'mintlify'
+    assert detect_framework(soup('<script src="/_next/static/chunks/app.js"></script>')) == 'nextjs'
+    assert detect_framework(soup('<meta name="generator" content="Hugo">')) is None
+
+
+def test_next_data_routes_and_page_props():
+    source = NextDataSource.from_soup(next_page({'buildId': 'b1', 'gsp': True}), 'https://docs.test/docs/guide')
+    assert (source.origin, source.base_path, source.build_id) == ('https://docs.test', '/docs', 'b1')
+    assert source.payload_url('https://docs.test/docs/guide/') == 'https://docs.test/docs/_next/data/b1/guide.json'
+    assert source.payload_url('https://docs.test/docs') == 'https://docs.test/docs/_next/data/b1/index.json'
+
+    props = {'pageProps': {'meta': {'title': 'Install'}, 'mdx': {'compiled': 'function _createMdxContent() {'
+                                                                              + 'x' * 300 + '}'},
+                           'html': BODY}}
+    assert source.parse('https://docs.test/docs/guide', json.dumps(props)) == {'title': 'Install', 'html': BODY}
+    assert source.parse('https://docs.test/docs/guide', json.dumps({'pageProps': {'__N_REDIRECT': '/x'}})) is None
+    assert source.parse('https://docs.test/docs/guide', '<html>not json</html>') is None
+
+    # Pages without static props have no data routes
+    assert NextDataSource.from_soup(next_page({'buildId': 'b1'}), 'https://docs.test/docs/guide') is None
+
+
+def test_listed_pages_count_misses_until_the_manifest_is_given_up():
+    alternates = {f'https://docs.test/p{i}': f'https://docs.test/p{i}.md' for i in range(5)}
+    source = MarkdownAlternates('llms.txt', alternates, max_misses=2)
+    assert source.payload_url('https://docs.test/p0') == 'https://docs.test/p0.md'
+    assert source.payload_url('https://docs.test/unlisted') is None
+
+    source.record('https://docs.test/p0', False)
+    source.record('https://docs.test/p1', True)  # A hit resets the count
+    source.record('https://docs.test/p2', False)
+    assert source.active
+    source.record('https://docs.test/p3', False)
+    assert not source.active and source.hits == 1
+
+    assert source.parse('https://docs.test/p4', '<!doctype html>') is None
+    assert source.parse('https://docs.test/p4', '# P4\n\ntext') == {'title': None, 'markdown': '# P4\n\ntext'}
+
+
+def test_guessed_alternates_skip_directories_and_markdown_urls():
+    source = MarkdownAlternates('mintlify', guess=True)
+    assert source.payload_url('https://docs.test/guide/setup') == 'https://docs.test/guide/setup.md'
+    assert source.payload_url('https://docs.test/guide/') is None
+    assert source.payload_url('https://docs.test/guide/setup.md') is None
+
+
+def test_sources_must_implement_payloads():
+    with pytest.raises(TypeError):
+        StructuredSource()
+
+
+def test_markdown_pages_become_extracted_text():
+    markdown = ("---\ntitle: Setup\n---\n# Setup\n\nSee [the API](/api.md) and ![diagram](img/a.png).\n\n"
+                "- one\n3. three\n\n```\n# not a heading\n```\n")
+    text, headings, images, links = markdown_to_text(markdown, 'https://docs.test/guide/setup', '[[IMG{}]]')
+    assert headings == [[1, 'Setup']]
+    assert images == [{'src': 'https://docs.test/guide/img/a.png', 'alt': 'diagram'}]
+    assert links == ['https://docs.test/api.md']
+    assert text == "Setup\n\nSee the API and [[IMG0]].\n\n• one\n3. three\n\n# not a heading"
@@ -0,0 +1,67 @@
+"""WARC recording and offline replay"""
+
+import asyncio
+
+import pytest
+import requests
+
+from core.doc_scraper import DocumentationScraper
+from core.warc import ArchiveMiss, WarcArchive, WarcWriter, iter_records
+
+
+def make_response(url: str, status: int, body: bytes = b'', headers=None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.reason = 'OK' if status == 200 else 'Moved Permanently'
+    response.url = url
+    response.headers.update(headers or {})
+    response._content = body
+    return response
+
+
+def crawl(url: str, **kwargs):
+    scraper = DocumentationScraper(url, convert_markdown=False, **kwargs)
+    try:
+        pages = asyncio.run(scraper.scrape_documentation(max_depth=2))
+        return [(page['url'], page['title'], page['content']) for page in pages]
+    finally:
+        scraper.close()
+
+
+def test_redirects_and_bodies_round_trip(tmp_path):
+    path = str(tmp_path / 'crawl.warc.gz')
+    redirect = make_response('https://docs.test/old', 301, headers={'Location': '/new'})
+    final = make_response('https://docs.test/new', 200, 'Grüße'.encode('utf-8'),
+                          {'Content-Type': 'text/html; charset=utf-8', 'Content-Encoding': 'gzip'})
+    final.history = [redirect]
+
+    writer = WarcWriter(path, 'https://docs.test/')
+    writer.write_response(final)
+    writer.close()
+    assert [headers['warc-type'] for _, headers, _ in iter_records(path)] == ['warcinfo', 'response', 'response']
+
+    archive = WarcArchive(path)
+    try:
+        assert archive.start_url == 'https://docs.test/'
+        assert len(archive) == 2 and 'https://docs.test/new' in archive
+        replayed = archive.get('https://docs.test/old')
+        assert replayed.url == 'https://docs.test/new'
+        assert [hop.status_code for hop in replayed.history] == [301]
+        assert replayed.text == 'Grüße'
+        # Bodies are stored decoded, so the original encoding header must not survive
+        assert 'Content-Encoding' not in replayed.headers
+        assert replayed.headers['Content-Length'] == str(len('Grüße'.encode('utf-8')))
+        with pytest.raises(ArchiveMiss):
+            archive.get('https://docs.test/missing')
+    finally:
+        archive.close()
+
+
+def test_replayed_crawl_matches_recorded_crawl(fixture_site, tmp_path):
+    path = str(tmp_path / 'warc' / 'site.warc.gz')
+    recorded = crawl(fixture_site.url, warc_path=path)
+    fixture_site.stop()  # Replay must not need the network
+
+    replayed = crawl(fixture_site.url, replay_path=path)
+    assert len(recorded) == 6
+    assert replayed == recorded
@@ -0,0 +1,76 @@
+"""Serving finished artifacts: byte ranges, validators and variants"""
+
+import os
+
+import pytest
+
+import web.main as main
+from core.artifacts import etag_for, precompress
+
+BODY = bytes(range(10))
+
+
+@pytest.fixture
+def client():
+    testclient = pytest.importorskip('fastapi.testclient')  # Needs httpx
+    os.makedirs(main.OUTPUT_DIR, exist_ok=True)
+    for name, data in (('docs.bin', BODY), ('empty.bin', b'')):
+        with open(os.path.join(main.OUTPUT_DIR, name), 'wb') as f:
+            f.write(data)
+    return testclient.TestClient(main.app)
+
+
+@pytest.mark.parametrize('header', [
+    'bytes=9-3',
+    'items=0-3',
+    'bytes=0-1,3-4',  # Never a multipart response
+    'bytes=--3',
+])
+def test_ignored_ranges_send_the_whole_file(client, header):
+    response = client.get('/download/docs.bin', headers={'Range': header})
+    assert response.status_code == 200
+    assert response.content == BODY
+    assert response.headers['content-length'] == str(len(BODY))
+    assert 'content-range' not in response.headers
+
+
+def test_single_ranges_are_partial(client):
+    response = client.get('/download/docs.bin', headers={'Range': 'bytes=-3'})
+    assert response.status_code == 206
+    assert response.content == BODY[-3:]
+    assert response.headers['content-range'] == 'bytes 7-9/10'
+
+
+@pytest.mark.parametrize('filename, header, size', [
+    ('docs.bin', 'bytes=10-', 10),
+    ('empty.bin', 'bytes=-5', 0),
+])
+def test_unsatisfiable_ranges_are_refused(client, filename, header, size):
+    response = client.get(f'/download/{filename}', headers={'Range': header})
+    assert response.status_code == 416
+    assert response.headers['content-range'] == f'bytes */{size}'
+
+
+def test_validators(client):
+    etag = etag_for(os.stat(os.path.join(main.OUTPUT_DIR, 'docs.bin')))
+    assert client.get('/download/docs.bin', headers={'If-None-Match': etag}).status_code == 304
+
+    resumed = client.get('/download/docs.bin', headers={'Range': 'bytes=5-', 'If-Range': etag})
+    assert (resumed.status_code, resumed.content) == (206, BODY[5:])
+    changed = client.get('/download/docs.bin', headers={'Range': 'bytes=5-', 'If-Range': '"stale"'})
+    assert (changed.status_code, changed.content) == (200, BODY)
+
+
+def test_changed_files_resume_from_a_precompressed_variant(client):
+    path = os.path.join(main.OUTPUT_DIR, 'docs.md')
+    with open(path, 'w') as f:
+        f.write('# Docs\n\n' + 'Compressible text. ' * 200)
+    precompress(path, ['gzip'])
+
+    response = client.get('/download/docs.md', headers={'Range': 'bytes=5-', 'If-Range': '"stale"',
+                                                        'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.headers['content-length'] == str(os.path.getsize(path + '.gz'))
+    with open(path, 'rb') as f:
+        assert response.content == f.read()  # Decoded by the client
@@ -0,0 +1,143 @@
+"""Web download jobs: per-job artifacts and cancellation"""
+
+import asyncio
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+import web.main as main
+from core.janitor import StorageJanitor
+from core.job_store import JobStore
+
+
+class FrozenDatetime(datetime):
+    """Every job starts in the same second"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return datetime(2026, 1, 1, 12, 0, 0)
+
+
+def test_concurrent_jobs_record_distinct_artifacts(fixture_site, monkeypatch):
+    store = JobStore('jobs.sqlite')
+    monkeypatch.setattr(main, 'get_job_store', lambda: store)
+    monkeypatch.setattr(main, 'get_search_index', lambda: None)
+    monkeypatch.setattr(main, 'datetime', FrozenDatetime)
+
+    async def no_publish(path):
+        return None
+    monkeypatch.setattr(main, 'publish_artifact', no_publish)  # Never touch ~/Downloads
+    main.ensure_directories()
+
+    formats = ['markdown', 'jsonl', 'zip']
+    jobs = {'a': 'job-a', 'b': 'job-b'}
+    for token, job_id in jobs.items():
+        store.create(job_id, fixture_site.token_url(token), formats)
+
+    async def run_both():
+        await asyncio.gather(*(
+            main.process_documentation_task(fixture_site.token_url(token), formats, f"conn-{token}", False, job_id)
+            for token, job_id in jobs.items()
+        ))
+    asyncio.run(run_both())
+
+    filenames = {}
+    for token, job_id in jobs.items():
+        job = store.get(job_id)
+        assert job['state'] == 'completed'
+        assert sorted(entry['format'] for entry in job['artifacts']) == sorted(formats)
+        filenames[token] = {entry['filename'] for entry in job['artifacts']}
+        assert all(job_id in filename for filename in filenames[token])
+        with open(os.path.join(main.OUTPUT_DIR, f"documentation_20260101_120000_{job_id}.md"),
+                  encoding='utf-8') as f:
+            assert f"of {token}" in f.read()  # The job's own crawl, not the other's
+    assert not filenames['a'] & filenames['b']
+    store.close()
+
+
+def wait_for(condition, timeout: float = 15.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+def job_files(job_id: str, directory: str = main.OUTPUT_DIR):
+    try:
+        return [name for name in os.listdir(directory) if job_id in name]
+    except FileNotFoundError:
+        return []
+
+
+@pytest.fixture
+def web_app(fixture_site, monkeypatch, tmp_path):
+    """The app under a test client, crawling the slowed-down fixture site"""
+    testclient = pytest.importorskip('fastapi.testclient')  # Needs httpx
+
+    store = JobStore('jobs.sqlite')
+    monkeypatch.setattr(main, 'get_job_store', lambda: store)
+    monkeypatch.setattr(main, 'get_search_index', lambda: None)
+    monkeypatch.setattr(main, 'StorageJanitor', lambda: StorageJanitor(areas=[], databases=[]))
+    monkeypatch.setattr(main, 'USER_DOWNLOADS_DIR', str(tmp_path / 'Downloads'))
+    fixture_site.latency = 0.3  # Slow enough to cancel mid-crawl
+
+    with testclient.TestClient(main.app) as client:
+        yield client, store
+    main.active_jobs.clear()
+
+
+def start_job(client, site_url: str, connection_id: str, formats):
+    response = client.post('/download', data={'url': site_url, 'connection_id': connection_id,
+                                              'output_format': formats})
+    assert response.status_code == 200
+    return response.json()['job_id']
+
+
+def test_cancel_mid_crawl_removes_partial_files(web_app, fixture_site):
+    client, store = web_app
+    job_id = start_job(client, fixture_site.url, 'conn-cancel', ['markdown', 'jsonl', 'zip'])
+    wait_for(lambda: len(job_files(job_id)) == 2)  # The JSONL and zip are written while crawling
+    assert store.get(job_id)['state'] == 'running'
+
+    assert client.post('/cancel/conn-cancel').json()['status'] == 'cancelling'
+    wait_for(lambda: store.get(job_id)['state'] == 'cancelled')
+    assert job_files(job_id) == []
+    assert client.post('/cancel/conn-cancel').status_code == 404  # No longer running
+
+
+def test_cancel_waits_for_publishing_before_removing_files(web_app, fixture_site, monkeypatch):
+    client, store = web_app
+    fixture_site.latency = 0
+    publishing = threading.Event()
+
+    def slow_copy(path):
+        publishing.set()
+        time.sleep(0.5)  # Still copying when the job is cancelled
+        os.makedirs(main.USER_DOWNLOADS_DIR, exist_ok=True)
+        shutil.copy(path, main.USER_DOWNLOADS_DIR)
+
+    async def slow_publish(path):
+        await asyncio.get_event_loop().run_in_executor(None, slow_copy, path)
+    monkeypatch.setattr(main, 'publish_artifact', slow_publish)
+
+    job_id = start_job(client, fixture_site.url, 'conn-publish', ['markdown'])
+    wait_for(publishing.is_set)
+    client.post('/cancel/conn-publish')
+    wait_for(lambda: store.get(job_id)['state'] == 'cancelled')
+    assert job_files(job_id) == []
+    assert job_files(job_id, main.USER_DOWNLOADS_DIR) == []  # The copy finished, then was removed
+
+
+def test_job_is_cancelled_when_its_client_does_not_reconnect(web_app, fixture_site, monkeypatch):
+    client, store = web_app
+    monkeypatch.setattr(main, 'DISCONNECT_GRACE_SECONDS', 0.2)
+
+    with client.websocket_connect('/ws/conn-gone'):
+        job_id = start_job(client, fixture_site.url, 'conn-gone', ['markdown', 'zip'])
+        wait_for(lambda: store.get(job_id)['state'] == 'running')
+    wait_for(lambda: store.get(job_id)['state'] == 'cancelled')
+    assert job_files(job_id) == []